@@ -2,6 +2,9 @@ import pygame
 import random
 import sys
 import math
+from text_cache import render_text
+from sprite_pool import PooledSprite, SpritePool, solid_surface
+from dirty_render import FrameRenderer
 
 # --- Constants ---
 SCREEN_WIDTH = 800
@@ -209,7 +212,7 @@ class Player(pygame.sprite.Sprite):
             center_x, top_y = self.rect.centerx, self.rect.top
             if self.powerup_type == "spread_shot":
                 # Center bullet
-                b1 = Bullet(
+                b1 = bullet_pool.acquire(
                     center_x,
                     top_y,
                     -PLAYER_BULLET_SPEED,
@@ -218,7 +221,7 @@ class Player(pygame.sprite.Sprite):
                     piercing=self.piercing,
                 )
                 # Left bullet
-                b2 = Bullet(
+                b2 = bullet_pool.acquire(
                     center_x - 5,
                     top_y,
                     -PLAYER_BULLET_SPEED * 0.9,
@@ -227,7 +230,7 @@ class Player(pygame.sprite.Sprite):
                     piercing=self.piercing,
                 )
                 # Right bullet
-                b3 = Bullet(
+                b3 = bullet_pool.acquire(
                     center_x + 5,
                     top_y,
                     -PLAYER_BULLET_SPEED * 0.9,
@@ -239,7 +242,7 @@ class Player(pygame.sprite.Sprite):
                 player_bullets.add(b1, b2, b3)
             else:
                 # Standard single shot
-                bullet = Bullet(
+                bullet = bullet_pool.acquire(
                     center_x,
                     top_y,
                     -PLAYER_BULLET_SPEED,
@@ -390,7 +393,7 @@ class Alien(pygame.sprite.Sprite):
 
     def shoot(self):
         # Maybe different bullet types per alien later?
-        bullet = Bullet(
+        bullet = bullet_pool.acquire(
             self.rect.centerx, self.rect.bottom, ALIEN_BULLET_SPEED, ALIEN_BULLET_COLOR
         )
         all_sprites.add(bullet)
@@ -574,12 +577,12 @@ class Boss(pygame.sprite.Sprite):
             # Use pygame.time.set_timer for delayed shots? Simpler: just create them now.
             # Real delay needs a more complex shooting scheduler.
             if i == 0 or fire_count == 1:  # Center shot
-                bullet = Bullet(
+                bullet = bullet_pool.acquire(
                     self.rect.centerx, self.rect.bottom, speed, BOSS_BULLET_COLOR
                 )
             elif i % 2 != 0:  # Left alternating
                 offset = (i + 1) // 2 * 20
-                bullet = Bullet(
+                bullet = bullet_pool.acquire(
                     self.rect.centerx - offset,
                     self.rect.centery,
                     speed,
@@ -587,7 +590,7 @@ class Boss(pygame.sprite.Sprite):
                 )
             else:  # Right alternating
                 offset = i // 2 * 20
-                bullet = Bullet(
+                bullet = bullet_pool.acquire(
                     self.rect.centerx + offset,
                     self.rect.centery,
                     speed,
@@ -605,13 +608,11 @@ class Boss(pygame.sprite.Sprite):
 
 
 # --- Bullet Class Modified ---
-class Bullet(pygame.sprite.Sprite):
-    def __init__(
+class Bullet(PooledSprite):
+    def reset(
         self, x, y, speed_y, color, dx=0, piercing=False
     ):  # Added dx, piercing
-        super().__init__()
-        self.image = pygame.Surface([BULLET_WIDTH, BULLET_HEIGHT])
-        self.image.fill(color)
+        self.image = solid_surface(color, (BULLET_WIDTH, BULLET_HEIGHT))  # Shared per color
         self.rect = self.image.get_rect()
         if speed_y < 0:
             self.rect.bottom = y
@@ -636,15 +637,16 @@ class Bullet(pygame.sprite.Sprite):
 
 
 # --- PowerUp Class Modified ---
-class PowerUp(pygame.sprite.Sprite):
-    def __init__(self, centerx, type):
-        super().__init__()
-        self.type = type
-        self.image = pygame.Surface([POWERUP_WIDTH, POWERUP_HEIGHT], pygame.SRCALPHA)
+powerup_images = {}  # type -> shared power-up image
+
+
+def powerup_image(type):
+    """The shared image for a power-up type, drawn on first use."""
+    if type not in powerup_images:
+        image = pygame.Surface([POWERUP_WIDTH, POWERUP_HEIGHT], pygame.SRCALPHA)
         color = POWERUP_COLORS.get(type, WHITE)
-        pygame.draw.rect(self.image, color, self.image.get_rect(), border_radius=4)
+        pygame.draw.rect(image, color, image.get_rect(), border_radius=4)
         # Letter indicator
-        p_font = pygame.font.Font(font_name, 18)
         text = "?"
         if type == "rapid_fire":
             text = "R"
@@ -656,10 +658,17 @@ class PowerUp(pygame.sprite.Sprite):
             text = "P"
         elif type == "extra_life":
             text = "+1"
-        text_surf = p_font.render(text, True, BLACK)
-        text_rect = text_surf.get_rect(center=self.image.get_rect().center)
-        self.image.blit(text_surf, text_rect)
+        text_surf = render_text(text, 18, BLACK, font_name)
+        text_rect = text_surf.get_rect(center=image.get_rect().center)
+        image.blit(text_surf, text_rect)
+        powerup_images[type] = image
+    return powerup_images[type]
+
 
+class PowerUp(PooledSprite):
+    def reset(self, centerx, type):
+        self.type = type
+        self.image = powerup_image(type)
         self.rect = self.image.get_rect(centerx=centerx, bottom=0)
 
     def update(self):
@@ -675,8 +684,7 @@ class PowerUp(pygame.sprite.Sprite):
 
 
 def draw_text(surface, text, size, x, y, color=WHITE, align="midtop"):
-    font = pygame.font.Font(font_name, size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color, font_name)
     text_rect = text_surface.get_rect()
     if align == "midtop":
         text_rect.midtop = (x, y)
@@ -929,6 +937,17 @@ def setup_level(level):
     print(f"Level {level} - Alien Move Interval: {alien_move_interval}")
 
     game_state = PLAYING_WAVE
+    renderer.invalidate()  # The intro and transition screens drew over the game
+
+
+def draw_background(surface):
+    surface.fill(DARK_BLUE)
+    for _ in range(40):
+        star_x = random.randrange(SCREEN_WIDTH)
+        star_y = random.randrange(SCREEN_HEIGHT)
+        star_b = random.randint(60, 160)
+        star_s = random.choice([1, 1, 2])
+        pygame.draw.circle(surface, (star_b, star_b, star_b), (star_x, star_y), star_s)
 
 
 # --- Initialization ---
@@ -937,6 +956,11 @@ pygame.mixer.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Sleek Invaders++")
 clock = pygame.time.Clock()
+# F2 switches between full redraws and dirty rects, F3 shows the timing overlay
+renderer = FrameRenderer(
+    screen,
+    hud_rects=[(0, 0, SCREEN_WIDTH, 60)],  # Score, level, lives, power-up timer, boss health
+)
 font_name = (
     pygame.font.match_font("consolas", True, False) or pygame.font.get_default_font()
 )
@@ -949,6 +973,8 @@ boss_bullets = pygame.sprite.Group()
 aliens = pygame.sprite.Group()
 powerups = pygame.sprite.Group()
 boss_group = pygame.sprite.GroupSingle()
+bullet_pool = SpritePool(Bullet)
+powerup_pool = SpritePool(PowerUp)
 
 # --- Game Variables ---
 player = Player()
@@ -986,9 +1012,11 @@ while running:
     # --- Main Game Logic ---
     elif game_state == PLAYING_WAVE or game_state == BOSS_FIGHT:
         # --- Input ---
+        renderer.start_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            renderer.handle_event(event)
 
         # --- Update ---
         all_sprites.update()  # Player, Bullets, Aliens(move=0), Powerups, Boss
@@ -1055,7 +1083,7 @@ while running:
                 p_x = random.randint(
                     POWERUP_WIDTH // 2, SCREEN_WIDTH - POWERUP_WIDTH // 2
                 )
-                powerup = PowerUp(p_x, p_type)
+                powerup = powerup_pool.acquire(p_x, p_type)
                 all_sprites.add(powerup)
                 powerups.add(powerup)
 
@@ -1124,16 +1152,9 @@ while running:
             player.activate_powerup(p_hit.type)
 
     # --- Draw ---
-    screen.fill(DARK_BLUE)
-    # ... (Star drawing same as before) ...
-    for _ in range(40):
-        star_x = random.randrange(SCREEN_WIDTH)
-        star_y = random.randrange(SCREEN_HEIGHT)
-        star_b = random.randint(60, 160)
-        star_s = random.choice([1, 1, 2])
-        pygame.draw.circle(screen, (star_b, star_b, star_b), (star_x, star_y), star_s)
+    renderer.draw_background(draw_background)  # Stars are redrawn at random unless cached
 
-    all_sprites.draw(screen)
+    renderer.draw_sprites(all_sprites)
     # UI Drawing (Score, Level, Lives, Powerup Timer, Boss Health)
     draw_text(screen, f"SCORE: {score}", 20, SCREEN_WIDTH / 2, 10, WHITE)
     draw_text(screen, f"LEVEL: {current_level}", 20, 10, 10, WHITE, align="topleft")
@@ -1143,7 +1164,8 @@ while running:
     if game_state == BOSS_FIGHT:
         draw_boss_health(screen, boss)
 
-    pygame.display.flip()
+    renderer.draw_overlay(clock)
+    renderer.present()
     clock.tick(FPS)
 
 # --- Quit ---
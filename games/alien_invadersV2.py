@@ -3,6 +3,10 @@ import random
 import sys
 import math
 import time
+from starfield import Starfield
+from text_cache import render_text
+from sprite_pool import PooledSprite, SpritePool, solid_surface
+from dirty_render import FrameRenderer
 
 # --- Constants ---
 SCREEN_WIDTH = 800
@@ -32,6 +36,11 @@ BRIGHT_RED = (255, 0, 0)  # For Laser
 LIGHT_BLUE = (100, 150, 255)  # For Triple Shot
 DARK_GREEN = (0, 100, 0)  # For Homing Missile
 
+# Background Settings
+STAR_COUNT = 600  # Drawn once into cached layers, so the count doesn't affect frame time
+STAR_SCROLL_SPEED = 40  # pixels per second for the nearest star layer
+STAR_TWINKLE_COUNT = 40  # Stars that pulse in brightness, each drawn per frame
+
 # Player Settings
 PLAYER_WIDTH = 40
 PLAYER_HEIGHT = 20
@@ -57,6 +66,7 @@ LASER_BULLET_SPEED = 15
 LASER_BULLET_COLOR = BRIGHT_RED
 LASER_BULLET_HEIGHT = 18
 LASER_BULLET_WIDTH = 5
+COLLISION_CELL_SIZE = 64  # Grid cell size (pixels) of the per-frame collision broadphase
 
 # Missile Settings
 MISSILE_SPEED = 7
@@ -65,6 +75,9 @@ MISSILE_LIFETIME = 3000  # ms
 MISSILE_WIDTH = 8
 MISSILE_HEIGHT = 16
 MISSILE_COLOR = DARK_GREEN
+MISSILE_TARGET_CELL_SIZE = 100  # Grid cell size (pixels) of the per-frame alien index
+MISSILE_TARGET_CLAIMS = 1  # Missiles that may lock onto one alien before others look elsewhere
+MISSILE_ROTATION_STEPS = 72  # Pre-rotated missile images (5 degrees apart)
 
 # --- Weapon Type Constants ---
 WEAPON_STANDARD = "standard"
@@ -260,7 +273,7 @@ class Player(pygame.sprite.Sprite):
         center_x, top_y = self.rect.centerx, self.rect.top
 
         if self.active_weapon == WEAPON_STANDARD:
-            bullet = Bullet(
+            bullet = bullet_pool.acquire(
                 center_x,
                 top_y,
                 -PLAYER_BULLET_SPEED,
@@ -271,7 +284,7 @@ class Player(pygame.sprite.Sprite):
             player_bullets.add(bullet)
 
         elif self.active_weapon == WEAPON_SPREAD:
-            b1 = Bullet(
+            b1 = bullet_pool.acquire(
                 center_x,
                 top_y,
                 -PLAYER_BULLET_SPEED * 1.1,
@@ -279,7 +292,7 @@ class Player(pygame.sprite.Sprite):
                 dx=0,
                 piercing=False,
             )
-            b2 = Bullet(
+            b2 = bullet_pool.acquire(
                 center_x - 8,
                 top_y + 5,
                 -PLAYER_BULLET_SPEED * 0.9,
@@ -287,7 +300,7 @@ class Player(pygame.sprite.Sprite):
                 dx=-3,
                 piercing=False,
             )
-            b3 = Bullet(
+            b3 = bullet_pool.acquire(
                 center_x + 8,
                 top_y + 5,
                 -PLAYER_BULLET_SPEED * 0.9,
@@ -300,21 +313,21 @@ class Player(pygame.sprite.Sprite):
 
         elif self.active_weapon == WEAPON_TRIPLE:
             offset = PLAYER_WIDTH // 4
-            b1 = Bullet(
+            b1 = bullet_pool.acquire(
                 center_x,
                 top_y,
                 -PLAYER_BULLET_SPEED,
                 PLAYER_BULLET_COLOR,
                 piercing=False,
             )
-            b2 = Bullet(
+            b2 = bullet_pool.acquire(
                 center_x - offset,
                 top_y,
                 -PLAYER_BULLET_SPEED,
                 PLAYER_BULLET_COLOR,
                 piercing=False,
             )
-            b3 = Bullet(
+            b3 = bullet_pool.acquire(
                 center_x + offset,
                 top_y,
                 -PLAYER_BULLET_SPEED,
@@ -325,17 +338,19 @@ class Player(pygame.sprite.Sprite):
             player_bullets.add(b1, b2, b3)
 
         elif self.active_weapon == WEAPON_LASER:
-            laser = Bullet(
-                center_x, top_y, -LASER_BULLET_SPEED, LASER_BULLET_COLOR, piercing=True
+            laser = bullet_pool.acquire(
+                center_x,
+                top_y,
+                -LASER_BULLET_SPEED,
+                LASER_BULLET_COLOR,
+                piercing=True,
+                size=(LASER_BULLET_WIDTH, LASER_BULLET_HEIGHT),
             )
-            laser.image = pygame.Surface([LASER_BULLET_WIDTH, LASER_BULLET_HEIGHT])
-            laser.image.fill(LASER_BULLET_COLOR)
-            laser.rect = laser.image.get_rect(centerx=center_x, bottom=top_y)
             all_sprites.add(laser)
             player_bullets.add(laser)
 
         elif self.active_weapon == WEAPON_HOMING:
-            missile = Missile(center_x, top_y, aliens)
+            missile = missile_pool.acquire(center_x, top_y, alien_index)
             all_sprites.add(missile)
             player_bullets.add(missile)
 
@@ -488,7 +503,7 @@ class Alien(pygame.sprite.Sprite):
             return False
 
     def shoot(self):
-        bullet = Bullet(
+        bullet = bullet_pool.acquire(
             self.rect.centerx, self.rect.bottom, ALIEN_BULLET_SPEED, ALIEN_BULLET_COLOR
         )
         all_sprites.add(bullet)
@@ -752,19 +767,19 @@ class Boss(pygame.sprite.Sprite):
 
     def shoot(self):
         angle_spread = 5 + self.phase * 5
-        b1 = Bullet(
+        b1 = bullet_pool.acquire(
             self.rect.centerx, self.rect.bottom, BOSS_BULLET_SPEED, BOSS_BULLET_COLOR
         )
         rad_l = math.radians(-angle_spread)
         dx_l = math.sin(rad_l) * BOSS_BULLET_SPEED * 0.5
         dy_l = math.cos(rad_l) * BOSS_BULLET_SPEED
-        b2 = Bullet(
+        b2 = bullet_pool.acquire(
             self.rect.centerx - 15, self.rect.centery, dy_l, BOSS_BULLET_COLOR, dx=dx_l
         )
         rad_r = math.radians(angle_spread)
         dx_r = math.sin(rad_r) * BOSS_BULLET_SPEED * 0.5
         dy_r = math.cos(rad_r) * BOSS_BULLET_SPEED
-        b3 = Bullet(
+        b3 = bullet_pool.acquire(
             self.rect.centerx + 15, self.rect.centery, dy_r, BOSS_BULLET_COLOR, dx=dx_r
         )
         all_sprites.add(b1, b2, b3)
@@ -817,14 +832,12 @@ class Boss(pygame.sprite.Sprite):
             self.kill()
 
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed_y, color, dx=0, piercing=False):
-        super().__init__()
+class Bullet(PooledSprite):
+    def reset(
+        self, x, y, speed_y, color, dx=0, piercing=False, size=(BULLET_WIDTH, BULLET_HEIGHT)
+    ):
         self.is_laser = False
-        width = BULLET_WIDTH
-        height = BULLET_HEIGHT
-        self.image = pygame.Surface([width, height])
-        self.image.fill(color)
+        self.image = solid_surface(color, size)  # Shared with every bullet of this color and size
         self.rect = self.image.get_rect()
         if speed_y < 0:
             self.rect.bottom = y
@@ -847,14 +860,152 @@ class Bullet(pygame.sprite.Sprite):
             self.kill()
 
 
-class Missile(pygame.sprite.Sprite):
-    def __init__(self, x, y, target_group):
-        super().__init__()
-        self.image_orig = pygame.Surface(
-            [MISSILE_WIDTH, MISSILE_HEIGHT], pygame.SRCALPHA
-        )
+class TargetIndex:
+    """Grid of alien positions, rebuilt once per frame and shared by every missile.
+
+    Missiles reserve the alien they lock onto, so a volley spreads across targets
+    instead of every missile chasing the same nearest alien.
+    """
+
+    def __init__(self, cell_size=MISSILE_TARGET_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.bounds = None  # (min_cx, min_cy, max_cx, max_cy) of the occupied cells
+        self.claims = {}  # alien -> number of missiles locked onto it
+
+    def rebuild(self, targets):
+        self.cells.clear()
+        self.bounds = None
+        for target in targets:
+            x, y = target.rect.center
+            key = (x // self.cell_size, y // self.cell_size)
+            self.cells.setdefault(key, []).append((x, y, target))
+        if self.cells:
+            xs = [key[0] for key in self.cells]
+            ys = [key[1] for key in self.cells]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        # Forget reservations on aliens that have died since the last frame
+        self.claims = {
+            target: count for target, count in self.claims.items() if target.alive()
+        }
+
+    def clear(self):
+        self.cells.clear()
+        self.bounds = None
+        self.claims.clear()
+
+    def nearest(self, pos, max_claims=None):
+        """Closest live target to pos, skipping any with max_claims reservations already."""
+        if self.bounds is None:
+            return None
+        px, py = pos
+        cx, cy = int(px // self.cell_size), int(py // self.cell_size)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        max_ring = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy)
+        best, best_dist_sq = None, float("inf")
+        for ring in range(max_ring + 1):
+            # Anything in this ring or beyond is at least (ring - 1) cells away
+            reach = (ring - 1) * self.cell_size
+            if best is not None and reach > 0 and reach * reach >= best_dist_sq:
+                break
+            for gx in range(cx - ring, cx + ring + 1):
+                edge = gx in (cx - ring, cx + ring)
+                for gy in range(cy - ring, cy + ring + 1) if edge else (cy - ring, cy + ring):
+                    for x, y, target in self.cells.get((gx, gy), ()):
+                        dist_sq = (x - px) ** 2 + (y - py) ** 2
+                        if dist_sq >= best_dist_sq or not target.alive():
+                            continue
+                        if max_claims is not None and self.claims.get(target, 0) >= max_claims:
+                            continue
+                        best, best_dist_sq = target, dist_sq
+        return best
+
+    def claim(self, pos):
+        """Reserve a target for a missile at pos: the nearest free one, else the nearest."""
+        target = self.nearest(pos, MISSILE_TARGET_CLAIMS) or self.nearest(pos)
+        if target is not None:
+            self.claims[target] = self.claims.get(target, 0) + 1
+        return target
+
+    def release(self, target):
+        count = self.claims.get(target, 0)
+        if count > 1:
+            self.claims[target] = count - 1
+        else:
+            self.claims.pop(target, None)
+
+
+class CollisionLayers:
+    """Named collision layers, each made of sprite groups that are registered once.
+
+    Sprites stay in their usual groups; a layer just lists which groups to check together.
+    rebuild() buckets every layer's rects once per frame into a uniform grid, under each
+    cell a rect covers. A query only tests the sprites in the cells its own rect covers,
+    so a shot is compared with the few hostiles near it rather than all of them.
+    Sprites killed after the rebuild are skipped.
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.layers = {}
+        self.grids = {}  # name -> {(cx, cy): [(order, sprite), ...]} as of the last rebuild
+
+    def add_layer(self, name, *groups):
+        self.layers[name] = groups
+        self.grids[name] = {}
+
+    def sprites(self, name):
+        return [sprite for group in self.layers[name] for sprite in group]
+
+    def cell_keys(self, rect):
+        size = self.cell_size
+        xs = range(rect.left // size, (rect.right - 1) // size + 1)
+        ys = range(rect.top // size, (rect.bottom - 1) // size + 1)
+        return [(cx, cy) for cx in xs for cy in ys]
+
+    def rebuild(self):
+        for name in self.layers:
+            cells = self.grids[name]
+            cells.clear()
+            for order, sprite in enumerate(self.sprites(name)):
+                for key in self.cell_keys(sprite.rect):
+                    cells.setdefault(key, []).append((order, sprite))
+
+    def collide_sprite(self, sprite, name):
+        """Live sprites in layer name whose rects overlap sprite's, in layer order."""
+        cells = self.grids[name]
+        rect = sprite.rect
+        candidates = {}  # A sprite spanning several cells is tested once
+        for key in self.cell_keys(rect):
+            for order, target in cells.get(key, ()):
+                candidates[order] = target
+        return [
+            candidates[order]
+            for order in sorted(candidates)
+            if candidates[order].alive() and rect.colliderect(candidates[order].rect)
+        ]
+
+    def collide_layers(self, name_a, name_b):
+        """{sprite in layer name_a: [overlapping sprites in layer name_b]}, hits only."""
+        if not self.grids[name_b]:
+            return {}
+        hits = {}
+        for sprite in self.sprites(name_a):
+            targets = self.collide_sprite(sprite, name_b)
+            if targets:
+                hits[sprite] = targets
+        return hits
+
+
+missile_rotations = []  # missile_rotations[i] is the missile turned i steps counter-clockwise
+
+
+def missile_image(angle):
+    """The shared missile image for the rotation step nearest angle (degrees, counter-clockwise)."""
+    if not missile_rotations:
+        image_orig = pygame.Surface([MISSILE_WIDTH, MISSILE_HEIGHT], pygame.SRCALPHA)
         pygame.draw.polygon(
-            self.image_orig,
+            image_orig,
             MISSILE_COLOR,
             [
                 (0, MISSILE_HEIGHT),
@@ -863,14 +1014,24 @@ class Missile(pygame.sprite.Sprite):
             ],
         )
         pygame.draw.rect(
-            self.image_orig, RED, (MISSILE_WIDTH / 2 - 1, MISSILE_HEIGHT - 3, 2, 3)
+            image_orig, RED, (MISSILE_WIDTH / 2 - 1, MISSILE_HEIGHT - 3, 2, 3)
         )
+        step = 360 / MISSILE_ROTATION_STEPS
+        missile_rotations.extend(
+            pygame.transform.rotate(image_orig, i * step)
+            for i in range(MISSILE_ROTATION_STEPS)
+        )
+    index = round(angle * MISSILE_ROTATION_STEPS / 360) % MISSILE_ROTATION_STEPS
+    return missile_rotations[index]
 
-        self.image = self.image_orig.copy()
+
+class Missile(PooledSprite):
+    def reset(self, x, y, target_index):
+        self.image = missile_image(0)
         self.rect = self.image.get_rect(centerx=x, bottom=y)
         self.pos = pygame.Vector2(self.rect.center)
         self.vel = pygame.Vector2(0, -MISSILE_SPEED)
-        self.target_group = target_group
+        self.target_index = target_index
         self.target = None
         self.turn_rate = (
             MISSILE_TURN_RATE  # Degrees per frame (use directly with rotate_ip)
@@ -879,17 +1040,17 @@ class Missile(pygame.sprite.Sprite):
         self.find_target()
 
     def find_target(self):
-        closest_dist_sq = float("inf")
-        closest_alien = None
-        for alien in self.target_group:
-            if alien.alive():
-                dist_sq = (
-                    pygame.Vector2(alien.rect.center) - self.pos
-                ).length_squared()
-                if dist_sq < closest_dist_sq:
-                    closest_dist_sq = dist_sq
-                    closest_alien = alien
-        self.target = closest_alien
+        self.release_target()
+        self.target = self.target_index.claim(self.pos)
+
+    def release_target(self):
+        if self.target is not None:
+            self.target_index.release(self.target)
+            self.target = None
+
+    def kill(self):
+        self.release_target()
+        super().kill()
 
     def update(self):
         now = pygame.time.get_ticks()
@@ -898,7 +1059,7 @@ class Missile(pygame.sprite.Sprite):
             return
 
         if self.target and not self.target.alive():
-            self.target = None
+            self.release_target()
 
         if not self.target:
             self.find_target()
@@ -934,22 +1095,22 @@ class Missile(pygame.sprite.Sprite):
         self.rect.center = self.pos
 
         angle = self.vel.angle_to(pygame.Vector2(0, -1))
-        self.image = pygame.transform.rotate(self.image_orig, angle)
+        self.image = missile_image(angle)  # Shared image, don't draw on it
         self.rect = self.image.get_rect(center=self.rect.center)
 
         if not screen.get_rect().colliderect(self.rect):
             self.kill()
 
 
-class PowerUp(pygame.sprite.Sprite):
-    def __init__(self, centerx, type):
-        super().__init__()
-        self.type = type
-        self.image = pygame.Surface([POWERUP_WIDTH, POWERUP_HEIGHT], pygame.SRCALPHA)
-        color = POWERUP_COLORS.get(type, WHITE)
-        pygame.draw.rect(self.image, color, self.image.get_rect(), border_radius=4)
+powerup_images = {}  # type -> shared power-up image
 
-        p_font = pygame.font.Font(font_name, 18)
+
+def powerup_image(type):
+    """The shared image for a power-up type, drawn on first use."""
+    if type not in powerup_images:
+        image = pygame.Surface([POWERUP_WIDTH, POWERUP_HEIGHT], pygame.SRCALPHA)
+        color = POWERUP_COLORS.get(type, WHITE)
+        pygame.draw.rect(image, color, image.get_rect(), border_radius=4)
         text = "?"
         if type == "rapid_fire":
             text = "R"
@@ -966,10 +1127,17 @@ class PowerUp(pygame.sprite.Sprite):
         elif type == WEAPON_HOMING:
             text = "H"
 
-        text_surf = p_font.render(text, True, BLACK)
-        text_rect = text_surf.get_rect(center=self.image.get_rect().center)
-        self.image.blit(text_surf, text_rect)
+        text_surf = render_text(text, 18, BLACK, font_name)
+        text_rect = text_surf.get_rect(center=image.get_rect().center)
+        image.blit(text_surf, text_rect)
+        powerup_images[type] = image
+    return powerup_images[type]
+
 
+class PowerUp(PooledSprite):
+    def reset(self, centerx, type):
+        self.type = type
+        self.image = powerup_image(type)
         self.rect = self.image.get_rect(centerx=centerx, bottom=0)
 
     def update(self):
@@ -982,8 +1150,7 @@ class PowerUp(pygame.sprite.Sprite):
 
 
 def draw_text(surface, text, size, x, y, color=WHITE, align="midtop"):
-    font = pygame.font.Font(font_name, size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color, font_name)
     text_rect = text_surface.get_rect()
     if align == "midtop":
         text_rect.midtop = (x, y)
@@ -1201,7 +1368,7 @@ def spawn_powerup(x_pos):
         if possible_rerolls:
             p_type = random.choice(possible_rerolls)
 
-    powerup = PowerUp(x_pos, p_type)
+    powerup = powerup_pool.acquire(x_pos, p_type)
     all_sprites.add(powerup)
     powerups.add(powerup)
 
@@ -1216,6 +1383,7 @@ def reset_game():
     powerups.empty()
     aliens.empty()
     boss_group.empty()
+    alien_index.clear()
 
     # Ensure any existing boss instance is fully gone
     if (
@@ -1251,6 +1419,23 @@ pygame.mixer.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Endless Invaders: Weapons!")
 clock = pygame.time.Clock()
+starfield = Starfield(
+    (SCREEN_WIDTH, SCREEN_HEIGHT),
+    STAR_COUNT,
+    background=DARK_BLUE,
+    brightness=(60, 160),
+    radii=(1, 1, 2),
+    scroll=(0, STAR_SCROLL_SPEED),
+    twinkle=STAR_TWINKLE_COUNT,
+)
+# F2 switches between full redraws and dirty rects, F3 shows the timing overlay
+renderer = FrameRenderer(
+    screen,
+    hud_rects=[
+        (0, 0, SCREEN_WIDTH, 60),  # Lives, score, weapon, effect timer and boss health
+        (SCREEN_WIDTH - 200, SCREEN_HEIGHT - 45, 200, 45),  # Boss counters
+    ],
+)
 font_name = (
     pygame.font.match_font("consolas", True, False) or pygame.font.get_default_font()
 )
@@ -1263,6 +1448,16 @@ boss_bullets = pygame.sprite.Group()
 aliens = pygame.sprite.Group()
 powerups = pygame.sprite.Group()
 boss_group = pygame.sprite.GroupSingle()
+bullet_pool = SpritePool(Bullet)
+missile_pool = SpritePool(Missile)
+powerup_pool = SpritePool(PowerUp)
+alien_index = TargetIndex()  # Shared by all missiles for target lookups
+
+collision_layers = CollisionLayers()
+collision_layers.add_layer("player_shots", player_bullets)
+collision_layers.add_layer("hostile_shots", alien_bullets, boss_bullets)
+collision_layers.add_layer("hostiles", aliens, boss_group)
+collision_layers.add_layer("pickups", powerups)
 
 # --- Game Variables ---
 player = Player()  # Initial player needed for some UI elements potentially before reset
@@ -1279,6 +1474,7 @@ while running:
     if game_state == INTRO:
         show_intro_screen()
         reset_game()
+        renderer.invalidate()
     elif game_state == GAME_OVER:
         if show_game_over_screen(score, game_vars.get("bosses_defeated", 0)):
             game_state = INTRO
@@ -1287,11 +1483,14 @@ while running:
 
     elif game_state == ENDLESS_PLAY or game_state == BOSS_ACTIVE:
         now = pygame.time.get_ticks()
+        renderer.start_frame()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            renderer.handle_event(event)
 
+        alien_index.rebuild(aliens)
         all_sprites.update()
 
         # Recalculate difficulty based on potentially updated boss count
@@ -1360,31 +1559,26 @@ while running:
                 game_vars["last_alien_spawn_time"] = now
 
         # --- Collision Detection ---
-        # Player Projectiles vs Aliens
-        for bullet in player_bullets:
-            aliens_hit = pygame.sprite.spritecollide(bullet, aliens, False)
-            for alien in aliens_hit:
-                if alien.hit():
-                    score += 10 + alien.max_health
-                is_piercing = getattr(bullet, "piercing", False)
+        collision_layers.rebuild()  # Sprites have moved and spawned; bucket them once for every check below
+        # Player Projectiles vs Aliens and Boss
+        shot_hits = collision_layers.collide_layers("player_shots", "hostiles")
+        for bullet, targets in shot_hits.items():
+            is_piercing = getattr(bullet, "piercing", False)
+            for target in targets:
+                if not target.alive():  # Already destroyed by an earlier shot this frame
+                    continue
+                if target is boss:
+                    boss.hit()
+                    score += 2
+                elif target.hit():
+                    score += 10 + target.max_health
                 if not is_piercing:
                     bullet.kill()
                     break
 
-        # Player Projectiles vs Boss
-        if game_state == BOSS_ACTIVE and boss and boss.alive():
-            for bullet in player_bullets:
-                is_piercing = getattr(bullet, "piercing", False)
-                if pygame.sprite.collide_rect(bullet, boss):
-                    boss.hit()
-                    score += 2
-                    if not is_piercing:
-                        bullet.kill()
-
         # Enemy Bullets vs Player
-        bullets_to_check = pygame.sprite.Group(alien_bullets, boss_bullets)
         if player and not player.hidden:
-            player_hits = pygame.sprite.spritecollide(player, bullets_to_check, False)
+            player_hits = collision_layers.collide_sprite(player, "hostile_shots")
             for bullet in player_hits:
                 is_laser = hasattr(bullet, "is_laser") and bullet.is_laser
                 damage_taken = False
@@ -1405,31 +1599,30 @@ while running:
 
         # Player vs Powerups
         if player:
-            powerup_hits = pygame.sprite.spritecollide(player, powerups, True)
-            for p_hit in powerup_hits:
+            for p_hit in collision_layers.collide_sprite(player, "pickups"):
+                p_hit.kill()
                 player.activate_powerup(p_hit.type)
 
-        # Player vs Aliens Crash
+        # Player vs Aliens Crash (flying into the boss does nothing)
         if player and not player.hidden:
-            alien_crash = pygame.sprite.spritecollide(player, aliens, True)
+            alien_crash = [
+                target
+                for target in collision_layers.collide_sprite(player, "hostiles")
+                if target is not boss
+            ]
+            for alien in alien_crash:
+                alien.kill()
             if alien_crash:
                 if player.hide():
                     if player.lives <= 0:
                         game_state = GAME_OVER
 
         # --- Draw ---
-        screen.fill(DARK_BLUE)
-        for _ in range(40):
-            star_x, star_y = random.randrange(SCREEN_WIDTH), random.randrange(
-                SCREEN_HEIGHT
-            )
-            star_b = random.randint(60, 160)
-            star_s = random.choice([1, 1, 2])
-            pygame.draw.circle(
-                screen, (star_b, star_b, star_b), (star_x, star_y), star_s
-            )
+        if not renderer.dirty:
+            starfield.update(clock.get_time() / 1000.0)  # Dirty mode keeps a still copy
+        renderer.draw_background(starfield.draw)  # Also clears the screen
 
-        all_sprites.draw(screen)
+        renderer.draw_sprites(all_sprites)
 
         # UI
         draw_text(screen, f"SCORE: {score}", 20, 10, 35, WHITE, align="topleft")
@@ -1459,7 +1652,8 @@ while running:
         elif game_state == BOSS_ACTIVE:
             draw_boss_health(screen, boss)
 
-        pygame.display.flip()
+        renderer.draw_overlay(clock)
+        renderer.present()
         clock.tick(FPS)
 
 # --- Quit ---
@@ -1,11 +1,17 @@
 import pygame
 import math
 import random
+import numpy as np
+from starfield import Starfield
+from text_cache import find_font, render_text
 
 # --- Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 144 # Render rate cap; drawing interpolates between simulation steps
+SIM_HZ = 120 # Fixed simulation rate, independent of the render rate
+SIM_DT = 1.0 / SIM_HZ
+MAX_FRAME_TIME = 0.25 # Longest frame the simulation will catch up on
 
 # Colors (Sleek Theme)
 BLACK = (0, 0, 0)
@@ -17,36 +23,58 @@ DARK_GRAY = (40, 40, 40) # For subtle UI elements or asteroid variations
 ORANGE_THRUST = (255, 165, 0)
 RED_EXPLOSION = (255, 69, 0)
 
+# Movement is time based: speeds are per second (the old per-frame values at 60 FPS x 60)
 # Player settings
 PLAYER_SIZE = 20
-PLAYER_ACCELERATION = 0.25
-PLAYER_DECELERATION = 0.99 # Friction
-PLAYER_TURN_SPEED = 5
-PLAYER_MAX_SPEED = 7
+PLAYER_ACCELERATION = 900 # pixels per second squared
+PLAYER_FRICTION = 0.99 ** 60 # Fraction of velocity kept after one second
+PLAYER_TURN_SPEED = 300 # degrees per second
+PLAYER_MAX_SPEED = 420 # pixels per second
 PLAYER_GUN_COOLDOWN = 200  # milliseconds
 PLAYER_INVINCIBILITY_DURATION = 2000 # milliseconds after respawn
 PLAYER_START_LIVES = 3
+THRUST_PARTICLE_RATE = 120 # particles per second while thrusting
 
 # Bullet settings
-BULLET_SPEED = 10
-BULLET_LIFESPAN = 50  # frames
+BULLET_SPEED = 600 # pixels per second
+BULLET_LIFESPAN = 50 / 60  # seconds
 
 # Asteroid settings
 ASTEROID_SIZES = {3: 40, 2: 25, 1: 15} # size_level: radius
-ASTEROID_MIN_SPEED = 0.5
-ASTEROID_MAX_SPEED = 2.5
+ASTEROID_MIN_SPEED = 30 # pixels per second
+ASTEROID_MAX_SPEED = 150
+ASTEROID_MAX_SPIN = 120 # degrees per second
+ASTEROID_SPLIT_KICK = 30 # pixels per second added to each fragment
 ASTEROID_POINTS = {3: 20, 2: 50, 1: 100}
 INITIAL_ASTEROID_COUNT = 4
 ASTEROID_VERTICES_MIN = 7
 ASTEROID_VERTICES_MAX = 12
+ASTEROID_SHAPE_VARIANTS = 4 # Distinct outlines per size, shared so their rotations can be cached
+
+# Particle engine settings
+PARTICLE_CAPACITY = 8192 # Preallocated particle slots; emissions beyond this are dropped
+PARTICLE_MAX_RADIUS = 5
+PARTICLE_ALPHA_LEVELS = 16 # Fade steps baked into the cached dot textures
+PARTICLE_SPEED = (60, 180) # pixels per second, before each emitter's speed multiplier
+
+# Background settings
+STAR_COUNT = 400 # Drawn once into cached layers, so the count doesn't affect frame time
+STAR_TWINKLE_COUNT = 60 # Stars that pulse in brightness, each drawn per frame
+
+# Rotation atlas settings
+ROTATION_STEP = 5 # degrees between cached rotations (72 per shape)
+PLAYER_BLINK_ALPHA = 100 # Player alpha on the "off" beats while invincible
+
+# Collision broadphase settings
+HASH_CELL_SIZE = 64 # pixels; about the diameter of a mid-sized asteroid
+PLAYER_HIT_RATIO = 0.85 # collide_circle_ratio for player vs asteroid
+BULLET_HIT_RATIO = 0.9 # collide_circle_ratio for bullet vs asteroid
 
 # --- Helper Functions ---
 def draw_text(surface, text, size, x, y, color=WHITE, font_name=None):
     if font_name is None:
-        font = pygame.font.Font(pygame.font.match_font('arial'), size) # Default nice font
-    else:
-        font = pygame.font.Font(font_name, size)
-    text_surface = font.render(text, True, color)
+        font_name = find_font('arial') # Default nice font
+    text_surface = render_text(text, size, color, font_name)
     text_rect = text_surface.get_rect()
     text_rect.midtop = (x, y)
     surface.blit(text_surface, text_rect)
@@ -59,47 +87,145 @@ def get_random_asteroid_spawn_pos(player_pos):
             return pos
 
 # --- Classes ---
+class RotationAtlas:
+    """Rotated copies of registered base images at quantized angles, shared by every sprite.
+
+    Each (shape id, angle bucket) is rendered with pygame.transform.rotate the first time it
+    is needed and reused from then on, so rotating sprites no longer allocate every frame.
+    """
+    def __init__(self, step=ROTATION_STEP):
+        self.step = step
+        self.buckets = round(360 / step)
+        self.bases = {}
+        self.frames = {}
+
+    def register(self, shape_id, image):
+        self.bases[shape_id] = image
+
+    def has(self, shape_id):
+        return shape_id in self.bases
+
+    def get(self, shape_id, angle):
+        # angle is counter-clockwise, as for pygame.transform.rotate
+        bucket = round(angle / self.step) % self.buckets
+        frame = self.frames.get((shape_id, bucket))
+        if frame is None:
+            frame = pygame.transform.rotate(self.bases[shape_id], bucket * self.step)
+            self.frames[(shape_id, bucket)] = frame
+        return frame
+
+
+rotation_atlas = RotationAtlas()
+
+
+class SpatialHash:
+    """Uniform grid over the wrapping playfield, rebuilt every frame as a collision broadphase.
+
+    Cell coordinates wrap around the screen, so sprites that drift past an edge still hash
+    into valid cells. Queries return candidates only; the exact test is done by the caller.
+    """
+    def __init__(self, cell_size=HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = math.ceil(SCREEN_WIDTH / cell_size)
+        self.rows = math.ceil(SCREEN_HEIGHT / cell_size)
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def cell_keys(self, x, y, radius):
+        # Every (wrapped) cell touched by the circle's bounding box
+        size = self.cell_size
+        col_start, col_end = int((x - radius) // size), int((x + radius) // size)
+        row_start, row_end = int((y - radius) // size), int((y + radius) // size)
+        cols = {col % self.cols for col in range(col_start, col_end + 1)}
+        rows = {row % self.rows for row in range(row_start, row_end + 1)}
+        return [(col, row) for col in cols for row in rows]
+
+    def insert(self, sprite, x, y, radius):
+        for key in self.cell_keys(x, y, radius):
+            self.cells.setdefault(key, []).append(sprite)
+
+    def query(self, x, y, radius):
+        found = set()
+        cells = self.cells
+        for key in self.cell_keys(x, y, radius):
+            if key in cells:
+                found.update(cells[key])
+        return found
+
+
+def collision_radius(sprite):
+    # The radius pygame's circle collision uses for this sprite
+    if hasattr(sprite, "radius"):
+        return sprite.radius
+    return 0.5 * math.hypot(sprite.rect.width, sprite.rect.height)
+
+
+def build_asteroid_grid(grid, asteroids_group):
+    grid.clear()
+    for asteroid in asteroids_group:
+        grid.insert(asteroid, asteroid.rect.centerx, asteroid.rect.centery, asteroid.radius)
+
+
+def asteroids_hitting(sprite, grid, collided):
+    """Asteroids colliding with sprite: grid candidates confirmed with pygame's circle test."""
+    candidates = grid.query(sprite.rect.centerx, sprite.rect.centery, collision_radius(sprite))
+    return [asteroid for asteroid in candidates if asteroid.alive() and collided(sprite, asteroid)]
+
+
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
-        self.original_image = pygame.Surface((PLAYER_SIZE * 2, PLAYER_SIZE * 2), pygame.SRCALPHA)
-        # Draw a sleek triangle ship
-        points = [
-            (PLAYER_SIZE, 0),                           # Nose
-            (0, PLAYER_SIZE * 1.5),                     # Bottom-left
-            (PLAYER_SIZE * 0.5, PLAYER_SIZE * 1.2),     # Indent for thruster
-            (PLAYER_SIZE * 1.5, PLAYER_SIZE * 1.2),     # Indent for thruster
-            (PLAYER_SIZE * 2, PLAYER_SIZE * 1.5)        # Bottom-right
-        ]
-        pygame.draw.polygon(self.original_image, NEON_CYAN, points)
-        
-        self.image = self.original_image
+        if not rotation_atlas.has("player"):
+            original_image = pygame.Surface((PLAYER_SIZE * 2, PLAYER_SIZE * 2), pygame.SRCALPHA)
+            # Draw a sleek triangle ship
+            points = [
+                (PLAYER_SIZE, 0),                           # Nose
+                (0, PLAYER_SIZE * 1.5),                     # Bottom-left
+                (PLAYER_SIZE * 0.5, PLAYER_SIZE * 1.2),     # Indent for thruster
+                (PLAYER_SIZE * 1.5, PLAYER_SIZE * 1.2),     # Indent for thruster
+                (PLAYER_SIZE * 2, PLAYER_SIZE * 1.5)        # Bottom-right
+            ]
+            pygame.draw.polygon(original_image, NEON_CYAN, points)
+            rotation_atlas.register("player", original_image)
+            # Faded copy for the invincibility blink (shared surfaces can't use set_alpha)
+            faded_image = original_image.copy()
+            faded_image.fill((255, 255, 255, PLAYER_BLINK_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+            rotation_atlas.register("player_faded", faded_image)
+
+        self.shape_id = "player"
+        self.image = rotation_atlas.get(self.shape_id, 0)
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.pos = pygame.math.Vector2(self.rect.center)
         self.velocity = pygame.math.Vector2(0, 0)
         self.angle = 0  # Pointing upwards
-        self.last_shot_time = 0
+        self.last_shot_time = -PLAYER_GUN_COOLDOWN # Ready to fire from the first step
+        self.prev_pos = pygame.math.Vector2(self.pos) # Position before the last step, for drawing
         self.lives = PLAYER_START_LIVES
         self.is_invincible = False
         self.invincibility_timer = 0
-        self.last_update_time_invincibility = pygame.time.get_ticks() # Init here
         self.is_accelerating = False
+        self.thrust_particle_debt = 0.0 # Fractional particles owed to the thrust trail
 
     def rotate(self, angle_degrees):
         self.angle = (self.angle + angle_degrees) % 360
-        self.image = pygame.transform.rotate(self.original_image, -self.angle) # Pygame rotates counter-clockwise
+        self.update_image()
+
+    def update_image(self):
+        self.image = rotation_atlas.get(self.shape_id, -self.angle) # Pygame rotates counter-clockwise
         self.rect = self.image.get_rect(center=self.pos)
 
-    def thrust(self):
+    def thrust(self, dt):
         self.is_accelerating = True
         rad_angle = math.radians(self.angle)
         acceleration = pygame.math.Vector2(math.sin(rad_angle), -math.cos(rad_angle)) * PLAYER_ACCELERATION
-        self.velocity += acceleration
+        self.velocity += acceleration * dt
         if self.velocity.length() > PLAYER_MAX_SPEED:
             self.velocity.scale_to_length(PLAYER_MAX_SPEED)
 
     def shoot(self, bullets_group, particles_group):
-        current_time = pygame.time.get_ticks()
+        current_time = sim_ticks
         if current_time - self.last_shot_time > PLAYER_GUN_COOLDOWN:
             self.last_shot_time = current_time
             rad_angle = math.radians(self.angle)
@@ -110,14 +236,13 @@ class Player(pygame.sprite.Sprite):
             bullet = Bullet(bullet_start_pos, self.angle)
             bullets_group.add(bullet)
             
-            # Muzzle flash particle
-            for _ in range(3): # Small burst
-                 particles_group.add(Particle(bullet_start_pos, ORANGE_THRUST, random.uniform(1,3), random.uniform(5,10), self.angle + random.uniform(-30,30), spread_angle=30))
+            # Muzzle flash particles, a small burst
+            particles_group.emit(bullet_start_pos, ORANGE_THRUST, 3, size=(1, 3), lifespan=(5 / 60, 10 / 60), angle=self.angle, spread_angle=90)
 
 
-    def update(self, particles_group): # This one correctly uses particles_group
-        self.velocity *= PLAYER_DECELERATION # Apply friction
-        self.pos += self.velocity
+    def update(self, dt, particles_group): # This one correctly uses particles_group
+        self.velocity *= PLAYER_FRICTION ** dt # Apply friction
+        self.pos += self.velocity * dt
         
         # Screen wrapping
         if self.pos.x < 0: self.pos.x = SCREEN_WIDTH
@@ -128,73 +253,76 @@ class Player(pygame.sprite.Sprite):
         self.rect.center = self.pos
 
         if self.is_invincible:
-            # Calculate time elapsed since last update for invincibility timer
-            current_ticks = pygame.time.get_ticks()
-            elapsed_time = current_ticks - self.last_update_time_invincibility
-            self.invincibility_timer -= elapsed_time
+            # Count down in simulation time, so a slow frame doesn't shorten invincibility
+            current_ticks = sim_ticks
+            self.invincibility_timer -= dt * 1000
             
             if self.invincibility_timer <= 0:
                 self.is_invincible = False
-                self.image.set_alpha(255) # Ensure fully visible when invincibility ends
+                self.shape_id = "player" # Ensure fully visible when invincibility ends
             else:
                 # Blinking effect
                 if (current_ticks // 200) % 2 == 0:
-                     self.image.set_alpha(255)
+                     self.shape_id = "player"
                 else:
-                     self.image.set_alpha(100)
+                     self.shape_id = "player_faded"
         else:
-            self.image.set_alpha(255) # Ensure fully visible if not invincible
-        
-        self.last_update_time_invincibility = pygame.time.get_ticks() # Update for next frame's calculation
+            self.shape_id = "player" # Ensure fully visible if not invincible
+        self.update_image()
 
         if self.is_accelerating:
-            self.add_thrust_particles(particles_group)
-            self.is_accelerating = False # Reset for next frame
+            self.add_thrust_particles(dt, particles_group)
+            self.is_accelerating = False # Reset for next step
 
 
-    def add_thrust_particles(self, particles_group):
+    def add_thrust_particles(self, dt, particles_group):
         rad_angle = math.radians(self.angle)
         # Position particles at the "rear" of the ship
         offset_distance = PLAYER_SIZE * 0.8
         particle_pos = self.pos - pygame.math.Vector2(math.sin(rad_angle), -math.cos(rad_angle)) * offset_distance
         
-        for _ in range(2): # Create a couple of particles per frame of thrust
-            particles_group.add(Particle(particle_pos, ORANGE_THRUST, 
-                                         size=random.uniform(2, 5), 
-                                         lifespan=random.uniform(10, 20),
-                                         angle=self.angle + 180 + random.uniform(-20, 20), # Opposite direction
-                                         speed_multiplier=0.5,
-                                         spread_angle=20))
+        # Emit at a steady rate while thrusting, opposite to the ship's direction
+        self.thrust_particle_debt += THRUST_PARTICLE_RATE * dt
+        count = int(self.thrust_particle_debt)
+        self.thrust_particle_debt -= count
+        particles_group.emit(particle_pos, ORANGE_THRUST, count,
+                             size=(2, 5),
+                             lifespan=(10 / 60, 20 / 60),
+                             angle=self.angle + 180,
+                             speed_multiplier=0.5,
+                             spread_angle=60)
 
 
     def reset_position(self):
         self.pos = pygame.math.Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
         self.velocity = pygame.math.Vector2(0, 0)
+        self.prev_pos = pygame.math.Vector2(self.pos) # Teleport, don't interpolate
         self.angle = 0
         self.rotate(0) # To update image and rect
         self.is_invincible = True
         self.invincibility_timer = PLAYER_INVINCIBILITY_DURATION
-        self.last_update_time_invincibility = pygame.time.get_ticks()
 
 
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, pos, angle):
         super().__init__()
-        self.image = pygame.Surface((4, 10), pygame.SRCALPHA) # Thin rectangle
-        self.image.fill(NEON_GREEN)
-        self.original_image = self.image
-        self.image = pygame.transform.rotate(self.original_image, -angle)
+        if not rotation_atlas.has("bullet"):
+            original_image = pygame.Surface((4, 10), pygame.SRCALPHA) # Thin rectangle
+            original_image.fill(NEON_GREEN)
+            rotation_atlas.register("bullet", original_image)
+        self.image = rotation_atlas.get("bullet", -angle)
         self.rect = self.image.get_rect(center=pos)
         
         self.pos = pygame.math.Vector2(pos)
+        self.prev_pos = pygame.math.Vector2(pos)
         rad_angle = math.radians(angle)
         self.velocity = pygame.math.Vector2(math.sin(rad_angle), -math.cos(rad_angle)) * BULLET_SPEED
         self.lifespan = BULLET_LIFESPAN
 
-    def update(self): # Takes no extra arguments
-        self.pos += self.velocity
+    def update(self, dt):
+        self.pos += self.velocity * dt
         self.rect.center = self.pos
-        self.lifespan -= 1
+        self.lifespan -= dt
         if self.lifespan <= 0:
             self.kill()
 
@@ -210,22 +338,29 @@ class Asteroid(pygame.sprite.Sprite):
         super().__init__()
         self.size_level = size_level
         self.radius = ASTEROID_SIZES[self.size_level]
-        
-        self.points = []
-        num_vertices = random.randint(ASTEROID_VERTICES_MIN, ASTEROID_VERTICES_MAX)
-        for i in range(num_vertices):
-            angle = (i / num_vertices) * 2 * math.pi
-            r = self.radius * random.uniform(0.7, 1.3)
-            x = r * math.cos(angle) + self.radius 
-            y = r * math.sin(angle) + self.radius
-            self.points.append((x, y))
-
-        self.image = pygame.Surface((self.radius * 2.6, self.radius * 2.6), pygame.SRCALPHA) 
-        pygame.draw.polygon(self.image, NEON_MAGENTA, self.points, 2) 
-        self.original_image = self.image 
+
+        # Pick one of the shared outlines for this size, generating it on first use
+        self.shape_id = ("asteroid", size_level, random.randrange(ASTEROID_SHAPE_VARIANTS))
+        if not rotation_atlas.has(self.shape_id):
+            points = []
+            num_vertices = random.randint(ASTEROID_VERTICES_MIN, ASTEROID_VERTICES_MAX)
+            for i in range(num_vertices):
+                angle = (i / num_vertices) * 2 * math.pi
+                r = self.radius * random.uniform(0.7, 1.3)
+                x = r * math.cos(angle) + self.radius 
+                y = r * math.sin(angle) + self.radius
+                points.append((x, y))
+
+            original_image = pygame.Surface((self.radius * 2.6, self.radius * 2.6), pygame.SRCALPHA) 
+            pygame.draw.polygon(original_image, NEON_MAGENTA, points, 2) 
+            rotation_atlas.register(self.shape_id, original_image)
+
+        self.angle = random.uniform(0, 360) # Random start angle so shared outlines don't line up
+        self.image = rotation_atlas.get(self.shape_id, self.angle)
         
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.math.Vector2(pos)
+        self.prev_pos = pygame.math.Vector2(pos)
         
         if initial_velocity:
             self.velocity = initial_velocity
@@ -234,69 +369,131 @@ class Asteroid(pygame.sprite.Sprite):
             speed = random.uniform(ASTEROID_MIN_SPEED, ASTEROID_MAX_SPEED)
             self.velocity = pygame.math.Vector2(speed, 0).rotate(random_angle)
         
-        self.rotation_speed = random.uniform(-1, 1) * 2 
-        self.angle = 0
+        self.rotation_speed = random.uniform(-1, 1) * ASTEROID_MAX_SPIN
 
-    def update(self, *args): # <<< --- CORRECTED HERE: Added *args
-        self.pos += self.velocity
+    def update(self, dt, *args): # Ignores the particles group the player needs
+        self.pos += self.velocity * dt
         
         if self.pos.x < -self.radius: self.pos.x = SCREEN_WIDTH + self.radius
         if self.pos.x > SCREEN_WIDTH + self.radius: self.pos.x = -self.radius
         if self.pos.y < -self.radius: self.pos.y = SCREEN_HEIGHT + self.radius
         if self.pos.y > SCREEN_HEIGHT + self.radius: self.pos.y = -self.radius
         
-        self.angle = (self.angle + self.rotation_speed) % 360
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
+        self.angle = (self.angle + self.rotation_speed * dt) % 360
+        self.image = rotation_atlas.get(self.shape_id, self.angle)
         self.rect = self.image.get_rect(center=self.pos)
 
     def split(self, asteroids_group, particles_group):
         if self.size_level > 1:
             for _ in range(2): 
-                vel_offset = pygame.math.Vector2(random.uniform(-1,1), random.uniform(-1,1)).normalize() * 0.5
+                vel_offset = pygame.math.Vector2(random.uniform(-1,1), random.uniform(-1,1)).normalize() * ASTEROID_SPLIT_KICK
                 new_vel = self.velocity + vel_offset
                 new_asteroid = Asteroid(self.pos, self.size_level - 1, initial_velocity=new_vel)
                 all_sprites.add(new_asteroid) # Add to all_sprites for general update and drawing
                 asteroids_group.add(new_asteroid)
         
-        for _ in range(int(self.radius * 0.5)): 
-            particles_group.add(Particle(self.pos, RED_EXPLOSION, 
-                                         size=random.uniform(1,4), 
-                                         lifespan=random.uniform(20,40),
-                                         speed_multiplier=random.uniform(0.5, 1.5)))
+        particles_group.emit(self.pos, RED_EXPLOSION, int(self.radius * 0.5),
+                             size=(1, 4),
+                             lifespan=(20 / 60, 40 / 60),
+                             speed_multiplier=(0.5, 1.5))
         self.kill()
 
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, pos, color, size, lifespan, angle=None, speed_multiplier=1.0, spread_angle=360):
-        super().__init__()
-        self.pos = pygame.math.Vector2(pos)
-        self.color = color
-        self.size = size
-        self.lifespan = lifespan
-        self.max_lifespan = lifespan 
-
-        self.image = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (self.size, self.size), self.size)
-        self.rect = self.image.get_rect(center=self.pos)
-
-        if angle is None: 
-            direction_angle = random.uniform(0, 360)
-        else: 
-            direction_angle = angle + random.uniform(-spread_angle / 2, spread_angle / 2)
-
-        speed = random.uniform(1, 3) * speed_multiplier
-        self.velocity = pygame.math.Vector2(speed, 0).rotate(direction_angle)
-
-    def update(self): # Takes no extra arguments
-        self.pos += self.velocity
-        self.rect.center = self.pos
-        self.lifespan -= 1
-
-        alpha = max(0, int(255 * (self.lifespan / self.max_lifespan)))
-        self.image.set_alpha(alpha)
-
-        if self.lifespan <= 0:
-            self.kill()
+class ParticleEngine:
+    """All particles in preallocated arrays, updated in one vectorized pass.
+
+    Live particles are packed into slots [0, count). Each is drawn as a cached dot texture
+    picked by (color, radius, fade level), so emitting thousands of sparks allocates nothing.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.radius = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.fields = (self.pos, self.velocity, self.life, self.max_life, self.radius, self.color)
+        self.color_ids = {}
+        self.dots = [] # dots[color id][radius][fade level]
+
+    def color_id(self, color):
+        # Bake the dot textures for a color the first time it is emitted
+        if color not in self.color_ids:
+            self.color_ids[color] = len(self.dots)
+            by_radius = [None]
+            for radius in range(1, PARTICLE_MAX_RADIUS + 1):
+                by_level = []
+                for level in range(PARTICLE_ALPHA_LEVELS + 1):
+                    dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                    alpha = 255 * level // PARTICLE_ALPHA_LEVELS
+                    pygame.draw.circle(dot, color + (alpha,), (radius, radius), radius)
+                    by_level.append(dot)
+                by_radius.append(by_level)
+            self.dots.append(by_radius)
+        return self.color_ids[color]
+
+    def emit(self, pos, color, amount, size, lifespan, angle=None, spread_angle=360, speed_multiplier=1.0):
+        """Spawn particles at pos; size, lifespan (seconds) and speed_multiplier may be (low, high) ranges."""
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return
+        new = slice(self.count, self.count + amount)
+
+        if angle is None:
+            direction = np.random.uniform(0, 360, amount)
+        else:
+            direction = angle + np.random.uniform(-spread_angle / 2, spread_angle / 2, amount)
+        direction = np.radians(direction)
+        speed = np.random.uniform(*PARTICLE_SPEED, amount) * np.random.uniform(*np.broadcast_to(speed_multiplier, 2), amount)
+
+        self.pos[new] = pos
+        self.velocity[new, 0] = np.cos(direction) * speed
+        self.velocity[new, 1] = np.sin(direction) * speed
+        self.life[new] = np.random.uniform(*np.broadcast_to(lifespan, 2), amount)
+        self.max_life[new] = self.life[new]
+        self.radius[new] = np.clip(np.random.uniform(*np.broadcast_to(size, 2), amount), 1, PARTICLE_MAX_RADIUS)
+        self.color[new] = self.color_id(color)
+        self.count += amount
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.velocity[:n] * dt
+        self.life[:n] -= dt
+
+        np.greater(self.life[:n], 0, out=self.alive[:n])
+        survivors = int(np.count_nonzero(self.alive[:n]))
+        if survivors < n:
+            # Swap-remove: survivors past the new count move into the dead slots before it
+            holes = np.flatnonzero(~self.alive[:survivors])
+            movers = survivors + np.flatnonzero(self.alive[survivors:n])
+            for field in self.fields:
+                field[holes] = field[movers]
+            self.count = survivors
+
+    def draw(self, surface, lag=0.0):
+        """Blit every particle, drawn where it was lag seconds before the last update."""
+        n = self.count
+        if n == 0:
+            return
+        # Fade out with remaining life, quantized to the baked alpha levels
+        level = np.ceil(self.life[:n] / self.max_life[:n] * PARTICLE_ALPHA_LEVELS).astype(np.int32)
+        radius = self.radius[:n]
+        pos = self.pos[:n] - self.velocity[:n] * lag if lag else self.pos[:n]
+        topleft = pos.astype(np.int32) - radius[:, None]
+        dots = self.dots
+        surface.blits(
+            [(dots[c][r][a], (x, y)) for c, r, a, (x, y) in
+             zip(self.color[:n].tolist(), radius.tolist(), level.tolist(), topleft.tolist())],
+            doreturn=False,
+        )
+
+    def empty(self):
+        self.count = 0
 
 
 # --- Game Initialization ---
@@ -305,9 +502,12 @@ pygame.mixer.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Sleek Asteroids")
 clock = pygame.time.Clock()
+starfield = Starfield((SCREEN_WIDTH, SCREEN_HEIGHT), STAR_COUNT, background=BLACK,
+                      brightness=(50, 150), radii=(1, 2), twinkle=STAR_TWINKLE_COUNT)
 
 # --- Game Variables ---
 score = 0
+sim_ticks = 0 # Simulation clock in milliseconds; stands in for pygame.time.get_ticks in game logic
 game_over = False
 show_start_screen = True
 
@@ -315,11 +515,15 @@ show_start_screen = True
 all_sprites = pygame.sprite.Group()
 asteroids = pygame.sprite.Group()
 bullets = pygame.sprite.Group()
-particles = pygame.sprite.Group() 
+particles = ParticleEngine()
 
 player = Player() # Create player instance first
 all_sprites.add(player)
 
+asteroid_grid = SpatialHash()
+player_collide = pygame.sprite.collide_circle_ratio(PLAYER_HIT_RATIO)
+bullet_collide = pygame.sprite.collide_circle_ratio(BULLET_HIT_RATIO)
+
 
 def spawn_initial_asteroids(player_pos=None):
     for _ in range(INITIAL_ASTEROID_COUNT):
@@ -349,10 +553,88 @@ def next_level():
     spawn_initial_asteroids(player.pos)
 
 
+def simulate_step(dt, keys):
+    """Advance the game by one fixed step of dt seconds."""
+    global score, game_over, sim_ticks
+    sim_ticks += dt * 1000
+
+    # Remember where everything was, so drawing can blend towards the new positions
+    for sprite in all_sprites:
+        sprite.prev_pos.update(sprite.pos)
+    for sprite in bullets:
+        sprite.prev_pos.update(sprite.pos)
+
+    if keys[pygame.K_LEFT]:
+        player.rotate(PLAYER_TURN_SPEED * dt)
+    if keys[pygame.K_RIGHT]:
+        player.rotate(-PLAYER_TURN_SPEED * dt)
+    if keys[pygame.K_UP]:
+        player.thrust(dt)
+    if keys[pygame.K_SPACE]:
+        player.shoot(bullets, particles)
+
+    # Update
+    all_sprites.update(dt, particles) # Player uses particles, Asteroid ignores it
+    bullets.update(dt)
+    particles.update(dt)
+
+    # Check for collisions
+    # Broadphase: hash the asteroids once, then each bullet / the player only tests nearby ones
+    build_asteroid_grid(asteroid_grid, asteroids)
+
+    if not player.is_invincible:
+        # Player-Asteroid collision
+        hits = asteroids_hitting(player, asteroid_grid, player_collide)
+        for hit_asteroid in hits:
+            player.lives -= 1
+            hit_asteroid.split(asteroids, particles) # Asteroid breaks (and kills itself)
+            
+            particles.emit(player.pos, RED_EXPLOSION, 30, size=(2, 5), lifespan=(30 / 60, 60 / 60))
+            
+            if player.lives <= 0:
+                game_over = True
+            else:
+                player.reset_position()
+
+
+    # Bullets-Asteroids collision
+    # The grid holds the asteroids from the start of the step, so fragments from this step's
+    # splits can't be hit until the next one. An asteroid split earlier in the loop is dead
+    # and skipped, so a second bullet reaching it in the same step flies on (groupcollide
+    # used to consume both bullets and split the asteroid twice)
+    for bullet in bullets.sprites():
+        hit_asteroids_list = asteroids_hitting(bullet, asteroid_grid, bullet_collide)
+        if hit_asteroids_list:
+            bullet.kill()
+        for asteroid_hit in hit_asteroids_list:
+            score += ASTEROID_POINTS[asteroid_hit.size_level]
+            asteroid_hit.split(asteroids, particles) # This also kills the original asteroid
+
+    if not asteroids and not game_over and not show_start_screen:
+        next_level()
+
+
+def draw_interpolated(group, surface, alpha):
+    """Blit a group's sprites blended alpha of the way from prev_pos to pos."""
+    blits = []
+    for sprite in group:
+        rect = sprite.image.get_rect()
+        offset = sprite.pos - sprite.prev_pos
+        # A sprite that wrapped around the screen edge or respawned is drawn where it is now
+        if abs(offset.x) < SCREEN_WIDTH / 2 and abs(offset.y) < SCREEN_HEIGHT / 2:
+            rect.center = sprite.prev_pos + offset * alpha
+        else:
+            rect.center = sprite.pos
+        blits.append((sprite.image, rect))
+    surface.blits(blits, doreturn=False)
+
+
 # --- Game Loop ---
 running = True
+accumulator = 0.0
 while running:
-    dt = clock.tick(FPS) / 1000.0 
+    # Game time follows the wall clock: slow frames run extra fixed steps instead of slowing play
+    frame_time = min(clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -387,60 +669,21 @@ while running:
         continue 
 
     keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT]:
-        player.rotate(PLAYER_TURN_SPEED)
-    if keys[pygame.K_RIGHT]:
-        player.rotate(-PLAYER_TURN_SPEED)
-    if keys[pygame.K_UP]:
-        player.thrust()
-    if keys[pygame.K_SPACE]:
-        player.shoot(bullets, particles)
-
-    # Update
-    all_sprites.update(particles) # Player uses particles, Asteroid now ignores it
-    bullets.update()
-    particles.update()
-
-    # Check for collisions
-    if not player.is_invincible:
-        # Player-Asteroid collision
-        hits = pygame.sprite.spritecollide(player, asteroids, False, pygame.sprite.collide_circle_ratio(0.85)) 
-        for hit_asteroid in hits:
-            player.lives -= 1
-            hit_asteroid.split(asteroids, particles) # Asteroid breaks (and kills itself)
-            
-            for _ in range(30):
-                 particles.add(Particle(player.pos, RED_EXPLOSION, random.uniform(2,5), random.uniform(30,60)))
-            
-            if player.lives <= 0:
-                game_over = True
-            else:
-                player.reset_position()
-
-
-    # Bullets-Asteroids collision
-    # groupcollide: bullet_group, asteroid_group, dokill_bullet, dokill_asteroid, collision_detection_func
-    bullet_hits = pygame.sprite.groupcollide(bullets, asteroids, True, False, pygame.sprite.collide_circle_ratio(0.9))
-    for bullet, hit_asteroids_list in bullet_hits.items():
-        for asteroid_hit in hit_asteroids_list:
-            score += ASTEROID_POINTS[asteroid_hit.size_level]
-            asteroid_hit.split(asteroids, particles) # This also kills the original asteroid
-
-    if not asteroids and not game_over and not show_start_screen:
-        next_level()
+    accumulator += frame_time
+    while accumulator >= SIM_DT:
+        simulate_step(SIM_DT, keys)
+        accumulator -= SIM_DT
+        if game_over:
+            break
+    alpha = accumulator / SIM_DT # How far the display is between the last two steps
 
     # Draw / Render
-    screen.fill(BLACK)
-    
-    for _ in range(50): 
-        star_pos = (random.randrange(SCREEN_WIDTH), random.randrange(SCREEN_HEIGHT))
-        star_size = random.randint(1,2)
-        star_brightness = random.randint(50,150)
-        pygame.draw.circle(screen, (star_brightness, star_brightness, star_brightness), star_pos, star_size)
+    starfield.update(frame_time)
+    starfield.draw(screen) # Also clears the screen
 
-    all_sprites.draw(screen)
-    bullets.draw(screen)
-    particles.draw(screen)
+    draw_interpolated(all_sprites, screen, alpha)
+    draw_interpolated(bullets, screen, alpha)
+    particles.draw(screen, lag=(1 - alpha) * SIM_DT)
 
     draw_text(screen, f"Score: {score}", 24, SCREEN_WIDTH / 2, 10, WHITE)
     
@@ -463,7 +706,7 @@ while running:
         ]
         # Blink lives icons if player is invincible
         is_visible = True
-        if player.is_invincible and (pygame.time.get_ticks() // 200) % 2 != 0:
+        if player.is_invincible and (int(sim_ticks) // 200) % 2 != 0:
             is_visible = False
         
         if is_visible:
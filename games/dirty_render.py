@@ -0,0 +1,111 @@
+"""Full-screen or dirty-rectangle rendering for the Pygame games.
+
+In full mode every frame repaints the background, draws every sprite and flips the whole
+display, which is what the games have always done. In dirty mode the background is
+painted once into a cached surface (so it stops animating), each frame only restores the
+areas the sprites covered last frame, and only those areas plus the new sprite rects are
+pushed with pygame.display.update. Fixed HUD regions are refreshed every frame in both
+modes. On software-rendered displays, where flip copies the whole window, this saves most
+of the per-frame cost.
+
+The optional overlay shows the frame rate and the time spent on each frame's work (before
+the clock waits) in both modes, so the two can be compared while playing.
+"""
+import time
+
+import pygame
+
+from text_cache import render_text
+
+TOGGLE_MODE_KEY = pygame.K_F2
+TOGGLE_OVERLAY_KEY = pygame.K_F3
+OVERLAY_RECT = (0, 0, 420, 20)  # Size of the overlay strip; it sits at the bottom-left
+OVERLAY_TEXT_SIZE = 18
+OVERLAY_SMOOTHING = 0.05  # Weight of the newest frame in the running work-time average
+
+
+class FrameRenderer:
+    def __init__(self, screen, hud_rects=(), dirty=False):
+        """hud_rects: screen areas the HUD draws into; they are redrawn every frame."""
+        self.screen = screen
+        self.dirty = dirty
+        self.show_overlay = False
+        self.background = None
+        self.hud_rects = [pygame.Rect(rect) for rect in hud_rects]
+        self.overlay_rect = pygame.Rect(OVERLAY_RECT)
+        self.overlay_rect.bottomleft = screen.get_rect().bottomleft
+        self.previous_rects = []  # Sprite areas drawn last frame, cleared at the next one
+        self.current_rects = []
+        self.needs_full_redraw = True
+        self.frame_start = time.perf_counter()
+        self.work_ms = {False: 0.0, True: 0.0}  # Running average per mode (keyed by self.dirty)
+
+    def handle_event(self, event):
+        """Switch mode or overlay on their keys; returns True if the event was used."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == TOGGLE_MODE_KEY:
+            self.dirty = not self.dirty
+        elif event.key == TOGGLE_OVERLAY_KEY:
+            self.show_overlay = not self.show_overlay
+        else:
+            return False
+        self.invalidate()
+        return True
+
+    def invalidate(self):
+        """Repaint everything next frame, e.g. after another screen has drawn over the game."""
+        self.needs_full_redraw = True
+        self.background = None
+
+    def start_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def draw_background(self, paint):
+        """Clear the screen for a new frame; paint(surface) draws the full background."""
+        self.current_rects = []
+        if not self.dirty:
+            paint(self.screen)
+            return
+        if self.background is None:
+            self.background = pygame.Surface(self.screen.get_size()).convert()
+            paint(self.background)
+        if self.needs_full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            return
+        for rect in self.previous_rects + self.refresh_rects():
+            self.screen.blit(self.background, rect, rect)
+
+    def draw_sprites(self, group):
+        """Draw a group, remembering where each sprite went."""
+        drawn = self.screen.blits([(sprite.image, sprite.rect) for sprite in group])
+        if self.dirty:
+            self.current_rects.extend(drawn)
+
+    def draw_overlay(self, clock):
+        if not self.show_overlay:
+            return
+        mode, other = ("dirty", "full") if self.dirty else ("full", "dirty")
+        text = (
+            f"[F2] {mode}: {clock.get_fps():.0f} fps, {self.work_ms[self.dirty]:.2f} ms/frame"
+            f"  ({other}: {self.work_ms[not self.dirty]:.2f} ms)"
+        )
+        self.screen.fill((0, 0, 0), self.overlay_rect)
+        text_surface = render_text(text, OVERLAY_TEXT_SIZE, (255, 255, 0))
+        self.screen.blit(text_surface, text_surface.get_rect(midleft=self.overlay_rect.midleft).move(4, 0))
+
+    def refresh_rects(self):
+        return self.hud_rects + [self.overlay_rect] if self.show_overlay else self.hud_rects
+
+    def present(self):
+        """Push the frame to the display and record how long its work took."""
+        if not self.dirty or self.needs_full_redraw:
+            pygame.display.flip()
+            self.needs_full_redraw = False
+        else:
+            pygame.display.update(self.previous_rects + self.current_rects + self.refresh_rects())
+        self.previous_rects = self.current_rects
+
+        work_ms = (time.perf_counter() - self.frame_start) * 1000
+        average = self.work_ms[self.dirty]
+        self.work_ms[self.dirty] = average + (work_ms - average) * OVERLAY_SMOOTHING if average else work_ms
@@ -1,7 +1,8 @@
 import pygame
-import random
 import sys
-import math
+import argparse
+import json
+import numpy as np
 
 # Initialize Pygame
 pygame.init()
@@ -15,6 +16,14 @@ FPS = 60
 BALL_RADIUS = GRID_SIZE // 2  # Match ball size to grid size
 MIN_SPEED = 5
 MAX_SPEED = 10
+START_SPEED = 8
+RANDOMNESS = 0.02  # Max velocity jitter added per update
+NUM_TEAMS = 2  # Defaults, can be overridden with --teams / --balls
+BALLS_PER_TEAM = 1
+KEYFRAME_INTERVAL = 600  # Ticks between full snapshots in a replay
+REPLAY_VERSION = 1
+SCRUB_REPEAT_DELAY = 250  # ms before a held Left/Right starts repeating while scrubbing a replay
+SCRUB_REPEAT_INTERVAL = 60  # ms between repeated seeks
 
 # Colors
 BLACK = (0, 0, 0)
@@ -25,174 +34,494 @@ YIN_BALL_COLOR = (17, 76, 90)  # NocturnalExpedition
 YANG_COLOR = (23, 43, 54)  # OceanicNoir (Dark)
 YANG_BALL_COLOR = (217, 232, 227)  # MysticMint
 
+# Probe points around the ball's circumference (like in JS version), computed once
+PROBE_ANGLES = np.radians(np.arange(0, 360, 45))
+PROBE_DX = np.cos(PROBE_ANGLES) * BALL_RADIUS
+PROBE_DY = np.sin(PROBE_ANGLES) * BALL_RADIUS
+# A probe that is more horizontal than vertical bounces the ball on the x axis
+PROBE_FLIPS_X = np.abs(np.cos(PROBE_ANGLES)) > np.abs(np.sin(PROBE_ANGLES))
+
+# Offsets of the 8 cells surrounding a ball, used for the trapped check
+NEIGHBOUR_DX = np.array([0, 1, 0, -1, 1, -1, 1, -1])
+NEIGHBOUR_DY = np.array([1, 0, -1, 0, 1, -1, -1, 1])
+
 # Create screen
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption('Pong War')
 clock = pygame.time.Clock()
 
 # Fonts - Use a nicer game-like font
-try:
-    # Try to load a nicer built-in font first with smaller size
-    available_fonts = pygame.font.get_fonts()
-    if 'comicsansms' in available_fonts:
-        font = pygame.font.SysFont('comicsansms', 28)
-    elif 'impact' in available_fonts:
-        font = pygame.font.SysFont('impact', 28)
-    elif 'verdana' in available_fonts:
-        font = pygame.font.SysFont('verdana', 28)
-    else:
-        font = pygame.font.Font(None, 28)  # Default pygame font
-except:
-    font = pygame.font.SysFont('Arial', 28)  # Fallback
-
-class Ball:
-    def __init__(self, x, y, ball_color, team, reverse_color):
-        self.x = x
-        self.y = y
+def load_font(size):
+    try:
+        # Try to load a nicer built-in font first
+        available_fonts = pygame.font.get_fonts()
+        if 'comicsansms' in available_fonts:
+            return pygame.font.SysFont('comicsansms', size)
+        elif 'impact' in available_fonts:
+            return pygame.font.SysFont('impact', size)
+        elif 'verdana' in available_fonts:
+            return pygame.font.SysFont('verdana', size)
+        else:
+            return pygame.font.Font(None, size)  # Default pygame font
+    except:
+        return pygame.font.SysFont('Arial', size)  # Fallback
+
+# Built once: the smaller font for the score and a larger one for the game over message
+font = load_font(28)
+game_over_font = load_font(40)
+
+def team_palette(num_teams):
+    """Return (names, territory colors, ball colors) for the given number of teams."""
+    if num_teams == 2:
+        return ['yin', 'yang'], [YIN_COLOR, YANG_COLOR], [YIN_BALL_COLOR, YANG_BALL_COLOR]
+
+    names, colors, ball_colors = [], [], []
+    for team in range(num_teams):
+        hue = 360 * team / num_teams
+        color = pygame.Color(0)
+        color.hsva = (hue, 45, 90, 100)
+        ball_color = pygame.Color(0)
+        ball_color.hsva = (hue, 80, 35, 100)
+        names.append(chr(ord('A') + team) if team < 26 else str(team + 1))
+        colors.append(tuple(color)[:3])
+        ball_colors.append(tuple(ball_color)[:3])
+    return names, colors, ball_colors
+
+class Balls:
+    """All balls in the match, stored as struct-of-arrays so they update in one batch."""
+
+    def __init__(self, num_teams, balls_per_team, ball_colors, rng):
         self.radius = BALL_RADIUS
-        self.ball_color = ball_color
-        self.reverse_color = reverse_color
-        self.team = team  # 0 for light, 1 for dark
-        
-        # Initial velocity (similar to JS version)
-        if team == 0:  # Day team
-            self.vx = 8
-            self.vy = -8
-        else:  # Night team
-            self.vx = -8
-            self.vy = 8
-    
+        self.rng = rng  # Per-game random stream, so a seed reproduces the whole match
+        team_columns = np.arange(GRID_WIDTH) * num_teams // GRID_WIDTH
+
+        xs, ys, vxs, vys, teams = [], [], [], [], []
+        for team in range(num_teams):
+            # Start in the middle of the team's own strip of territory
+            columns = np.flatnonzero(team_columns == team)
+            center_x = (columns[0] + columns[-1] + 1) * GRID_SIZE / 2
+            direction = 1 if team % 2 == 0 else -1
+            for i in range(balls_per_team):
+                xs.append(center_x)
+                ys.append(HEIGHT * (i + 1) / (balls_per_team + 1))
+                # Day team goes up-right, night team down-left (similar to JS version)
+                vxs.append(START_SPEED * direction)
+                vys.append(-START_SPEED * direction * (1 if i % 2 == 0 else -1))
+                teams.append(team)
+
+        self.x = np.array(xs, dtype=np.float64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.vx = np.array(vxs, dtype=np.float64)
+        self.vy = np.array(vys, dtype=np.float64)
+        self.team = np.array(teams, dtype=np.int8)
+
+        # One pre-drawn sprite per team, blitted in a single batch
+        self.sprites = []
+        for color in ball_colors:
+            sprite = pygame.Surface((self.radius * 2 + 1, self.radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (self.radius, self.radius), self.radius)
+            self.sprites.append(sprite)
+
+    def __len__(self):
+        return len(self.x)
+
     def update(self, grid):
+        """Advance every ball one tick and return the flat indices of the squares they claimed."""
         # Check for collisions with squares
-        self.check_square_collision(grid)
-        
+        flips = self.check_square_collision(grid)
+
         # Check for collisions with walls
         self.check_boundary_collision()
-        
-        # Move the ball
+
+        # Move the balls
         self.x += self.vx
         self.y += self.vy
-        
+
         # Add randomness to movement (like in the JS version)
         self.add_randomness()
-    
+        return flips
+
     def check_square_collision(self, grid):
-        # Check multiple points around the ball's circumference (like in JS version)
-        for angle in range(0, 360, 45):  # Check 8 points around the ball
-            angle_rad = math.radians(angle)
-            check_x = self.x + math.cos(angle_rad) * self.radius
-            check_y = self.y + math.sin(angle_rad) * self.radius
-            
-            # Convert to grid coordinates
-            grid_x = int(check_x // GRID_SIZE)
-            grid_y = int(check_y // GRID_SIZE)
-            
-            if 0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT:
-                # If we hit a square of the opposite team
-                if grid[grid_y][grid_x] != self.team:
-                    # Change the square color to our team
-                    grid[grid_y][grid_x] = self.team
-                    
-                    # Determine bounce direction based on the angle
-                    if abs(math.cos(angle_rad)) > abs(math.sin(angle_rad)):
-                        self.vx = -self.vx
-                    else:
-                        self.vy = -self.vy
-                    
-                    # Only bounce once per update
-                    return
-    
+        # Grid coordinates of every probe of every ball, shape (balls, probes)
+        grid_x = ((self.x[:, None] + PROBE_DX) // GRID_SIZE).astype(np.intp)
+        grid_y = ((self.y[:, None] + PROBE_DY) // GRID_SIZE).astype(np.intp)
+        inside = (grid_x >= 0) & (grid_x < GRID_WIDTH) & (grid_y >= 0) & (grid_y < GRID_HEIGHT)
+        cells = grid[np.clip(grid_y, 0, GRID_HEIGHT - 1), np.clip(grid_x, 0, GRID_WIDTH - 1)]
+
+        # A probe hits when it lands on a square of another team
+        hits = inside & (cells != self.team[:, None])
+        hit_balls = np.flatnonzero(hits.any(axis=1))
+        if not len(hit_balls):
+            return np.empty(0, dtype=np.intp)
+
+        # Only the first probe that hits counts, so each ball bounces once per update
+        probes = hits[hit_balls].argmax(axis=1)
+        hit_x = grid_x[hit_balls, probes]
+        hit_y = grid_y[hit_balls, probes]
+
+        # If several balls hit the same square, the first one claims it. The others then
+        # look at the square again, as if the balls had moved one after another: a ball of
+        # yet another team still bounces off it (and claims it in turn), while a ball whose
+        # own team now owns it passes on.
+        targets = hit_y * GRID_WIDTH + hit_x
+        pending = np.arange(len(hit_balls))
+        flipped = []
+        while len(pending):
+            claimed, first = np.unique(targets[pending], return_index=True)
+            winners = pending[first]
+            grid.flat[claimed] = self.team[hit_balls[winners]]
+            flipped.append(claimed)
+
+            # Determine bounce direction based on the angle
+            flips_x = PROBE_FLIPS_X[probes[winners]]
+            self.vx[hit_balls[winners[flips_x]]] *= -1
+            self.vy[hit_balls[winners[~flips_x]]] *= -1
+
+            losers = np.setdiff1d(pending, winners, assume_unique=True)
+            pending = losers[grid.flat[targets[losers]] != self.team[hit_balls[losers]]]
+        return np.unique(np.concatenate(flipped))
+
     def check_boundary_collision(self):
-        if self.x + self.vx > WIDTH - self.radius or self.x + self.vx < self.radius:
-            self.vx = -self.vx
-        if self.y + self.vy > HEIGHT - self.radius or self.y + self.vy < self.radius:
-            self.vy = -self.vy
-    
+        next_x = self.x + self.vx
+        next_y = self.y + self.vy
+        np.negative(self.vx, out=self.vx, where=(next_x > WIDTH - self.radius) | (next_x < self.radius))
+        np.negative(self.vy, out=self.vy, where=(next_y > HEIGHT - self.radius) | (next_y < self.radius))
+
     def add_randomness(self):
         # Add small random changes to velocity (like in JS version)
-        self.vx += random.uniform(-0.02, 0.02)
-        self.vy += random.uniform(-0.02, 0.02)
-        
-        # Limit the speed of the ball
-        self.vx = max(min(self.vx, MAX_SPEED), -MAX_SPEED)
-        self.vy = max(min(self.vy, MAX_SPEED), -MAX_SPEED)
-        
-        # Make sure the ball always maintains a minimum speed
-        if abs(self.vx) < MIN_SPEED:
-            self.vx = MIN_SPEED if self.vx > 0 else -MIN_SPEED
-        if abs(self.vy) < MIN_SPEED:
-            self.vy = MIN_SPEED if self.vy > 0 else -MIN_SPEED
-    
+        self.vx += self.rng.uniform(-RANDOMNESS, RANDOMNESS, len(self))
+        self.vy += self.rng.uniform(-RANDOMNESS, RANDOMNESS, len(self))
+
+        # Limit the speed of the balls
+        np.clip(self.vx, -MAX_SPEED, MAX_SPEED, out=self.vx)
+        np.clip(self.vy, -MAX_SPEED, MAX_SPEED, out=self.vy)
+
+        # Make sure the balls always maintain a minimum speed
+        for v in (self.vx, self.vy):
+            slow = np.abs(v) < MIN_SPEED
+            v[slow] = np.where(v[slow] > 0, MIN_SPEED, -MIN_SPEED)
+
+    def trapped(self, grid):
+        """Return a mask of balls surrounded by other teams' territory."""
+        grid_x = (self.x // GRID_SIZE).astype(np.intp)[:, None] + NEIGHBOUR_DX
+        grid_y = (self.y // GRID_SIZE).astype(np.intp)[:, None] + NEIGHBOUR_DY
+        inside = (grid_x >= 0) & (grid_x < GRID_WIDTH) & (grid_y >= 0) & (grid_y < GRID_HEIGHT)
+        cells = grid[np.clip(grid_y, 0, GRID_HEIGHT - 1), np.clip(grid_x, 0, GRID_WIDTH - 1)]
+
+        # Any adjacent cell that isn't another team's means the ball is not trapped
+        foreign = (cells != self.team[:, None]) & (cells >= 0)
+        return np.all(~inside | foreign, axis=1)
+
+    def remove(self, mask):
+        keep = ~mask
+        self.x, self.y = self.x[keep], self.y[keep]
+        self.vx, self.vy = self.vx[keep], self.vy[keep]
+        self.team = self.team[keep]
+
+    def teams_alive(self):
+        return np.unique(self.team).tolist()
+
+    def teams_trapped(self, grid):
+        """Return the teams whose balls are all trapped at once."""
+        trapped = self.trapped(grid)
+        if not trapped.any():
+            return []
+        free_teams = np.unique(self.team[~trapped])
+        return np.setdiff1d(self.team[trapped], free_teams).tolist()
+
+    def remove_teams(self, teams):
+        self.remove(np.isin(self.team, teams))
+
+    def get_state(self):
+        return {'x': self.x.copy(), 'y': self.y.copy(), 'vx': self.vx.copy(),
+                'vy': self.vy.copy(), 'team': self.team.copy()}
+
+    def set_state(self, state):
+        self.x, self.y = state['x'].copy(), state['y'].copy()
+        self.vx, self.vy = state['vx'].copy(), state['vy'].copy()
+        self.team = state['team'].astype(np.int8)
+
     def draw(self):
-        pygame.draw.circle(screen, self.ball_color, (int(self.x), int(self.y)), self.radius)
+        sprites = [self.sprites[team] for team in self.team.tolist()]
+        positions = zip((self.x.astype(int) - self.radius).tolist(),
+                        (self.y.astype(int) - self.radius).tolist())
+        screen.blits(list(zip(sprites, positions)), doreturn=False)
 
-def initialize_grid():
-    # -1 is unclaimed, 0 is light team, 1 is dark team
-    grid = [[-1 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-    
-    # Initialize left half for light team
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH // 2):
-            grid[y][x] = 0
-    
-    # Initialize right half for dark team
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH // 2, GRID_WIDTH):
-            grid[y][x] = 1
-    
-    return grid
-
-def draw_grid(grid):
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            if grid[y][x] == 0:  # Yin team (Light)
-                pygame.draw.rect(screen, YIN_COLOR, rect)
-            elif grid[y][x] == 1:  # Yang team (Dark)
-                pygame.draw.rect(screen, YANG_COLOR, rect)
-
-def count_territories(grid):
-    light_count = 0
-    dark_count = 0
-    
-    for row in grid:
-        for cell in row:
-            if cell == 0:
-                light_count += 1
-            elif cell == 1:
-                dark_count += 1
-    
-    return light_count, dark_count
+def initialize_grid(num_teams):
+    # -1 is unclaimed, otherwise the index of the owning team.
+    # The board is split into vertical strips, one per team (left/right halves for two teams)
+    team_columns = np.arange(GRID_WIDTH) * num_teams // GRID_WIDTH
+    return np.tile(team_columns.astype(np.int8), (GRID_HEIGHT, 1))
 
-def check_trapped(ball, grid):
-    # Check if the ball is trapped (surrounded by opposite team's territory)
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
-    grid_x = int(ball.x // GRID_SIZE)
-    grid_y = int(ball.y // GRID_SIZE)
-    
-    for dx, dy in directions:
-        nx, ny = grid_x + dx, grid_y + dy
-        if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-            # If there's any adjacent cell that's not the opposite team, the ball is not trapped
-            if grid[ny][nx] != 1 - ball.team:
-                return False
-    
-    return True
+class GridRenderer:
+    """Draws the whole grid by writing one pixel per cell and scaling it up to the screen."""
+
+    def __init__(self, colors):
+        # The last palette entry is picked by the -1 (unclaimed) cells
+        self.palette = np.array(list(colors) + [BLACK], dtype=np.uint8)
+        self.cells = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
+
+    def draw(self, grid):
+        pygame.surfarray.blit_array(self.cells, self.palette[grid.T])
+        pygame.transform.scale(self.cells, (WIDTH, HEIGHT), screen)
+
+def count_territories(grid, num_teams):
+    return np.bincount(grid[grid >= 0], minlength=num_teams).tolist()
+
+class Match:
+    """One game of Pong War. Everything random comes from the seed, so it can be replayed."""
+
+    def __init__(self, num_teams, balls_per_team, seed):
+        self.num_teams = num_teams
+        self.balls_per_team = balls_per_team
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.grid = initialize_grid(num_teams)
+        self.balls = Balls(num_teams, balls_per_team, team_palette(num_teams)[2], self.rng)
+        self.tick = 0
+        self.game_over = False
+        self.winner = None  # Stays None on a draw
+
+    def step(self):
+        """Advance one tick and return the flat indices of the squares that changed hands."""
+        flips = self.balls.update(self.grid)
+        self.tick += 1
+
+        # A team is knocked out once all of its balls are trapped; the last team left wins
+        trapped_teams = self.balls.teams_trapped(self.grid)
+        if trapped_teams:
+            self.balls.remove_teams(trapped_teams)
+            teams_alive = self.balls.teams_alive()
+            if len(teams_alive) <= 1:
+                self.game_over = True
+                self.winner = teams_alive[0] if teams_alive else None
+        return flips
+
+    def snapshot(self):
+        return {'tick': self.tick, 'grid': self.grid.copy(), 'balls': self.balls.get_state(),
+                'rng': json.dumps(self.rng.bit_generator.state)}
+
+    def restore(self, snapshot):
+        self.tick = snapshot['tick']
+        self.grid = snapshot['grid'].copy()
+        self.balls.set_state(snapshot['balls'])
+        self.rng.bit_generator.state = json.loads(snapshot['rng'])
+        self.game_over = False
+        self.winner = None
+
+class ReplayRecorder:
+    """Records a match as its seed, the squares flipped on each tick and periodic keyframes."""
 
-def main():
-    # Initialize the grid
-    grid = initialize_grid()
+    def __init__(self, match, keyframe_interval=KEYFRAME_INTERVAL):
+        self.match = match
+        self.keyframe_interval = keyframe_interval
+        self.flip_cells = []
+        self.flip_teams = []
+        self.keyframes = [match.snapshot()]
+
+    def record(self, flips):
+        """Call after every match.step() with the flips it returned."""
+        self.flip_cells.append(flips.astype(np.uint16))
+        self.flip_teams.append(self.match.grid.flat[flips])
+        if self.match.tick % self.keyframe_interval == 0 and not self.match.game_over:
+            self.keyframes.append(self.match.snapshot())
+
+    def save(self, path):
+        match = self.match
+        ticks = len(self.flip_cells)
+        offsets = np.zeros(ticks + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(cells) for cells in self.flip_cells])
+        ball_counts = [len(keyframe['balls']['x']) for keyframe in self.keyframes]
+        ball_offsets = np.zeros(len(self.keyframes) + 1, dtype=np.int64)
+        ball_offsets[1:] = np.cumsum(ball_counts)
+
+        arrays = {
+            'meta': np.array([REPLAY_VERSION, match.seed, match.num_teams, match.balls_per_team,
+                              self.keyframe_interval, ticks], dtype=np.int64),
+            'flip_offsets': offsets,
+            'flip_cells': np.concatenate(self.flip_cells or [np.empty(0, np.uint16)]),
+            'flip_teams': np.concatenate(self.flip_teams or [np.empty(0, np.int8)]),
+            'keyframe_grids': np.stack([keyframe['grid'] for keyframe in self.keyframes]),
+            'keyframe_rng': np.array([keyframe['rng'] for keyframe in self.keyframes]),
+            'ball_offsets': ball_offsets,
+        }
+        for name in ('x', 'y', 'vx', 'vy', 'team'):
+            arrays['ball_' + name] = np.concatenate([keyframe['balls'][name] for keyframe in self.keyframes])
+        np.savez_compressed(path, **arrays)
+
+class ReplayPlayer:
+    """Reconstructs any tick of a recorded match from the nearest keyframe before it."""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        version, self.seed, self.num_teams, self.balls_per_team, self.keyframe_interval, self.ticks = \
+            arrays['meta'].tolist()
+        if version != REPLAY_VERSION:
+            raise ValueError(f'Unsupported replay version {version}')
+        self.flip_offsets = arrays['flip_offsets']
+        self.flip_cells = arrays['flip_cells'].astype(np.intp)
+        self.flip_teams = arrays['flip_teams']
+        self.keyframe_grids = arrays['keyframe_grids']
+        self.keyframe_rng = arrays['keyframe_rng'].tolist()
+        self.ball_offsets = arrays['ball_offsets']
+        self.ball_arrays = {name: arrays['ball_' + name] for name in ('x', 'y', 'vx', 'vy', 'team')}
+
+    def _keyframe_index(self, tick):
+        if not 0 <= tick <= self.ticks:
+            raise ValueError(f'Tick {tick} is outside the replay (0-{self.ticks})')
+        return min(tick // self.keyframe_interval, len(self.keyframe_grids) - 1)
+
+    def grid_at(self, tick):
+        """Return the territory grid at a tick by applying flip deltas to a keyframe."""
+        index = self._keyframe_index(tick)
+        grid = self.keyframe_grids[index].copy()
+        start = self.flip_offsets[index * self.keyframe_interval]
+        end = self.flip_offsets[tick]
+
+        # A square can change hands several times; only its last flip counts
+        cells = self.flip_cells[start:end][::-1]
+        teams = self.flip_teams[start:end][::-1]
+        cells, last = np.unique(cells, return_index=True)
+        grid.flat[cells] = teams[last]
+        return grid
+
+    def match_at(self, tick):
+        """Return a live Match positioned at a tick, stepping at most one keyframe interval."""
+        index = self._keyframe_index(tick)
+        start, end = self.ball_offsets[index], self.ball_offsets[index + 1]
+        match = Match(self.num_teams, self.balls_per_team, self.seed)
+        match.restore({
+            'tick': index * self.keyframe_interval,
+            'grid': self.keyframe_grids[index],
+            'balls': {name: values[start:end] for name, values in self.ball_arrays.items()},
+            'rng': self.keyframe_rng[index],
+        })
+        while match.tick < tick:
+            match.step()
+        return match
+
+def soak(ticks, num_teams, balls_per_team, seed, path):
+    """Simulate a match without drawing it and save the replay."""
+    match = Match(num_teams, balls_per_team, seed)
+    recorder = ReplayRecorder(match)
+    while match.tick < ticks and not match.game_over:
+        recorder.record(match.step())
+    recorder.save(path)
+    print(f'Recorded {match.tick} ticks with seed {seed} to {path}')
+
+def check_converging_bounce(seed=0):
+    """Check that two balls of different teams hitting the same third-team square both bounce."""
+    match = Match(3, 1, seed)
+    row = GRID_HEIGHT // 2
+    y = (row + 0.5) * GRID_SIZE
+    match.grid[:] = 2
+    match.grid[row - 1:row + 2, 10] = 0  # Team 0's ball sits in column 10, team 1's in column 12,
+    match.grid[row - 1:row + 2, 12] = 1  # and both reach into the team 2 square between them
+    match.balls.set_state({
+        'x': np.array([11 * GRID_SIZE - BALL_RADIUS, 12 * GRID_SIZE + BALL_RADIUS - 1], dtype=np.float64),
+        'y': np.array([y, y]),
+        'vx': np.array([START_SPEED, -START_SPEED], dtype=np.float64),
+        'vy': np.array([0.0, 0.0]),
+        'team': np.array([0, 1]),
+    })
+    flips = match.balls.check_square_collision(match.grid)
+    ok = (flips.tolist() == [row * GRID_WIDTH + 11]
+          and match.balls.vx.tolist() == [-START_SPEED, START_SPEED])
+    print(f'Converging balls {"both bounce" if ok else "did not both bounce"} (seed {seed})')
+    return ok
+
+def rounded_panel(width, height, radius, alpha):
+    """Create a semi-transparent rounded rectangle surface."""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 0))  # Transparent background
+    pygame.draw.rect(surface, (0, 0, 0, alpha), (0, 0, width, height), border_radius=radius)
+    return surface
+
+class HudCache:
+    """Keeps the score line and game over overlay pre-rendered between frames.
+
+    Text is only re-rendered when its contents change, and the rounded
+    translucent panels behind it are reused while their size stays the same.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.panels = {}
+        self.counts = None
+        self.score = None  # (panel, panel position, text, text position)
+        self.message = None
+        self.overlay = None
+
+    def _panel(self, text_rect, pad_x, pad_y, radius, alpha):
+        # Panels are keyed by size, so a score that changes width reuses earlier ones
+        key = (text_rect.width + pad_x * 2, text_rect.height + pad_y * 2, radius, alpha)
+        if key not in self.panels:
+            self.panels[key] = rounded_panel(*key)
+        return self.panels[key], (text_rect.x - pad_x, text_rect.y - pad_y)
+
+    def draw_score(self, counts):
+        if counts != self.counts:
+            self.counts = counts
+            score_text = font.render(' | '.join(f'{name} {count}' for name, count in zip(self.names, counts)), True, WHITE)
+            if score_text.get_width() > WIDTH - 60:
+                # Many teams: shrink the line so it stays on screen
+                scale = (WIDTH - 60) / score_text.get_width()
+                score_text = pygame.transform.smoothscale(
+                    score_text, (WIDTH - 60, int(score_text.get_height() * scale)))
+            text_rect = score_text.get_rect(topleft=(WIDTH // 2 - score_text.get_width() // 2, HEIGHT - 40))
+            panel, panel_pos = self._panel(text_rect, 15, 8, 12, 180)
+            self.score = (panel, panel_pos, score_text, text_rect.topleft)
+
+        panel, panel_pos, score_text, text_pos = self.score
+        screen.blit(panel, panel_pos)
+        screen.blit(score_text, text_pos)
+
+    def draw_game_over(self, message, color):
+        if (message, color) != self.message:
+            self.message = (message, color)
+            text = game_over_font.render(message, True, color)
+            text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            panel, panel_pos = self._panel(text_rect, 25, 15, 18, 200)
+            self.overlay = (panel, panel_pos, text, text_rect.topleft)
+
+        panel, panel_pos, text, text_pos = self.overlay
+        screen.blit(panel, panel_pos)
+        screen.blit(text, text_pos)
+
+def draw_match(match, grid_renderer, hud, names, colors):
+    # Draw
+    screen.fill(BLACK)
+    grid_renderer.draw(match.grid)
+    match.balls.draw()
     
-    # Create balls - using the colors from the JS version
-    yin_ball = Ball(WIDTH // 4, HEIGHT // 2, YIN_BALL_COLOR, 0, YIN_COLOR)
-    yang_ball = Ball(3 * WIDTH // 4, HEIGHT // 2, YANG_BALL_COLOR, 1, YANG_COLOR)
+    # Display the territory counts with a rounded background for better readability
+    hud.draw_score(count_territories(match.grid, match.num_teams))
     
-    balls = [yin_ball, yang_ball]
+    # Display game over message if applicable
+    if match.game_over:
+        if match.winner is None:
+            hud.draw_game_over('Draw! Press R to restart.', WHITE)
+        else:
+            hud.draw_game_over(f'{names[match.winner].capitalize()} wins! Press R to restart.', colors[match.winner])
+
+def new_seed():
+    return int(np.random.default_rng().integers(2 ** 32))
+
+def main(num_teams=NUM_TEAMS, balls_per_team=BALLS_PER_TEAM, seed=None, record_path=None):
+    names, colors, _ = team_palette(num_teams)
+    grid_renderer = GridRenderer(colors)
+    hud = HudCache(names)
+
+    # Initialize the grid and create the balls - using the colors from the JS version
+    match = Match(num_teams, balls_per_team, new_seed() if seed is None else seed)
+    print(f'Match seed: {match.seed}')
+
+    # Only the first match is recorded; it is saved when it ends or the window closes
+    recorder = ReplayRecorder(match) if record_path else None
     
     # Game loop
     running = True
-    game_over = False
-    winner = None
     
     while running:
         # Handle events
@@ -202,118 +531,127 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
-                elif event.key == pygame.K_r and game_over:
+                elif event.key == pygame.K_r and match.game_over:
                     # Reset the game
-                    grid = initialize_grid()
-                    yin_ball = Ball(WIDTH // 4, HEIGHT // 2, YIN_BALL_COLOR, 0, YIN_COLOR)
-                    yang_ball = Ball(3 * WIDTH // 4, HEIGHT // 2, YANG_BALL_COLOR, 1, YANG_COLOR)
-                    balls = [yin_ball, yang_ball]
-                    game_over = False
-                    winner = None
+                    match = Match(num_teams, balls_per_team, new_seed())
+                    print(f'Match seed: {match.seed}')
         
-        if not game_over:
+        if not match.game_over:
             # Update
-            for ball in balls:
-                ball.update(grid)
-            
-            # Check if any ball is trapped
-            for i, ball in enumerate(balls):
-                if check_trapped(ball, grid):
-                    game_over = True
-                    winner = 1 - i  # The other team wins
-                    break
-        
-        # Draw
-        screen.fill(BLACK)
-        draw_grid(grid)
-        
-        for ball in balls:
-            ball.draw()
-        
-        # Display territory counts
-        light_count, dark_count = count_territories(grid)
-        
-        # Display the score with better visibility
-        # Create a background for the score text for better readability
-        score_text = font.render(f'yin {light_count} | yang {dark_count}', True, WHITE)
-        text_width = score_text.get_width()
-        text_height = score_text.get_height()
-        text_x = WIDTH // 2 - text_width // 2
-        text_y = HEIGHT - 40
-        
-        # Draw a semi-transparent rounded background for the text
-        bg_rect = pygame.Rect(text_x - 15, text_y - 8, text_width + 30, text_height + 16)
+            flips = match.step()
+            if recorder and recorder.match is match:
+                recorder.record(flips)
         
-        # Create a surface for the rounded rectangle
-        bg_surface = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 0))  # Transparent background
-        
-        # Draw a rounded rectangle
-        radius = 12  # Radius for rounded corners
-        rect_width = bg_rect.width
-        rect_height = bg_rect.height
-        
-        # Draw the rounded rectangle with semi-transparency
-        pygame.draw.rect(bg_surface, (0, 0, 0, 180), (0, 0, rect_width, rect_height), border_radius=radius)
-        
-        # Blit the rounded rectangle surface
-        screen.blit(bg_surface, (bg_rect.x, bg_rect.y))
-        
-        # Draw the score text
-        screen.blit(score_text, (text_x, text_y))
-        
-        # Display game over message if applicable
-        if game_over:
-            if winner == 0:
-                message = 'Yin wins! Press R to restart.'
-                color = YIN_COLOR
-            else:
-                message = 'Yang wins! Press R to restart.'
-                color = YANG_COLOR
-            
-            # Create a larger, nicer font for the game over message
-            try:
-                # Try to load a nicer built-in font first
-                available_fonts = pygame.font.get_fonts()
-                if 'comicsansms' in available_fonts:
-                    game_over_font = pygame.font.SysFont('comicsansms', 40)
-                elif 'impact' in available_fonts:
-                    game_over_font = pygame.font.SysFont('impact', 40)
-                elif 'verdana' in available_fonts:
-                    game_over_font = pygame.font.SysFont('verdana', 40)
-                else:
-                    game_over_font = pygame.font.Font(None, 40)  # Default pygame font
-            except:
-                game_over_font = pygame.font.SysFont('Arial', 40)  # Fallback
-                
-            text = game_over_font.render(message, True, color)
-            text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            
-            # Add a rounded background to the game over message
-            bg_rect = pygame.Rect(text_rect.x - 25, text_rect.y - 15, text_rect.width + 50, text_rect.height + 30)
-            
-            # Create a surface for the rounded rectangle
-            bg_surface = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-            bg_surface.fill((0, 0, 0, 0))  # Transparent background
-            
-            # Draw a rounded rectangle
-            radius = 18  # Larger radius for game over message
-            rect_width = bg_rect.width
-            rect_height = bg_rect.height
-            
-            # Draw the rounded rectangle with semi-transparency
-            pygame.draw.rect(bg_surface, (0, 0, 0, 200), (0, 0, rect_width, rect_height), border_radius=radius)
-            
-            # Blit the rounded rectangle surface
-            screen.blit(bg_surface, (bg_rect.x, bg_rect.y))
-            
-            screen.blit(text, text_rect)
+        if recorder and (match.game_over or not running):
+            recorder.save(record_path)
+            print(f'Replay saved to {record_path}')
+            recorder = None
         
+        draw_match(match, grid_renderer, hud, names, colors)
         pygame.display.flip()
         clock.tick(FPS)
     
     pygame.quit()
     sys.exit()
 
+def draw_scrub_preview(grid, grid_renderer, hud, num_teams):
+    # Territory only: balls are not stored between keyframes
+    screen.fill(BLACK)
+    grid_renderer.draw(grid)
+    hud.draw_score(count_territories(grid, num_teams))
+
+def play_replay(path):
+    """Play back a recorded match. Space pauses, Left/Right seek 5 seconds, Home/End jump to the ends.
+
+    Holding Left/Right scrubs through territory previews rebuilt from the flip deltas; the
+    match is only re-simulated (from the nearest keyframe) once the key is released.
+    """
+    player = ReplayPlayer(path)
+    names, colors, _ = team_palette(player.num_teams)
+    grid_renderer = GridRenderer(colors)
+    hud = HudCache(names)
+    match = player.match_at(0)
+    paused = False
+    running = True
+    scrub_tick = None  # Tick shown while Left/Right are held
+    next_scrub_time = 0  # When a held Left/Right steps again (polled, so other keys don't repeat)
+
+    def scrub(step):
+        nonlocal scrub_tick
+        scrub_tick = max(0, min((match.tick if scrub_tick is None else scrub_tick) + step, player.ticks))
+        pygame.display.set_caption(f'Pong War - replay tick {scrub_tick}/{player.ticks}')
+
+    while running:
+        seek = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key in (pygame.K_RIGHT, pygame.K_LEFT):
+                    scrub(FPS * 5 if event.key == pygame.K_RIGHT else -FPS * 5)
+                    next_scrub_time = pygame.time.get_ticks() + SCRUB_REPEAT_DELAY
+                elif event.key == pygame.K_HOME:
+                    seek = 0
+                elif event.key == pygame.K_END:
+                    seek = player.ticks
+
+        if scrub_tick is not None and seek is None:
+            keys = pygame.key.get_pressed()
+            direction = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+            if not (keys[pygame.K_RIGHT] or keys[pygame.K_LEFT]):
+                seek, scrub_tick = scrub_tick, None  # Released: jump the match to the preview
+            elif direction and pygame.time.get_ticks() >= next_scrub_time:
+                scrub(FPS * 5 * direction)
+                next_scrub_time += SCRUB_REPEAT_INTERVAL
+
+        if seek is not None:
+            scrub_tick = None
+            match = player.match_at(max(0, min(seek, player.ticks)))
+        elif scrub_tick is None and not paused and match.tick < player.ticks:
+            match.step()
+
+        if scrub_tick is None and (seek is not None or match.tick % FPS == 0):
+            pygame.display.set_caption(f'Pong War - replay tick {match.tick}/{player.ticks}')
+
+        if scrub_tick is None:
+            draw_match(match, grid_renderer, hud, names, colors)
+        else:
+            draw_scrub_preview(player.grid_at(scrub_tick), grid_renderer, hud, player.num_teams)
+        pygame.display.flip()
+        clock.tick(FPS)
+
+    pygame.quit()
+    sys.exit()
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Pong War')
+    parser.add_argument('--teams', type=int, default=NUM_TEAMS, help='number of teams')
+    parser.add_argument('--balls', type=int, default=BALLS_PER_TEAM, help='balls per team')
+    parser.add_argument('--seed', type=int, help='seed for a reproducible match')
+    parser.add_argument('--record', metavar='FILE', help='save a replay of the match (.npz)')
+    parser.add_argument('--replay', metavar='FILE', help='play back a saved replay')
+    parser.add_argument('--soak', type=int, metavar='TICKS',
+                        help='simulate without drawing for up to TICKS ticks and save to --record')
+    parser.add_argument('--check', action='store_true', help='run the collision self-check and exit')
+    args = parser.parse_args()
+    if not 2 <= args.teams <= GRID_WIDTH // 2:
+        parser.error(f'--teams must be between 2 and {GRID_WIDTH // 2}')
+    if args.balls < 1:
+        parser.error('--balls must be at least 1')
+    if args.seed is not None and not 0 <= args.seed < 2 ** 63:
+        parser.error('--seed must be a non-negative 64-bit integer')
+    if args.soak is not None and not args.record:
+        parser.error('--soak needs --record FILE')
+
+    if args.check:
+        sys.exit(0 if check_converging_bounce(0 if args.seed is None else args.seed) else 1)
+    elif args.replay:
+        play_replay(args.replay)
+    elif args.soak is not None:
+        soak(args.soak, args.teams, args.balls, new_seed() if args.seed is None else args.seed, args.record)
+    else:
+        main(args.teams, args.balls, args.seed, args.record)
@@ -1,13 +1,21 @@
 import pygame
 import sys
+import os
 import math
 import random
 import time
+import json
+import argparse
+import numpy as np
 
 # --- Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 30
+FPS = 144  # Render rate cap; rendering interpolates between physics steps
+PHYSICS_HZ = 120  # Fixed simulation rate, independent of the render rate
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+MAX_FRAME_TIME = 0.25  # Longest frame the simulation will catch up on
+TUNING_FPS = 30  # Per-step constants below were tuned for one step per frame at this rate
 
 # Colors (Limited Palette)
 COLOR_SKY = (122, 122, 255)
@@ -42,6 +50,15 @@ RUMBLE_LENGTH = 4
 MAX_VIEW_DISTANCE = 350 * SEGMENT_LENGTH
 MAX_ANIMATION_SPEED = 180
 
+# Per-scanline road geometry, computed once (one entry per screen row below the horizon)
+ROAD_ROWS = np.arange(HORIZON_Y, SCREEN_HEIGHT)
+ROAD_SCALE = (ROAD_ROWS - HORIZON_Y) / (SCREEN_HEIGHT - HORIZON_Y)
+# Use power for more dramatic perspective near horizon
+ROAD_HALF_WIDTH = (ROAD_WIDTH_MIN + (ROAD_WIDTH_MAX - ROAD_WIDTH_MIN) * ROAD_SCALE**3) / 2
+ROAD_DEPTH = (1 - ROAD_SCALE) * MAX_VIEW_DISTANCE * 0.1  # Approximate depth based on y
+ROAD_CENTER_SHIFT = SCREEN_WIDTH * (1 - ROAD_SCALE)  # How far road_x_offset moves each row
+ROAD_STRIP_MARGIN = SCREEN_WIDTH // 2  # Largest sideways road shift the strips can show
+
 # Player Parameters
 MAX_SPEED = 250
 ACCELERATION = 0.8
@@ -71,15 +88,17 @@ unit = 0
 player_x_offset = 0.0
 target_player_x_offset = 0.0  # Where the player *wants* to steer
 road_x_offset = 0.0
-last_collision_time = 0.0
+last_collision_time = -math.inf
 collision_bump_offset_x = 0.0
+sim_time = 0.0  # Simulation clock, advanced by physics steps only
 game_over = False
 health = MAX_HEALTH
 # Removed last_damage_time, is_invulnerable
 
 # Opponent Cars
-opponents = []
-MAX_OPPONENTS = 4  # Slightly more opponents possible
+MAX_OPPONENTS = 12  # Cheap to draw now that cars are cached sprites
+TRAFFIC_OPPONENTS = 300  # Opponent count in traffic mode (toggle with T)
+traffic_mode = False
 # Removed OPPONENT_BLOCK_DISTANCE, OPPONENT_BLOCK_FACTOR
 OPPONENT_CENTERING_FACTOR = 0.008  # Renamed, but used for general lane changing speed
 INITIAL_MIN_SPACING = SEGMENT_LENGTH * 80
@@ -93,16 +112,40 @@ COLLISION_CHECK_Z = (
 clouds = []
 NUM_CLOUDS = 5
 
+# Background layers: the mountains are rendered once and each cloud size once
+MOUNTAIN_PARALLAX = 0.5  # Mountains scroll this fraction of the road's sideways shift at the horizon
+LAYER_COLORKEY = (255, 0, 255)  # Transparent color for the cached layers (never used in the scenery)
+cloud_sprites = {}
+
 # Base Car Dimensions (used for Rect calculations)
 BASE_CAR_WIDTH = 80
 BASE_CAR_HEIGHT = 40
 
+# Car sprite cache: each color is pre-rendered at this many evenly spaced scales from 0 to 1
+CAR_SPRITE_LEVELS = 64
+car_sprites = {}
+
 # Particle Effect System
-particles = []
-MAX_PARTICLES = 30
+MAX_PARTICLES = 512  # Fixed pool capacity, bursts beyond this are dropped
 PARTICLE_LIFETIME = 0.8
+PARTICLE_MAX_SIZE = 5
+
+# Benchmark Harness
+BENCH_FRAME_RATE = 60  # Simulated display rate for --bench runs
+# Default scripted drive as [physics steps, steer, accel] segments: accelerate, weave, hold full
+# throttle until the player runs into the traffic ahead (with seed 0 this crashes, so the
+# particle phase is exercised), then brake
+BENCH_SCRIPT = [
+    [360, 0, 1], [120, -1, 1], [120, 1, 1], [240, 0, 1], [120, 1, 1], [120, -1, 1], [360, 0, 1],
+    [3600, 0, 1], [240, 0, -1],
+]
+BENCH_SEED = 0
 
 # --- Pygame Setup ---
+if "--bench" in sys.argv:
+    # The benchmark runs without a window, so select SDL's dummy drivers before pygame starts
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Retro Racer Realistic Turn")
@@ -146,63 +189,144 @@ def initialize_clouds():
     ]
 
 
-def initialize_opponents():
-    opponents.clear()
-    colors_available = OPPONENT_COLORS[:]
-    last_z = 0
-    for i in range(MAX_OPPONENTS):
-        if not colors_available:
-            colors_available = OPPONENT_COLORS[:]  # Reuse colors if needed
-        color = random.choice(colors_available)
-        colors_available.remove(color)
-
-        min_z = last_z + INITIAL_MIN_SPACING
-        if i == 0:  # Ensure first opponent isn't too close initially
-            min_z = SEGMENT_LENGTH * 80  # Increased initial distance
-        z_pos = random.uniform(min_z, min_z + INITIAL_MIN_SPACING * 1.5)
-        last_z = z_pos
-
-        initial_offset = random.uniform(-0.7, 0.7)
-        opponents.append(
-            {
-                "z": z_pos,
-                "x_offset": initial_offset,
-                "speed": random.uniform(
-                    MAX_SPEED * 0.65, MAX_SPEED * 0.85
-                ),  # Adjusted speed range
-                "color": color,
-                "target_x_offset": initial_offset,  # Target lane starts same as current
-                "time_since_target_change": random.uniform(
-                    0.0, 3.0
-                ),  # Randomize initial change timer
-            }
+class Opponents:
+    """Opponent cars stored as struct-of-arrays, so AI, respawn and projection run as NumPy passes."""
+
+    def __init__(self):
+        self.reset(0)
+
+    def reset(self, count, dense=False):
+        # Spread cars ahead of the player, the first no closer than INITIAL_MIN_SPACING.
+        # In dense (traffic) mode the gaps behind it shrink so the pack starts close by.
+        spacing = INITIAL_MIN_SPACING
+        if dense:
+            spacing = min(spacing, MAX_VIEW_DISTANCE * 1.5 / max(1, count * 1.75))
+        gaps = spacing + np.random.uniform(0, spacing * 1.5, count)
+        if count:
+            gaps[0] = np.random.uniform(INITIAL_MIN_SPACING, INITIAL_MIN_SPACING * 2.5)
+        self.z = np.cumsum(gaps)
+        self.x_offset = np.random.uniform(-0.7, 0.7, count)
+        self.target_x_offset = self.x_offset.copy()  # Target lane starts same as current
+        self.speed = np.random.uniform(MAX_SPEED * 0.65, MAX_SPEED * 0.85, count)  # Adjusted speed range
+        self.time_since_target_change = np.random.uniform(0.0, 3.0, count)  # Randomize initial change timer
+        self.target_change_time = np.random.uniform(3.0, 6.0, count)  # Change lane less frequently
+        self.store_previous()
+
+        # Deal colors without repeats until every color has been used, then reuse them
+        decks = -(-count // len(OPPONENT_COLORS))
+        self.color_index = np.concatenate(
+            [np.random.permutation(len(OPPONENT_COLORS)) for _ in range(decks)] or [np.empty(0, int)]
+        )[:count]
+
+    def __len__(self):
+        return len(self.z)
+
+    def store_previous(self):
+        # Positions from before the next physics step, used to interpolate rendering
+        self.previous_z = self.z.copy()
+        self.previous_x_offset = self.x_offset.copy()
+
+    def update(self, delta_time, player_speed):
+        # --- Opponent AI ---
+        self.time_since_target_change += delta_time
+
+        # Pick a new random lane position once the timer runs out
+        change = self.time_since_target_change > self.target_change_time
+        count = np.count_nonzero(change)
+        if count:
+            self.target_x_offset[change] = np.random.uniform(-0.8, 0.8, count)
+            self.time_since_target_change[change] = 0.0
+            self.target_change_time[change] = np.random.uniform(3.0, 6.0, count)
+
+        # Move towards the target lane position, scaled by relative speed
+        step = OPPONENT_CENTERING_FACTOR * (self.speed / MAX_SPEED) * delta_time * 100
+        self.x_offset = np.where(
+            self.x_offset < self.target_x_offset,
+            np.minimum(self.x_offset + step, self.target_x_offset),
+            np.maximum(self.x_offset - step, self.target_x_offset),
         )
 
+        # Clamp opponent offset (keep them generally on the road)
+        np.clip(self.x_offset, -0.9, 0.9, out=self.x_offset)
+
+        # --- Opponent Z Position Update ---
+        # Opponent Z position changes based on relative speed to player
+        self.z += (self.speed - player_speed) * delta_time * 5  # Factor 5 for visual speed
+
+        # Respawn logic (if too far behind or too far ahead)
+        respawn = (self.z < -INITIAL_MIN_SPACING * 0.5) | (self.z > MAX_VIEW_DISTANCE * 1.5)
+        count = np.count_nonzero(respawn)
+        if count:
+            self.z[respawn] = np.random.uniform(RESPAWN_DISTANCE_MIN, RESPAWN_DISTANCE_MAX, count)  # Respawn ahead
+            self.x_offset[respawn] = np.random.uniform(-0.7, 0.7, count)
+            self.target_x_offset[respawn] = self.x_offset[respawn]  # Reset target when respawning
+            self.time_since_target_change[respawn] = np.random.uniform(0.0, 3.0, count)  # Reset timer
+            # Respawned cars jump, so don't interpolate them from where they were
+            self.previous_z[respawn] = self.z[respawn]
+            self.previous_x_offset[respawn] = self.x_offset[respawn]
+
+    def project(self, road_offset, alpha=1.0):
+        """Return (indices, screen x, screen y, sprite scale) of visible opponents, furthest first.
+
+        alpha blends from the previous physics step (0) to the current one (1).
+        """
+        if alpha == 1.0:
+            z, x_offset = self.z, self.x_offset
+        else:
+            z = self.previous_z + (self.z - self.previous_z) * alpha
+            x_offset = self.previous_x_offset + (self.x_offset - self.previous_x_offset) * alpha
+        visible = np.flatnonzero((z > 0) & (z < MAX_VIEW_DISTANCE))
+        screen_x, screen_y, sprite_scale = project_to_screen(z[visible], x_offset[visible], road_offset)
+
+        # Sort opponents by depth (y-coordinate) so closer ones draw on top
+        order = np.argsort(screen_y, kind="stable")
+        return visible[order], screen_x[order], screen_y[order], sprite_scale[order]
+
+
+opponents = Opponents()
+
+
+def initialize_opponents():
+    opponents.reset(TRAFFIC_OPPONENTS if traffic_mode else MAX_OPPONENTS, dense=traffic_mode)
+
 
 # --- Helper Functions ---
-def draw_background():
-    # Keep existing background drawing
-    screen.fill(COLOR_SKY)
-    for cloud in clouds:
-        main_rect = pygame.Rect(cloud["x"], cloud["y"], cloud["w"], cloud["h"])
-        offset1_rect = pygame.Rect(
-            cloud["x"] + cloud["w"] * 0.2,
-            cloud["y"] - cloud["h"] * 0.3,
-            cloud["w"] * 0.6,
-            cloud["h"],
-        )
-        offset2_rect = pygame.Rect(
-            cloud["x"] + cloud["w"] * 0.4,
-            cloud["y"] + cloud["h"] * 0.3,
-            cloud["w"] * 0.7,
-            cloud["h"],
-        )
-        pygame.draw.ellipse(screen, COLOR_RUMBLE_WHITE, main_rect)
-        pygame.draw.ellipse(screen, COLOR_RUMBLE_WHITE, offset1_rect)
-        pygame.draw.ellipse(screen, COLOR_RUMBLE_WHITE, offset2_rect)
-    pygame.draw.rect(
-        screen, COLOR_GROUND, (0, HORIZON_Y, SCREEN_WIDTH, SCREEN_HEIGHT - HORIZON_Y)
+def draw_background(road_offset=0.0):
+    # Sky, cached cloud sprites, then the mountain layer (which hides clouds behind it).
+    # The ground is covered by the road strips, so only the sky half is drawn here.
+    screen.fill(COLOR_SKY, (0, 0, SCREEN_WIDTH, HORIZON_Y))
+    screen.blits(
+        [(cloud_sprite(cloud["w"], cloud["h"]), (cloud["x"], cloud["y"] - cloud["h"] * 0.3)) for cloud in clouds],
+        doreturn=False,
     )
+
+    # The mountain layer tiles horizontally, so it can scroll with the camera
+    scroll = int(road_offset * SCREEN_WIDTH * MOUNTAIN_PARALLAX) % SCREEN_WIDTH
+    screen.blit(mountain_layer, (scroll, 0))
+    if scroll:
+        screen.blit(mountain_layer, (scroll - SCREEN_WIDTH, 0))
+
+
+def cloud_sprite(w, h):
+    # A cloud is three overlapping ellipses, the top one reaching 30% of its height above y
+    sprite = cloud_sprites.get((w, h))
+    if sprite is None:
+        sprite = pygame.Surface((math.ceil(w * 1.1) + 1, math.ceil(h * 1.6) + 1))
+        sprite.fill(LAYER_COLORKEY)
+        top = h * 0.3
+        pygame.draw.ellipse(sprite, COLOR_RUMBLE_WHITE, pygame.Rect(0, top, w, h))
+        pygame.draw.ellipse(sprite, COLOR_RUMBLE_WHITE, pygame.Rect(w * 0.2, 0, w * 0.6, h))
+        pygame.draw.ellipse(sprite, COLOR_RUMBLE_WHITE, pygame.Rect(w * 0.4, top + h * 0.3, w * 0.7, h))
+        sprite.set_colorkey(LAYER_COLORKEY, pygame.RLEACCEL)
+        sprite = cloud_sprites[(w, h)] = sprite.convert()
+    return sprite
+
+
+def build_mountain_layer():
+    # The mountain range from the horizon up, on a transparent background.
+    # Both ends sit on the horizon so the layer tiles seamlessly when scrolled.
+    layer = pygame.Surface((SCREEN_WIDTH, HORIZON_Y + 1))
+    layer.fill(LAYER_COLORKEY)
     mountain_points = [
         (0, HORIZON_Y),
         (50, HORIZON_Y - 30),
@@ -222,7 +346,7 @@ def draw_background():
         (750, HORIZON_Y - 25),
         (SCREEN_WIDTH, HORIZON_Y),
     ]
-    pygame.draw.polygon(screen, COLOR_MOUNTAIN, mountain_points)
+    pygame.draw.polygon(layer, COLOR_MOUNTAIN, mountain_points)
     snow_points = [
         (375, HORIZON_Y - 110),
         (400, HORIZON_Y - 150),
@@ -230,72 +354,82 @@ def draw_background():
         (415, HORIZON_Y - 100),
         (385, HORIZON_Y - 100),
     ]
-    pygame.draw.polygon(screen, COLOR_SNOW, snow_points)
-
-
-def draw_road():
-    # Keep existing road drawing logic
-    for y in range(HORIZON_Y, SCREEN_HEIGHT):
-        scale = (y - HORIZON_Y) / (SCREEN_HEIGHT - HORIZON_Y)
-        scale_pow = scale**3  # Use power for more dramatic perspective near horizon
-        road_w = ROAD_WIDTH_MIN + (ROAD_WIDTH_MAX - ROAD_WIDTH_MIN) * scale_pow
-        rumble_w = road_w * 0.05
-        line_w = road_w * 0.02
-
-        # Apply road curvature/offset based on road_x_offset
-        screen_center_x = SCREEN_WIDTH / 2 + road_x_offset * SCREEN_WIDTH * (
-            1 - scale
-        )  # Road shifts based on player turning input influence
-
-        depth_factor = (
-            (1 - scale) * MAX_VIEW_DISTANCE * 0.1
-        )  # Approximate depth based on y
-        segment_index = int((visual_position + depth_factor) / SEGMENT_LENGTH)
-
-        # Rumble strip coloring
-        rumble_color = (
-            COLOR_RUMBLE_RED
-            if (segment_index // RUMBLE_LENGTH) % 2 == 0
-            else COLOR_RUMBLE_WHITE
-        )
-        # Center line coloring (dashed)
-        line_color = (
-            COLOR_LINE
-            if (segment_index // (RUMBLE_LENGTH * 2)) % 2 == 0
-            else COLOR_ROAD
-        )  # Longer dashes
-
-        # Calculate road edges
-        road_x1 = screen_center_x - road_w / 2
-        road_x2 = screen_center_x + road_w / 2
-        rumble_x1 = road_x1 - rumble_w
-        rumble_x2 = road_x2 + rumble_w
-
-        # Draw rumble strips
-        pygame.draw.line(
-            screen, rumble_color, (rumble_x1, y), (road_x1, y), max(1, int(rumble_w))
-        )
-        pygame.draw.line(
-            screen, rumble_color, (road_x2, y), (rumble_x2, y), max(1, int(rumble_w))
-        )
-
-        # Draw road surface (simple line per scanline for this pseudo-3D style)
-        pygame.draw.line(screen, COLOR_ROAD, (road_x1, y), (road_x2, y), 1)
-
-        # Draw center line if wide enough
-        if line_w > 0.5 and line_color != COLOR_ROAD:
-            line_x1 = screen_center_x - line_w / 2
-            line_x2 = screen_center_x + line_w / 2
-            pygame.draw.line(
-                screen, line_color, (line_x1, y), (line_x2, y), max(1, int(line_w))
+    pygame.draw.polygon(layer, COLOR_SNOW, snow_points)
+    layer.set_colorkey(LAYER_COLORKEY, pygame.RLEACCEL)  # RLE makes the mostly empty layer cheap to blit
+    return layer.convert()
+
+
+def draw_road(road_offset, view_position):
+    # The road is copied row by row from the pre-rendered strips: each row picks the
+    # strip for its rumble/center line color phase and is shifted sideways by road_offset.
+    # Neighbouring rows with the same strip and shift are copied in a single blit.
+    shift = np.clip(np.rint(road_offset * ROAD_CENTER_SHIFT), -ROAD_STRIP_MARGIN, ROAD_STRIP_MARGIN)
+    shift = shift.astype(np.int64)
+    segment_index = ((view_position + ROAD_DEPTH) // SEGMENT_LENGTH).astype(np.int64)
+    rumble_white = (segment_index // RUMBLE_LENGTH) % 2
+    line_on = (segment_index // (RUMBLE_LENGTH * 2)) % 2 == 0  # Longer dashes
+    strip = rumble_white * 2 + line_on
+
+    key = strip * (4 * ROAD_STRIP_MARGIN + 1) + shift
+    starts = np.flatnonzero(np.diff(key)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], len(ROAD_ROWS))
+    screen.blits(
+        [
+            (road_strips[index], (0, HORIZON_Y + start), (ROAD_STRIP_MARGIN - offset, start, SCREEN_WIDTH, end - start))
+            for index, offset, start, end in zip(
+                strip[starts].tolist(), shift[starts].tolist(), starts.tolist(), ends.tolist()
             )
+        ],
+        doreturn=False,
+    )
+
 
+def build_road_strips():
+    # Pre-render the straight road once for each (rumble color, center line on/off) phase,
+    # scanline by scanline. Strips are wider than the screen so rows can be shifted sideways.
+    width = SCREEN_WIDTH + 2 * ROAD_STRIP_MARGIN
+    center_x = width / 2
+    strips = []
+    for rumble_color in (COLOR_RUMBLE_RED, COLOR_RUMBLE_WHITE):
+        for line_on in (False, True):
+            strip = pygame.Surface((width, len(ROAD_ROWS))).convert()
+            strip.fill(COLOR_GROUND)
+            for y in range(len(ROAD_ROWS)):
+                road_w = ROAD_HALF_WIDTH[y] * 2
+                rumble_w = road_w * 0.05
+                line_w = road_w * 0.02
+
+                # Calculate road edges
+                road_x1 = center_x - road_w / 2
+                road_x2 = center_x + road_w / 2
+                rumble_x1 = road_x1 - rumble_w
+                rumble_x2 = road_x2 + rumble_w
+
+                # Draw rumble strips
+                pygame.draw.line(
+                    strip, rumble_color, (rumble_x1, y), (road_x1, y), max(1, int(rumble_w))
+                )
+                pygame.draw.line(
+                    strip, rumble_color, (road_x2, y), (rumble_x2, y), max(1, int(rumble_w))
+                )
+
+                # Draw road surface (simple line per scanline for this pseudo-3D style)
+                pygame.draw.line(strip, COLOR_ROAD, (road_x1, y), (road_x2, y), 1)
+
+                # Draw center line if wide enough
+                if line_on and line_w > 0.5:
+                    line_x1 = center_x - line_w / 2
+                    line_x2 = center_x + line_w / 2
+                    pygame.draw.line(
+                        strip, COLOR_LINE, (line_x1, y), (line_x2, y), max(1, int(line_w))
+                    )
+            strips.append(strip)
+    return strips
 
-def get_screen_params_and_rect(z_distance, x_offset):
-    # Keep existing perspective calculation
-    if not (0 < z_distance < MAX_VIEW_DISTANCE):
-        return None, None
 
+def project_to_screen(z_distance, x_offset, road_offset):
+    # Perspective projection for arrays of cars (bottom-center screen point and sprite scale)
     # Simplified perspective calculation (more linear further away)
     perspective_factor = z_distance / MAX_VIEW_DISTANCE
     screen_y_scale = (1 - perspective_factor) ** 0.8  # Adjust power for scaling feel
@@ -303,51 +437,67 @@ def get_screen_params_and_rect(z_distance, x_offset):
 
     # Recalculate road properties at this specific screen_y to place the car correctly
     scale_at_y = (screen_y - HORIZON_Y) / (SCREEN_HEIGHT - HORIZON_Y)
-    scale_pow_at_y = scale_at_y**3
-    road_w_at_y = ROAD_WIDTH_MIN + (ROAD_WIDTH_MAX - ROAD_WIDTH_MIN) * scale_pow_at_y
+    road_w_at_y = ROAD_WIDTH_MIN + (ROAD_WIDTH_MAX - ROAD_WIDTH_MIN) * scale_at_y**3
 
     # Screen center at this y, considering the road's offset/curve
-    screen_center_x_at_y = SCREEN_WIDTH / 2 + road_x_offset * SCREEN_WIDTH * (
-        1 - scale_at_y
-    )
+    screen_center_x_at_y = SCREEN_WIDTH / 2 + road_offset * SCREEN_WIDTH * (1 - scale_at_y)
 
-    # Final screen X position of the car center
-    screen_x = screen_center_x_at_y + x_offset * (
-        road_w_at_y / 2
-    )  # x_offset is relative (-1 to 1)
+    # Final screen X position of the car center, x_offset is relative (-1 to 1)
+    screen_x = screen_center_x_at_y + x_offset * (road_w_at_y / 2)
 
     # Sprite scale based on depth
-    sprite_scale = scale_at_y * 1.0  # Adjust base scale factor if needed
+    return screen_x, screen_y, scale_at_y
+
 
-    # Calculate car rect based on screen position and scale
+def car_rect(screen_x, screen_y, sprite_scale):
+    # Car rect from its screen position and scale, anchor point is bottom-center
     car_width = BASE_CAR_WIDTH * sprite_scale
     car_height = BASE_CAR_HEIGHT * sprite_scale
+    return pygame.Rect(screen_x - car_width / 2, screen_y - car_height, car_width, car_height)
+
+
+def car_sprite(color, level):
+    # Cached sprite of a car at one of the quantized scales, rendered the first time it's needed
+    key = (color, level)
+    sprite = car_sprites.get(key)
+    if sprite is None:
+        scale = level / (CAR_SPRITE_LEVELS - 1)
+        car_width, car_height = BASE_CAR_WIDTH * scale, BASE_CAR_HEIGHT * scale
+        # Wheels stick out 16% of the width on each side and the nose 20% of the height above
+        pad_x, pad_y = car_width * 0.16 + 1, car_height * 0.2 + 1
+        surface = pygame.Surface(
+            (math.ceil(car_width + pad_x * 2), math.ceil(car_height + pad_y + 1)), pygame.SRCALPHA
+        )
+        render_f1_car(surface, pad_x, pad_y, car_width, car_height, color)
+        sprite = car_sprites[key] = (surface.convert_alpha(), pad_x, pad_y)
+    return sprite
 
-    rect_left = screen_x - car_width / 2
-    rect_top = screen_y - car_height  # Anchor point is bottom-center
-    car_rect = pygame.Rect(rect_left, rect_top, car_width, car_height)
 
-    params = {"x": screen_x, "y": screen_y, "scale": sprite_scale}
-    return params, car_rect
+def build_car_sprites():
+    # Pre-render every car color at every scale so drawing a car is a single blit
+    for color in OPPONENT_COLORS + [COLOR_CAR]:
+        for level in range(1, CAR_SPRITE_LEVELS):
+            car_sprite(color, level)
 
 
-def draw_f1_car(params, color, bump_offset=0.0):
-    # Keep existing car drawing logic
-    if params is None or params["scale"] < 0.01:
+def draw_f1_car(x, y, scale, color, bump_offset=0.0):
+    if scale < 0.01:
         return
-    scale = params["scale"]
-    car_x, car_y = params["x"] + bump_offset, params["y"]  # Apply bump offset here
+    car_x, car_y = x + bump_offset, y  # Apply bump offset here
     car_width, car_height = BASE_CAR_WIDTH * scale, BASE_CAR_HEIGHT * scale
 
     # Ensure minimum drawable size to avoid errors with zero dimensions
     if car_width < 1 or car_height < 1:
         return
 
-    draw_x, draw_y = (
-        car_x - car_width / 2,
-        car_y - car_height,
-    )  # Top-left corner for drawing
+    # Blit the cached sprite closest to this scale
+    level = min(CAR_SPRITE_LEVELS - 1, max(1, round(scale * (CAR_SPRITE_LEVELS - 1))))
+    sprite, pad_x, pad_y = car_sprite(color, level)
+    screen.blit(sprite, (car_x - car_width / 2 - pad_x, car_y - car_height - pad_y))
 
+
+def render_f1_car(surface, draw_x, draw_y, car_width, car_height, color):
+    # Draws the car from primitives with its top-left corner at (draw_x, draw_y)
     # --- Car Body Parts (scaled) ---
     body_rect = pygame.Rect(
         draw_x + car_width * 0.1, draw_y, car_width * 0.8, car_height * 0.8
@@ -368,16 +518,16 @@ def draw_f1_car(params, color, bump_offset=0.0):
     )
 
     # Draw main parts
-    pygame.draw.rect(screen, color, wing_rect)
-    pygame.draw.rect(screen, color, body_rect)
-    pygame.draw.polygon(screen, color, nose_poly)
-    pygame.draw.rect(screen, COLOR_BLACK, driver_rect)  # Driver helmet/cockpit area
+    pygame.draw.rect(surface, color, wing_rect)
+    pygame.draw.rect(surface, color, body_rect)
+    pygame.draw.polygon(surface, color, nose_poly)
+    pygame.draw.rect(surface, COLOR_BLACK, driver_rect)  # Driver helmet/cockpit area
 
     # --- Wheels (scaled) ---
     wheel_width, wheel_height = car_width * 0.2, car_height * 0.5
     # Rear Wheels
     pygame.draw.rect(
-        screen,
+        surface,
         COLOR_BLACK,
         (
             draw_x - wheel_width * 0.8,
@@ -387,7 +537,7 @@ def draw_f1_car(params, color, bump_offset=0.0):
         ),
     )
     pygame.draw.rect(
-        screen,
+        surface,
         COLOR_BLACK,
         (
             draw_x + car_width - wheel_width * 0.2,
@@ -399,7 +549,7 @@ def draw_f1_car(params, color, bump_offset=0.0):
     # Front Wheels (slightly smaller/different position)
     f_wheel_width, f_wheel_height = wheel_width * 0.8, wheel_height * 0.8
     pygame.draw.rect(
-        screen,
+        surface,
         COLOR_BLACK,
         (
             draw_x + car_width * 0.05,
@@ -409,7 +559,7 @@ def draw_f1_car(params, color, bump_offset=0.0):
         ),
     )
     pygame.draw.rect(
-        screen,
+        surface,
         COLOR_BLACK,
         (
             draw_x + car_width * 0.95 - f_wheel_width,
@@ -420,12 +570,21 @@ def draw_f1_car(params, color, bump_offset=0.0):
     )
 
 
-def draw_opponents_and_hud(opponents_draw_info):
-    # Draw opponents first (those further away)
-    for item in opponents_draw_info:
-        draw_f1_car(
-            item["params"], item["color"], 0.0
-        )  # No bump offset for opponents visually
+def draw_opponents_and_hud(visible_opponents):
+    # Draw opponents first (those further away), one cached sprite blit each
+    indices, screen_x, screen_y, sprite_scale = visible_opponents
+    levels = np.clip(np.rint(sprite_scale * (CAR_SPRITE_LEVELS - 1)), 1, CAR_SPRITE_LEVELS - 1).astype(int)
+    blits = []
+    for color_index, x, y, scale, level in zip(
+        opponents.color_index[indices].tolist(), screen_x.tolist(), screen_y.tolist(),
+        sprite_scale.tolist(), levels.tolist()
+    ):
+        # Skip cars too small to see, like draw_f1_car does
+        if BASE_CAR_HEIGHT * scale < 1:
+            continue
+        sprite, pad_x, pad_y = car_sprite(OPPONENT_COLORS[color_index], level)
+        blits.append((sprite, (x - BASE_CAR_WIDTH * scale / 2 - pad_x, y - BASE_CAR_HEIGHT * scale - pad_y)))
+    screen.blits(blits, doreturn=False)  # No bump offset for opponents visually
 
     # Draw HUD elements
     score_text = font.render(f"SCORE {int(score)}", True, COLOR_TEXT)
@@ -469,19 +628,16 @@ def draw_opponents_and_hud(opponents_draw_info):
     # Removed powerup drawing section
 
 
-def draw_player_car_and_joystick():
+def draw_player_car_and_joystick(x_offset, bump_offset):
     # Calculate player car's base screen position based on offset
     # The visual offset is exaggerated compared to the logical road offset
-    screen_offset = player_x_offset * (
+    screen_offset = x_offset * (
         SCREEN_WIDTH / 3.0
     )  # How much offset translates to screen pixels
     base_player_screen_x = SCREEN_WIDTH / 2 + screen_offset
 
-    # Player car is always drawn at the bottom, fixed scale
-    player_params = {"x": base_player_screen_x, "y": SCREEN_HEIGHT - 10, "scale": 1.0}
-
-    # Draw the player car with potential collision bump offset
-    draw_f1_car(player_params, COLOR_CAR, collision_bump_offset_x)
+    # Player car is always drawn at the bottom, fixed scale, with potential collision bump offset
+    draw_f1_car(base_player_screen_x, SCREEN_HEIGHT - 10, 1.0, COLOR_CAR, bump_offset)
 
     # Draw decorative joystick graphic (unchanged)
     base_x, base_y = SCREEN_WIDTH - 70, SCREEN_HEIGHT - 70
@@ -499,9 +655,9 @@ def draw_player_car_and_joystick():
     )
 
 
-def check_collisions_accurate(player_rect, visible_opponents_info):
+def check_collisions_accurate(player_rect, visible_opponents):
     global speed, last_collision_time, collision_bump_offset_x, health
-    current_time = time.time()
+    current_time = sim_time
 
     # Removed invulnerability check
 
@@ -509,123 +665,153 @@ def check_collisions_accurate(player_rect, visible_opponents_info):
         return  # Safety check
 
     player_collided_this_frame = False
-    for opp_info in visible_opponents_info:
-        # Only check collision for opponents very close in Z distance
-        if 0 < opp_info["z"] < COLLISION_CHECK_Z:
-            if player_rect.colliderect(opp_info["rect"]):
-                # Calculate overlap for severity (optional, simple check is fine too)
-                overlap_rect = player_rect.clip(opp_info["rect"])
-                # overlap_area = overlap_rect.width * overlap_rect.height
-                # player_area = player_rect.width * player_rect.height
-                # collision_severity = min(1.0, overlap_area / max(1, player_area)) # Avoid division by zero
-                collision_severity = 0.8  # Use a fixed severity for simplicity for now
-
-                # Determine bump direction
-                if player_rect.centerx < opp_info["rect"].centerx:
-                    # Player hit opponent on their left side (or rear-left) -> bump player right
-                    collision_bump_offset_x = (
-                        COLLISION_BUMP_MAGNITUDE * collision_severity
-                    )
-                else:
-                    # Player hit opponent on their right side (or rear-right) -> bump player left
-                    collision_bump_offset_x = (
-                        -COLLISION_BUMP_MAGNITUDE * collision_severity
-                    )
-
-                # Apply effects only if cooldown has passed
-                if current_time >= last_collision_time + COLLISION_COOLDOWN:
-                    speed *= (
-                        1.0 - COLLISION_SLOWDOWN_FACTOR * collision_severity
-                    )  # Slow down based on severity
-                    last_collision_time = current_time
-
-                    # Apply damage (can depend on relative speed too, simplified here)
-                    damage = (
-                        DAMAGE_PER_COLLISION * collision_severity
-                    )  # * (max(10, speed) / MAX_SPEED) # Optional speed factor
-                    health -= damage
-                    # Removed setting last_damage_time and is_invulnerable
-
-                    # Create particle burst at collision point
-                    create_collision_particles(
-                        overlap_rect.centerx, overlap_rect.centery
-                    )
-
-                    if sounds_loaded:
-                        collision_sound.play()
-
-                player_collided_this_frame = True
-                break  # Handle only one collision per frame for simplicity
+    indices, screen_x, screen_y, sprite_scale = visible_opponents
+    # Only check collision for opponents very close in Z distance
+    near = opponents.z[indices] < COLLISION_CHECK_Z
+    for x, y, scale in zip(screen_x[near].tolist(), screen_y[near].tolist(), sprite_scale[near].tolist()):
+        opp_rect = car_rect(x, y, scale)
+        if player_rect.colliderect(opp_rect):
+            # Calculate overlap for severity (optional, simple check is fine too)
+            overlap_rect = player_rect.clip(opp_rect)
+            # overlap_area = overlap_rect.width * overlap_rect.height
+            # player_area = player_rect.width * player_rect.height
+            # collision_severity = min(1.0, overlap_area / max(1, player_area)) # Avoid division by zero
+            collision_severity = 0.8  # Use a fixed severity for simplicity for now
+
+            # Determine bump direction
+            if player_rect.centerx < opp_rect.centerx:
+                # Player hit opponent on their left side (or rear-left) -> bump player right
+                collision_bump_offset_x = (
+                    COLLISION_BUMP_MAGNITUDE * collision_severity
+                )
+            else:
+                # Player hit opponent on their right side (or rear-right) -> bump player left
+                collision_bump_offset_x = (
+                    -COLLISION_BUMP_MAGNITUDE * collision_severity
+                )
+
+            # Apply effects only if cooldown has passed
+            if current_time >= last_collision_time + COLLISION_COOLDOWN:
+                speed *= (
+                    1.0 - COLLISION_SLOWDOWN_FACTOR * collision_severity
+                )  # Slow down based on severity
+                last_collision_time = current_time
+
+                # Apply damage (can depend on relative speed too, simplified here)
+                damage = (
+                    DAMAGE_PER_COLLISION * collision_severity
+                )  # * (max(10, speed) / MAX_SPEED) # Optional speed factor
+                health -= damage
+                # Removed setting last_damage_time and is_invulnerable
+
+                # Create particle burst at collision point
+                create_collision_particles(
+                    overlap_rect.centerx, overlap_rect.centery
+                )
+
+                if sounds_loaded:
+                    collision_sound.play()
+
+            player_collided_this_frame = True
+            break  # Handle only one collision per frame for simplicity
 
     # If no collision this frame, allow bump offset to decay naturally elsewhere
     # (This happens in the main loop now)
 
 
-def create_collision_particles(x, y):
-    # Keep existing particle creation
-    num_particles = random.randint(8, 15)  # Slightly more sparks
-    for _ in range(num_particles):
-        angle = random.uniform(0, 2 * math.pi)
-        p_speed = random.uniform(80, 180)  # Slightly faster particles
-        size = random.randint(2, 5)
-        lifetime = random.uniform(0.2, 0.6)  # Shorter lifetime for sparks
-
-        particles.append(
-            {
-                "x": x,
-                "y": y,
-                "vx": math.cos(angle) * p_speed,
-                "vy": math.sin(angle) * p_speed,
-                "size": size,
-                "color": COLOR_PARTICLE,
-                "created": time.time(),
-                "lifetime": lifetime,
-            }
+class ParticlePool:
+    """Fixed-capacity particle pool backed by arrays; live particles are packed into [0, count)."""
+
+    def __init__(self, capacity, color):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.lifetime = np.ones(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.fields = (self.x, self.y, self.vx, self.vy, self.size, self.age, self.lifetime)
+
+        # One pre-rendered dot per radius so drawing is a single blits() call
+        self.dots = [None]
+        for radius in range(1, PARTICLE_MAX_SIZE + 1):
+            dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(dot, color, (radius, radius), radius)
+            self.dots.append(dot)
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, amount):
+        # Write new particles into the free tail of the pool
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return
+        new = slice(self.count, self.count + amount)
+        angle = np.random.uniform(0, 2 * math.pi, amount)
+        p_speed = np.random.uniform(80, 180, amount)  # Slightly faster particles
+        self.x[new] = x
+        self.y[new] = y
+        self.vx[new] = np.cos(angle) * p_speed
+        self.vy[new] = np.sin(angle) * p_speed
+        self.size[new] = np.random.randint(2, PARTICLE_MAX_SIZE + 1, amount)
+        self.age[new] = 0.0
+        self.lifetime[new] = np.random.uniform(0.2, 0.6, amount)  # Shorter lifetime for sparks
+        self.count += amount
+
+    def update(self, delta_time):
+        n = self.count
+        if n == 0:
+            return
+        # Age by frame time and move the live slice in place
+        live = slice(0, n)
+        self.age[live] += delta_time
+        self.x[live] += self.vx[live] * delta_time
+        self.y[live] += self.vy[live] * delta_time
+        # Optional: Add gravity
+        # self.vy[live] += 98.1 * delta_time # Simple gravity
+
+        np.less(self.age[live], self.lifetime[live], out=self.alive[live])
+        survivors = int(np.count_nonzero(self.alive[live]))
+        if survivors == n:
+            return
+
+        # Swap-remove: dead slots below the new count are filled by survivors above it
+        holes = np.flatnonzero(~self.alive[:survivors])
+        movers = survivors + np.flatnonzero(self.alive[survivors:n])
+        for field in self.fields:
+            field[holes] = field[movers]
+        self.count = survivors
+
+    def draw(self, surface):
+        n = self.count
+        if n == 0:
+            return
+        # Fade out size over the particle's lifetime
+        fade_factor = 1.0 - self.age[:n] / self.lifetime[:n]
+        radius = np.clip((self.size[:n] * fade_factor).astype(int), 1, PARTICLE_MAX_SIZE)
+        left = (self.x[:n] - radius).astype(int)
+        top = (self.y[:n] - radius).astype(int)
+        dots = self.dots
+        surface.blits(
+            [(dots[r], (px, py)) for r, px, py in zip(radius.tolist(), left.tolist(), top.tolist())],
+            doreturn=False,
         )
-        if len(particles) > MAX_PARTICLES * 2:  # Prune if too many instantly
-            particles.pop(0)
 
 
-def update_particles(delta_time):
-    # Keep existing particle update, add gravity maybe? (Optional)
-    current_time = time.time()
-    i = 0
-    while i < len(particles):
-        p = particles[i]
-        age = current_time - p["created"]
-
-        if age > p["lifetime"]:
-            particles.pop(i)
-        else:
-            p["x"] += p["vx"] * delta_time
-            p["y"] += p["vy"] * delta_time
-            # Optional: Add gravity
-            # p['vy'] += 98.1 * delta_time # Simple gravity
-            # p['y'] += p['vy'] * delta_time
+def create_collision_particles(x, y):
+    particles.emit(x, y, random.randint(8, 15))  # Slightly more sparks
 
-            # Fade out size
-            fade_factor = 1.0 - (age / p["lifetime"])
-            current_size = p["size"] * fade_factor
-            p["current_size"] = max(1, int(current_size))  # Store int size for drawing
 
-            i += 1
-    # Trim particle list occasionally if it grows too large
-    if len(particles) > MAX_PARTICLES:
-        particles[:] = particles[-MAX_PARTICLES:]
+def update_particles(delta_time):
+    particles.update(delta_time)
 
 
 def draw_particles():
-    # Keep existing particle drawing
-    for p in particles:
-        # Use stored current_size if available, otherwise calculate on the fly
-        size_to_draw = p.get(
-            "current_size",
-            int(max(1, p["size"] * (1 - (time.time() - p["created"]) / p["lifetime"]))),
-        )
-        if size_to_draw > 0:
-            pygame.draw.circle(
-                screen, p["color"], (int(p["x"]), int(p["y"])), size_to_draw
-            )
+    particles.draw(screen)
 
 
 def draw_game_over():
@@ -661,7 +847,7 @@ def draw_game_over():
 def reset_game():
     global score, speed, position, visual_position, lap, unit, player_x_offset, target_player_x_offset
     global road_x_offset, last_collision_time, collision_bump_offset_x, game_over
-    global health, particles  # Removed last_damage_time, is_invulnerable
+    global health, sim_time  # Removed last_damage_time, is_invulnerable
 
     score = 0
     speed = 0
@@ -672,8 +858,9 @@ def reset_game():
     player_x_offset = 0.0
     target_player_x_offset = 0.0  # Reset target offset
     road_x_offset = 0.0
-    last_collision_time = 0.0
+    last_collision_time = -math.inf
     collision_bump_offset_x = 0.0
+    sim_time = 0.0
     game_over = False
     health = MAX_HEALTH
     particles.clear()
@@ -686,61 +873,23 @@ def reset_game():
         engine_sound.play(-1)  # Restart engine sound
 
 
-# --- Main Game Loop ---
-initialize_clouds()
-initialize_opponents()
-running = True
-lap_distance = 15000  # Distance for one lap
+def physics_step(dt, steer_input, accel_input):
+    # Advance the whole simulation by one fixed step of dt seconds
+    global speed, position, visual_position, lap, unit, score, sim_time, game_over
+    global player_x_offset, target_player_x_offset, road_x_offset, collision_bump_offset_x, health
+    sim_time += dt
 
-if sounds_loaded:
-    engine_sound.play(-1)  # Loop engine sound
-
-while running:
-    delta_time = clock.tick(FPS) / 1000.0
-    # Clamp delta_time to prevent physics issues if frame rate drops drastically
-    delta_time = min(delta_time, 0.1)
-    current_time = time.time()
-
-    # --- Event Handling ---
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and game_over:
-            reset_game()  # Restart game on SPACE if game over
-
-    # --- Game Over State ---
-    if game_over:
-        # Keep drawing background and road for context, then overlay Game Over
-        draw_background()
-        draw_road()
-        # Draw opponents/player frozen? Or skip? Let's skip for cleaner game over.
-        draw_game_over()
-        pygame.display.flip()
-        continue  # Skip the rest of the game loop
-
-    # --- Input Handling ---
-    keys = pygame.key.get_pressed()
-    steer_input = 0
-    accel_input = 0
-    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-        steer_input = -1
-    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-        steer_input = 1
-    if keys[pygame.K_UP] or keys[pygame.K_w]:
-        accel_input = 1
-    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-        accel_input = -1
-
-    # --- Player Physics & State Update ---
     # Acceleration/Braking/Friction
+    # (the constants are per tuning frame, so scale them by the step length)
+    frames = dt * TUNING_FPS
     if accel_input > 0:
         speed += ACCELERATION * (
             1.0 - speed / MAX_SPEED
-        )  # Accel less effective near max speed
+        ) * frames  # Accel less effective near max speed
     elif accel_input < 0:
-        speed += BRAKING  # Braking is constant force
+        speed += BRAKING * frames  # Braking is constant force
     else:
-        speed += FRICTION  # Friction always applies
+        speed += FRICTION * frames  # Friction always applies
     speed = max(0, min(speed, MAX_SPEED))
 
     # --- Steering Update (New Logic) ---
@@ -752,17 +901,17 @@ while running:
 
     # 2. Smoothly move current offset towards target (Lerp)
     diff = target_player_x_offset - player_x_offset
-    player_x_offset += diff * STEERING_RESPONSE_FACTOR * delta_time
+    player_x_offset += diff * STEERING_RESPONSE_FACTOR * dt
 
     # 3. Apply centrifugal force (push outwards on turns) - depends on speed and how hard we are turning
     # Approximated by steer_input magnitude and speed
     # More sophisticated would be rate of change of offset, but this is simpler
     centrifugal_push = steer_input * (speed / MAX_SPEED) * speed * CENTRIFUGAL_FACTOR
-    player_x_offset += centrifugal_push * delta_time
+    player_x_offset += centrifugal_push * dt
 
     # 4. Apply damping / tendency to straighten out (like lateral friction)
     # Reduces sideways drift when not actively steering or counter-steering
-    player_x_offset *= 1.0 - STEERING_DAMPING * delta_time
+    player_x_offset *= 1.0 - STEERING_DAMPING * dt
 
     # 5. Clamp player offset (prevent going too far off road visually)
     # Allow slightly off-road (-1.2 to 1.2) for effect before hard clamp
@@ -775,12 +924,12 @@ while running:
     ) * 0.1  # Camera follows player lateral movement slightly
     road_x_offset -= road_offset_change
     # Damp the road offset so it returns to center slowly
-    road_x_offset *= 0.98  # Slightly slower damping than before
+    road_x_offset *= 0.98**frames  # Slightly slower damping than before
 
     # Position Update (Distance traveled)
-    position += speed * delta_time * 5  # Arbitrary scaling factor for distance units
+    position += speed * dt * 5  # Arbitrary scaling factor for distance units
     visual_increment = min(speed, MAX_ANIMATION_SPEED)  # Road animation speed capped
-    visual_position += visual_increment * delta_time * 5
+    visual_position += visual_increment * dt * 5
 
     # Lap logic
     if position >= lap_distance:
@@ -790,68 +939,11 @@ while running:
     unit = int((position / lap_distance) * 1000)  # Progress within the lap (0-999)
 
     # Score Update
-    score += speed * 0.01 * delta_time * 60  # Score based on speed
+    score += speed * 0.01 * dt * 60  # Score based on speed
 
     # --- Opponent Update ---
-    visible_opponents_info = []
-    for i in range(len(opponents)):
-        opp = opponents[i]
-
-        # --- Opponent AI (New Logic) ---
-        opp["time_since_target_change"] += delta_time
-
-        # Decide if opponent should change target lane (e.g., every few seconds)
-        if opp["time_since_target_change"] > random.uniform(
-            3.0, 6.0
-        ):  # Change lane less frequently
-            opp["target_x_offset"] = random.uniform(
-                -0.8, 0.8
-            )  # Target a random lane position
-            opp["time_since_target_change"] = 0.0
-
-        # Simple movement towards target offset
-        move_factor = OPPONENT_CENTERING_FACTOR * (
-            opp["speed"] / MAX_SPEED
-        )  # Scale movement by relative speed
-        target_offset = opp["target_x_offset"]
-
-        # Move towards the target lane position
-        if opp["x_offset"] < target_offset:
-            opp["x_offset"] = min(
-                opp["x_offset"] + move_factor * delta_time * 100, target_offset
-            )  # Apply delta_time
-        elif opp["x_offset"] > target_offset:
-            opp["x_offset"] = max(
-                opp["x_offset"] - move_factor * delta_time * 100, target_offset
-            )  # Apply delta_time
-
-        # Clamp opponent offset (keep them generally on the road)
-        opp["x_offset"] = max(-0.9, min(0.9, opp["x_offset"]))
-
-        # --- Opponent Z Position Update ---
-        # Opponent Z position changes based on relative speed to player
-        opp["z"] += (opp["speed"] - speed) * delta_time * 5  # Factor 5 for visual speed
-
-        # Respawn logic (if too far behind or too far ahead)
-        if opp["z"] < -INITIAL_MIN_SPACING * 0.5 or opp["z"] > MAX_VIEW_DISTANCE * 1.5:
-            opp["z"] = random.uniform(
-                RESPAWN_DISTANCE_MIN, RESPAWN_DISTANCE_MAX
-            )  # Respawn ahead
-            opp["x_offset"] = random.uniform(-0.7, 0.7)
-            opp["target_x_offset"] = opp["x_offset"]  # Reset target when respawning
-            opp["time_since_target_change"] = random.uniform(0.0, 3.0)  # Reset timer
-
-        # --- Get Screen Coords for Visible Opponents ---
-        params, opp_rect = get_screen_params_and_rect(opp["z"], opp["x_offset"])
-        if params and opp_rect:
-            visible_opponents_info.append(
-                {
-                    "params": params,
-                    "rect": opp_rect,
-                    "z": opp["z"],
-                    "color": opp["color"],
-                }
-            )
+    opponents.update(dt, speed)
+    visible_opponents = opponents.project(road_x_offset)
 
     # --- Collision Detection ---
     # Calculate player's current screen rect for collision
@@ -867,13 +959,13 @@ while running:
         BASE_CAR_WIDTH,
         BASE_CAR_HEIGHT,
     )
-    check_collisions_accurate(player_rect, visible_opponents_info)
+    check_collisions_accurate(player_rect, visible_opponents)
 
     # --- Update Collision Bump Offset ---
     # Decay the visual bump effect
     if collision_bump_offset_x != 0:
         collision_bump_offset_x *= COLLISION_BUMP_DECAY ** (
-            delta_time * 60
+            dt * 60
         )  # Frame-rate independent decay
         if abs(collision_bump_offset_x) < 0.5:
             collision_bump_offset_x = 0.0
@@ -881,9 +973,9 @@ while running:
     # --- Health Regen ---
     # Regenerate health slowly over time if not recently hit (using collision cooldown time)
     if (
-        current_time > last_collision_time + 3.0 and health < MAX_HEALTH
+        sim_time > last_collision_time + 3.0 and health < MAX_HEALTH
     ):  # 3 second delay after last hit
-        health += HEALTH_REGEN_RATE * delta_time
+        health += HEALTH_REGEN_RATE * dt
         health = min(health, MAX_HEALTH)
 
     # --- Check Game Over Condition ---
@@ -894,32 +986,342 @@ while running:
             game_over_sound.play()
 
     # --- Particle Update ---
-    update_particles(delta_time)
+    update_particles(dt)
 
     # --- Cloud Update ---
     for cloud in clouds:
         # Clouds move based on their speed + slight parallax effect from player speed
-        cloud["x"] += cloud["speed"] * (1 + speed / MAX_SPEED * 0.1) * delta_time * 100
+        cloud["x"] += cloud["speed"] * (1 + speed / MAX_SPEED * 0.1) * dt * 100
         if cloud["x"] > SCREEN_WIDTH:
             cloud["x"] = -cloud["w"] - random.randint(0, 50)
             cloud["y"] = random.randint(30, HORIZON_Y - 60)
 
-    # --- Drawing ---
-    draw_background()
-    draw_road()
 
-    # Sort opponents by depth (y-coordinate) so closer ones draw on top
-    visible_opponents_info.sort(
-        key=lambda item: item["params"]["y"], reverse=False
-    )  # Furthest first
+def capture_render_state():
+    # Snapshot of everything the renderer interpolates, taken before each physics step
+    opponents.store_previous()
+    return {
+        "player_x_offset": player_x_offset,
+        "road_x_offset": road_x_offset,
+        "visual_position": visual_position,
+        "bump_offset": collision_bump_offset_x,
+    }
+
+
+def interpolated_render_state(previous, alpha):
+    # Blend the previous and current physics states for drawing between steps
+    current = {
+        "player_x_offset": player_x_offset,
+        "road_x_offset": road_x_offset,
+        "visual_position": visual_position,
+        "bump_offset": collision_bump_offset_x,
+    }
+    return {key: previous[key] + (current[key] - previous[key]) * alpha for key in current}
+
+
+class PhaseTimer:
+    """Accumulates wall-clock time per named frame phase, one sample per frame."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.samples = {}
+        self.current = {}
+        self.last = 0.0
+
+    def start_frame(self):
+        if self.enabled:
+            self.current = {}
+            self.last = time.perf_counter()
+
+    def mark(self, phase):
+        # Charge the time since the previous mark to this phase
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[phase] = self.current.get(phase, 0.0) + now - self.last
+            self.last = now
+
+    def end_frame(self):
+        if self.enabled:
+            self.current["frame"] = sum(self.current.values())
+            for phase, seconds in self.current.items():
+                self.samples.setdefault(phase, []).append(seconds)
+
+    def report(self):
+        return {
+            phase: {
+                "mean_ms": round(float(np.mean(seconds)) * 1000, 3),
+                "p95_ms": round(float(np.percentile(seconds, 95)) * 1000, 3),
+                "max_ms": round(float(np.max(seconds)) * 1000, 3),
+            }
+            for phase, seconds in self.samples.items()
+        }
+
+
+NO_TIMER = PhaseTimer(enabled=False)
+
+
+def render_frame(previous_state, alpha, timer=NO_TIMER):
+    # Draw between the last two physics states, alpha is how far into the next step we are
+    view = interpolated_render_state(previous_state, alpha)
+    draw_background(view["road_x_offset"])
+    timer.mark("background")
+    draw_road(view["road_x_offset"], view["visual_position"])
+    timer.mark("road")
 
-    draw_opponents_and_hud(visible_opponents_info)
+    draw_opponents_and_hud(opponents.project(view["road_x_offset"], alpha))  # Already sorted furthest first
+    timer.mark("sprites")
     draw_particles()
-    draw_player_car_and_joystick()  # Player car drawn last (on top)
+    timer.mark("particles")
+    draw_player_car_and_joystick(view["player_x_offset"], view["bump_offset"])  # Player car drawn last (on top)
+    timer.mark("sprites")
+
+
+def record_input(segments, steer_input, accel_input):
+    # Run-length encode one physics step of input as [steps, steer, accel] segments
+    if segments and segments[-1][1:] == [steer_input, accel_input]:
+        segments[-1][0] += 1
+    else:
+        segments.append([1, steer_input, accel_input])
+
+
+def record_event(segments, name):
+    # Restarts and traffic toggles are stored between the input segments as [name]
+    segments.append([name])
+
+
+def expand_inputs(segments):
+    # One (steer, accel) pair per physics step, with event names in between
+    inputs = []
+    for segment in segments:
+        if len(segment) == 1:
+            inputs.append(segment[0])
+        else:
+            steps, steer, accel = segment
+            inputs.extend([(steer, accel)] * steps)
+    return inputs
+
+
+def apply_event(name):
+    # Shared by the live game and replays so both change state the same way
+    global traffic_mode
+    if name == "traffic":
+        traffic_mode = not traffic_mode  # Toggle traffic mode (hundreds of opponents)
+        initialize_opponents()
+    elif name == "restart":
+        reset_game()
+
+
+def seed_simulation(seed):
+    # All simulation randomness comes from these two generators
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def run_benchmark(segments, seed=0, traffic=False, frame_rate=BENCH_FRAME_RATE):
+    """Replay scripted inputs deterministically and time each frame phase.
+
+    Every frame advances the simulation by 1 / frame_rate seconds, so the same script and
+    seed always produce the same run regardless of how fast the machine is.
+    """
+    global traffic_mode
+    seed_simulation(seed)
+    traffic_mode = traffic
+    reset_game()
+    inputs = expand_inputs(segments)
+    timer = PhaseTimer()
+    frame_time = 1.0 / frame_rate
+    accumulator = 0.0
+    previous_state = capture_render_state()
+    step = 0
+    physics_steps = 0
+    particle_frames = 0
+
+    # After a game over only a recorded restart (or traffic toggle) lets the replay go on
+    while step < len(inputs) and not (game_over and not isinstance(inputs[step], str)):
+        timer.start_frame()
+        accumulator += frame_time
+        while accumulator >= PHYSICS_DT and step < len(inputs):
+            entry = inputs[step]
+            if isinstance(entry, str):
+                apply_event(entry)
+                step += 1
+                if entry == "restart":
+                    previous_state = capture_render_state()
+                continue
+            if game_over:
+                break
+            previous_state = capture_render_state()
+            lap_before = lap
+            physics_step(PHYSICS_DT, *entry)
+            step += 1
+            physics_steps += 1
+            accumulator -= PHYSICS_DT
+            if lap != lap_before:
+                previous_state["visual_position"] -= lap_distance
+        timer.mark("physics")
+        if particles.count:
+            particle_frames += 1
+
+        render_frame(previous_state, accumulator / PHYSICS_DT, timer)
+        pygame.display.flip()
+        timer.mark("flip")
+        timer.end_frame()
+
+    return {
+        "frames": len(timer.samples.get("frame", [])),
+        "steps": physics_steps,
+        "particle_frames": particle_frames,  # Frames that drew crash sparks
+        "seed": seed,
+        "traffic": traffic,
+        "score": int(score),
+        "health": round(health, 2),
+        "game_over": game_over,
+        "phases": timer.report(),
+    }
+
+
+def print_benchmark(result):
+    print(
+        f"{result['frames']} frames, {result['steps']} physics steps, seed {result['seed']}, "
+        f"traffic {'on' if result['traffic'] else 'off'}, score {result['score']}, health {result['health']}, "
+        f"{result['particle_frames']} frames with particles"
+    )
+    print(f"{'phase':<12}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for phase, stats in result["phases"].items():
+        print(f"{phase:<12}{stats['mean_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['max_ms']:>10.3f}")
+
+
+# --- Game Setup ---
+road_strips = build_road_strips()  # Rendered once, used by draw_road
+particles = ParticlePool(MAX_PARTICLES, COLOR_PARTICLE)
+build_car_sprites()
+mountain_layer = build_mountain_layer()
+initialize_clouds()
+initialize_opponents()
+lap_distance = 15000  # Distance for one lap
+
 
-    # --- Display Update ---
-    pygame.display.flip()
+# --- Main Game Loop ---
+def main(seed=None, record_path=None):
+    if seed is None and record_path:
+        # A recording is only replayable with the seed it was played with
+        seed = random.randrange(2**32)
+    if seed is not None:
+        seed_simulation(seed)
+    reset_game()  # Also starts the engine sound
+    running = True
+    accumulator = 0.0
+    previous_state = capture_render_state()
+    recorded = [] if record_path else None
+    start_traffic = traffic_mode
+
+    while running:
+        # Clamp the frame time so a long stall doesn't trigger a burst of catch-up steps
+        frame_time = min(clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+
+        # --- Event Handling ---
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and game_over:
+                apply_event("restart")  # Restart game on SPACE if game over
+                if recorded is not None:
+                    record_event(recorded, "restart")
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                apply_event("traffic")
+                if recorded is not None:
+                    record_event(recorded, "traffic")
+
+        # --- Game Over State ---
+        if game_over:
+            # Keep drawing background and road for context, then overlay Game Over
+            draw_background(road_x_offset)
+            draw_road(road_x_offset, visual_position)
+            # Draw opponents/player frozen? Or skip? Let's skip for cleaner game over.
+            draw_game_over()
+            pygame.display.flip()
+            continue  # Skip the rest of the game loop
+
+        # --- Input Handling ---
+        keys = pygame.key.get_pressed()
+        steer_input = 0
+        accel_input = 0
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            steer_input = -1
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            steer_input = 1
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            accel_input = 1
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            accel_input = -1
+
+        # --- Fixed-Step Physics ---
+        # Run as many fixed steps as the elapsed time allows; the remainder carries over
+        accumulator += frame_time
+        while accumulator >= PHYSICS_DT and not game_over:
+            previous_state = capture_render_state()
+            lap_before = lap
+            physics_step(PHYSICS_DT, steer_input, accel_input)
+            accumulator -= PHYSICS_DT
+            if recorded is not None:
+                record_input(recorded, steer_input, accel_input)
+            if lap != lap_before:
+                # Keep interpolation continuous across the lap wrap
+                previous_state["visual_position"] -= lap_distance
+
+        # --- Drawing ---
+        render_frame(previous_state, accumulator / PHYSICS_DT)
+
+        # --- Display Update ---
+        pygame.display.flip()
 
-# --- Cleanup ---
-pygame.quit()
-sys.exit()
+    if recorded is not None:
+        # Replay with: python race.py --bench --inputs <file>
+        with open(record_path, "w") as f:
+            json.dump({"seed": seed, "traffic": start_traffic, "segments": recorded}, f)
+        steps = sum(segment[0] for segment in recorded if len(segment) == 3)
+        print(f"Recorded {steps} physics steps (seed {seed}) to {record_path}")
+
+    # --- Cleanup ---
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retro racer with a headless benchmark harness.")
+    parser.add_argument("--seed", type=int, help="seed the simulation for a reproducible run")
+    parser.add_argument("--record", metavar="FILE", help="record your inputs to FILE (JSON) for --bench replays")
+    parser.add_argument("--bench", action="store_true", help="replay inputs headless and report per-phase timings")
+    parser.add_argument("--inputs", metavar="FILE", help="input script for --bench (default: built-in drive)")
+    parser.add_argument("--traffic", action="store_true", help="start in traffic mode")
+    parser.add_argument("--json", metavar="FILE", help="also write the --bench report to FILE as JSON")
+    parser.add_argument(
+        "--max-frame-ms", type=float, help="with --bench, exit with status 1 if p95 frame time exceeds this"
+    )
+    args = parser.parse_args()
+    traffic_mode = args.traffic
+
+    if args.bench:
+        segments, seed = BENCH_SCRIPT, BENCH_SEED
+        if args.inputs:
+            with open(args.inputs) as f:
+                script = json.load(f)
+            segments = script["segments"]
+            seed = script.get("seed") or 0
+            traffic_mode = traffic_mode or script.get("traffic", False)
+        if args.seed is not None:
+            seed = args.seed
+        result = run_benchmark(segments, seed, traffic_mode)
+        print_benchmark(result)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(result, f, indent=2)
+        pygame.quit()
+        if not result["particle_frames"]:
+            print("No crash sparks were drawn, so the particles timing is not meaningful")
+            if segments is BENCH_SCRIPT and seed == BENCH_SEED:
+                sys.exit(1)  # The built-in drive is meant to crash; something changed the simulation
+        if args.max_frame_ms is not None and result["phases"]["frame"]["p95_ms"] > args.max_frame_ms:
+            sys.exit(1)
+    else:
+        main(args.seed, args.record)
+    sys.exit()
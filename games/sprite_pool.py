@@ -0,0 +1,75 @@
+"""Sprite pools and shared projectile surfaces for the Pygame games.
+
+Bullets, missiles and power-ups live for a second or two and are fired in bursts, so
+creating a new sprite (and a new Surface) for each one keeps the garbage collector busy
+during the busiest boss phases. A SpritePool keeps killed sprites and hands them back out
+with fresh arguments instead, and sprites of the same color and size share one surface.
+
+Shared surfaces are blitted by every sprite using them: don't draw on them or change their
+alpha. Give a sprite its own copy first if it needs one.
+"""
+from abc import ABC, abstractmethod
+
+import pygame
+
+POOL_MAX_FREE = 256  # Killed sprites kept per pool for reuse; extras are left to the garbage collector
+
+solid_surfaces = {}
+
+
+def solid_surface(color, size):
+    """A shared surface of the given size filled with color, made on first use."""
+    key = (tuple(color), tuple(size))
+    surface = solid_surfaces.get(key)
+    if surface is None:
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()  # Match the display format for the fastest blits
+        solid_surfaces[key] = surface
+    return surface
+
+
+class PooledSprite(pygame.sprite.Sprite, ABC):
+    """A sprite that goes back to its pool when killed.
+
+    Subclasses set themselves up in reset(), which __init__ calls with the same arguments,
+    so a recycled sprite is indistinguishable from a new one.
+    """
+
+    pool = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.reset(*args, **kwargs)
+
+    @abstractmethod
+    def reset(self, *args, **kwargs):
+        """Set the sprite up from the arguments it was created or acquired with."""
+
+    def kill(self):
+        was_alive = self.alive()  # Only hand a sprite back once, however often it is killed
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+
+class SpritePool:
+    def __init__(self, sprite_class, max_free=POOL_MAX_FREE):
+        self.sprite_class = sprite_class
+        self.max_free = max_free
+        self.free = []
+
+    def acquire(self, *args, **kwargs):
+        """A sprite set up with these arguments: a recycled one if any are free, else a new one."""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+        else:
+            sprite = self.sprite_class(*args, **kwargs)
+            sprite.pool = self
+        return sprite
+
+    def release(self, sprite):
+        if len(self.free) < self.max_free:
+            self.free.append(sprite)
@@ -0,0 +1,143 @@
+"""Cached starfield backgrounds shared by the Pygame games.
+
+Stars are drawn once into a few layer surfaces when the field is built. Each frame the
+background is then one blit per layer (up to four while a scrolling layer wraps), however
+many stars there are. Nearer layers are brighter and scroll faster for a parallax effect.
+A small, fixed number of extra stars twinkle; they are blitted from cached dot textures,
+so twinkling costs the same whatever the total star count.
+"""
+import math
+import random
+
+import pygame
+
+STAR_COLORKEY = (255, 0, 255)  # Transparent color for the upper layers and dots (stars are gray)
+TWINKLE_LEVELS = 16  # Brightness steps baked into the twinkle dot textures
+TWINKLE_RATE = (1.5, 4.0)  # radians per second range for each twinkling star
+TWINKLE_DEPTH = 0.7  # How far a twinkling star dims at the bottom of its pulse
+
+
+class Starfield:
+    def __init__(
+        self,
+        size,
+        star_count,
+        layers=3,
+        background=(0, 0, 0),
+        brightness=(50, 150),
+        radii=(1, 2),
+        scroll=(0.0, 0.0),
+        twinkle=0,
+        seed=None,
+    ):
+        """Build the layers.
+
+        size: (width, height) of the field, normally the screen size.
+        brightness: (low, high) gray level range, radii: star radii to pick from.
+        scroll: (x, y) speed of the nearest layer in pixels per second; farther layers are slower.
+        twinkle: number of extra stars (on the nearest layer) that pulse in brightness.
+        """
+        rng = random.Random(seed)
+        self.width, self.height = size
+        self.time = 0.0
+        self.layers = []
+
+        for depth in range(layers):
+            nearness = (depth + 1) / layers
+            surface = pygame.Surface(size)
+            if depth == 0:
+                surface.fill(background)  # The farthest layer is opaque and doubles as the backdrop
+            else:
+                surface.fill(STAR_COLORKEY)
+            count = star_count // layers + (depth < star_count % layers)
+            for _ in range(count):
+                level = round(rng.randint(*brightness) * (0.6 + 0.4 * nearness))
+                self.draw_star(
+                    surface, (level,) * 3, rng.randrange(self.width), rng.randrange(self.height), rng.choice(radii)
+                )
+            if depth > 0:
+                surface.set_colorkey(STAR_COLORKEY, pygame.RLEACCEL)
+            self.layers.append(
+                {
+                    "surface": self.prepare(surface),
+                    "velocity": (scroll[0] * nearness, scroll[1] * nearness),
+                    "offset": [0.0, 0.0],
+                }
+            )
+
+        # Twinkling stars: position on the nearest layer, radius, peak brightness, pulse rate and phase
+        self.twinklers = [
+            (
+                rng.randrange(self.width),
+                rng.randrange(self.height),
+                rng.choice(radii),
+                rng.randint(*brightness),
+                rng.uniform(*TWINKLE_RATE),
+                rng.uniform(0, 2 * math.pi),
+            )
+            for _ in range(twinkle)
+        ]
+        # dots[radius][level] is a gray dot at level / TWINKLE_LEVELS of full brightness
+        self.dots = {}
+        for radius in {star[2] for star in self.twinklers}:
+            self.dots[radius] = []
+            for level in range(TWINKLE_LEVELS + 1):
+                gray = round(255 * level / TWINKLE_LEVELS)
+                dot = pygame.Surface((radius * 2, radius * 2))
+                dot.fill(STAR_COLORKEY)
+                pygame.draw.circle(dot, (gray,) * 3, (radius, radius), radius)
+                dot.set_colorkey(STAR_COLORKEY, pygame.RLEACCEL)
+                self.dots[radius].append(self.prepare(dot))
+
+    @staticmethod
+    def prepare(surface):
+        # Match the display format when there is one, for the fastest blits
+        return surface.convert() if pygame.display.get_surface() is not None else surface
+
+    def draw_star(self, surface, color, x, y, radius):
+        # Stars touching an edge are also drawn on the opposite side so the layer tiles seamlessly
+        xs = [x]
+        if x < radius:
+            xs.append(x + self.width)
+        elif x >= self.width - radius:
+            xs.append(x - self.width)
+        ys = [y]
+        if y < radius:
+            ys.append(y + self.height)
+        elif y >= self.height - radius:
+            ys.append(y - self.height)
+        for star_x in xs:
+            for star_y in ys:
+                pygame.draw.circle(surface, color, (star_x, star_y), radius)
+
+    def update(self, dt):
+        """Advance scrolling and twinkling by dt seconds."""
+        self.time += dt
+        for layer in self.layers:
+            offset = layer["offset"]
+            offset[0] = (offset[0] + layer["velocity"][0] * dt) % self.width
+            offset[1] = (offset[1] + layer["velocity"][1] * dt) % self.height
+
+    def draw(self, surface):
+        """Draw the whole field; the opaque back layer also clears the target."""
+        for layer in self.layers:
+            image = layer["surface"]
+            offset_x, offset_y = int(layer["offset"][0]), int(layer["offset"][1])
+            # Tile the layer: the copy at the offset plus the ones filling the wrapped strips
+            for x in (offset_x, offset_x - self.width) if offset_x else (0,):
+                for y in (offset_y, offset_y - self.height) if offset_y else (0,):
+                    surface.blit(image, (x, y))
+
+        if self.twinklers:
+            near_x, near_y = self.layers[-1]["offset"]
+            blits = []
+            for x, y, radius, peak, rate, phase in self.twinklers:
+                pulse = 1.0 - TWINKLE_DEPTH * (0.5 + 0.5 * math.sin(self.time * rate + phase))
+                level = round(peak * pulse / 255 * TWINKLE_LEVELS)
+                blits.append(
+                    (
+                        self.dots[radius][level],
+                        ((x + near_x) % self.width - radius, (y + near_y) % self.height - radius),
+                    )
+                )
+            surface.blits(blits, doreturn=False)
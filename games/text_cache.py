@@ -0,0 +1,47 @@
+"""Font and rendered-text caches shared by the Pygame games.
+
+Loading a pygame Font and rasterizing a string are both slow enough to show up when a HUD
+draws several labels every frame. Fonts are loaded once per (file, size). Rendered text
+surfaces are kept in a small LRU cache keyed by (font, size, text, color, antialias), so
+static labels are rendered once and a changing score only renders each new value.
+
+Cached surfaces are shared between callers: blit them, but don't draw on them or change
+their alpha. Copy a surface first if it needs modifying.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame
+
+TEXT_CACHE_SIZE = 256  # Rendered strings kept before the least recently used is dropped
+
+fonts = {}
+rendered = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def find_font(name, bold=False, italic=False):
+    """Path of a system font (pygame.font.match_font), looked up once per name."""
+    return pygame.font.match_font(name, bold, italic)
+
+
+def get_font(font_name, size):
+    """A Font for the file (or None for pygame's default font) at size, loaded once."""
+    font = fonts.get((font_name, size))
+    if font is None:
+        font = fonts[(font_name, size)] = pygame.font.Font(font_name, size)
+    return font
+
+
+def render_text(text, size, color, font_name=None, antialias=True):
+    """The rendered surface for text, from the cache when it has been drawn recently."""
+    key = (font_name, size, text, tuple(color), antialias)
+    surface = rendered.get(key)
+    if surface is None:
+        surface = get_font(font_name, size).render(text, antialias, color)
+        rendered[key] = surface
+        if len(rendered) > TEXT_CACHE_SIZE:
+            rendered.popitem(last=False)
+    else:
+        rendered.move_to_end(key)
+    return surface
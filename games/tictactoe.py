@@ -4,6 +4,11 @@ from tkinter import messagebox
 import random
 import time
 import math
+import json
+import os
+import argparse
+import multiprocessing
+from pathlib import Path
 
 # Set appearance mode and default color theme
 ctk.set_appearance_mode("dark")
@@ -23,6 +28,497 @@ class Colors:
     GRID_COLOR = "#30475e"
     WIN_LINE_COLOR = "#f5f5f5"
 
+# Winning combinations
+WIN_COMBINATIONS = [
+    # Rows
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    # Columns
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    # Diagonals
+    [0, 4, 8], [2, 4, 6]
+]
+
+# Bitboards: bit i is set when the player owns cell i (row * 3 + col)
+FULL_BOARD = 0b111111111
+WIN_MASKS = tuple(sum(1 << i for i in combo) for combo in WIN_COMBINATIONS)
+
+# Center first, then corners, then edges - strongest moves are searched first
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+def _symmetry_tables():
+    # The 8 rotations and reflections of the board, as cell index permutations
+    transforms = [
+        lambda r, c: (r, c), lambda r, c: (c, 2 - r),
+        lambda r, c: (2 - r, 2 - c), lambda r, c: (2 - c, r),
+        lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c),
+        lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r),
+    ]
+    tables = []
+    for transform in transforms:
+        permutation = [transform(i // 3, i % 3) for i in range(9)]
+        permutation = [r * 3 + c for r, c in permutation]
+        # Lookup table from every possible bitboard to its transformed bitboard
+        tables.append([
+            sum(1 << permutation[i] for i in range(9) if bits >> i & 1)
+            for bits in range(FULL_BOARD + 1)
+        ])
+    return tables
+
+SYMMETRY_TABLES = _symmetry_tables()
+
+def has_won(bits):
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+class MinimaxEngine:
+    """Perfect player: negamax with alpha-beta pruning over bitboards.
+
+    Results go into a transposition table keyed by the symmetry-canonical
+    position, so all 8 rotations/reflections of a position share one entry.
+    The table is kept between games, so after the first game every move is
+    a handful of dictionary lookups.
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self):
+        self.table = {}
+        self.root_moves = {}  # Solved answers per position, there are only a few thousand
+
+    @staticmethod
+    def canonical(me, opp):
+        return min((table[me] << 9) | table[opp] for table in SYMMETRY_TABLES)
+
+    def negamax(self, me, opp, alpha, beta):
+        """Score the position for the side to move: >0 win, 0 draw, <0 loss.
+
+        Wins are worth more the earlier they happen (1 + empty cells left).
+        """
+        empty = FULL_BOARD & ~(me | opp)
+        if has_won(opp):
+            return -(1 + bin(empty).count("1"))
+        if not empty:
+            return 0
+
+        key = self.canonical(me, opp)
+        entry = self.table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == self.EXACT:
+                return value
+            if flag == self.LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        best = -100
+        for cell in MOVE_ORDER:
+            bit = 1 << cell
+            if empty & bit:
+                score = -self.negamax(opp, me | bit, -beta, -alpha)
+                if score > best:
+                    best = score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+
+        if best <= original_alpha:
+            self.table[key] = (best, self.UPPER)
+        elif best >= beta:
+            self.table[key] = (best, self.LOWER)
+        else:
+            self.table[key] = (best, self.EXACT)
+        return best
+
+    def best_moves(self, board, player):
+        """Return every cell that is a best move for player on a list board."""
+        me = sum(1 << i for i, cell in enumerate(board) if cell == player)
+        opp = sum(1 << i for i, cell in enumerate(board) if cell not in ("", player))
+        empty = FULL_BOARD & ~(me | opp)
+        if (me, opp) in self.root_moves:
+            return self.root_moves[(me, opp)]
+
+        best_score, best_moves = -100, []
+        for cell in MOVE_ORDER:
+            bit = 1 << cell
+            if empty & bit:
+                score = -self.negamax(opp, me | bit, -100, 100)
+                if score > best_score:
+                    best_score, best_moves = score, [cell]
+                elif score == best_score:
+                    best_moves.append(cell)
+        self.root_moves[(me, opp)] = best_moves
+        return best_moves
+
+    def best_move(self, board, player):
+        """Return the index of the best cell for player on a list board, or None if it is full."""
+        best_moves = self.best_moves(board, player)
+
+        # Equally good moves are picked at random so games don't all look the same
+        return random.choice(best_moves) if best_moves else None
+
+# Board sizes offered in the UI: (rows, cols, pieces in a row needed to win)
+BOARD_PRESETS = {
+    "3×3 · 3 in a row": (3, 3, 3),
+    "4×4 · 4 in a row": (4, 4, 4),
+    "7×7 · 4 in a row": (7, 7, 4),
+    "10×10 · 5 in a row": (10, 10, 5),
+    "15×15 · 5 in a row": (15, 15, 5),
+}
+DEFAULT_PRESET = "3×3 · 3 in a row"
+
+# Line directions checked around a move: horizontal, vertical and both diagonals
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+WIN_SCORE = 10 ** 9
+
+class SearchTimeout(Exception):
+    pass
+
+class MNKEngine:
+    """Rules and computer player for any m,n,k board (e.g. 15×15 five-in-a-row).
+
+    Wins are only checked on the lines through the last move. The search is an
+    iterative-deepening negamax that stops when its time budget runs out. It
+    only considers cells near existing pieces, tries the biggest threats (its
+    own or the opponent's) first and keeps just the best few at each level.
+    """
+
+    def __init__(self, rows, cols, win_length, time_budget=0.4, beam_width=10):
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.time_budget = time_budget
+        self.beam_width = beam_width
+        self.deadline = 0
+
+        # Cells within 2 steps of each cell: the only places worth playing next to a piece
+        self.neighbors = []
+        for index in range(rows * cols):
+            row, col = divmod(index, cols)
+            self.neighbors.append({
+                r * cols + c
+                for r in range(max(0, row - 2), min(rows, row + 3))
+                for c in range(max(0, col - 2), min(cols, col + 3))
+                if (r, c) != (row, col)
+            })
+
+    def run_length(self, board, index, dr, dc, player):
+        """Count player's pieces in a row after index going (dr, dc), and whether the run ends on an empty cell."""
+        row, col = divmod(index, self.cols)
+        r, c = row + dr, col + dc
+        count = 0
+        while 0 <= r < self.rows and 0 <= c < self.cols and board[r * self.cols + c] == player:
+            count += 1
+            r += dr
+            c += dc
+        open_end = 0 <= r < self.rows and 0 <= c < self.cols and board[r * self.cols + c] == ""
+        return count, open_end
+
+    def winning_run(self, board, index):
+        """Return the (first, last) cells of a winning line through index, or None."""
+        player = board[index]
+        row, col = divmod(index, self.cols)
+        for dr, dc in DIRECTIONS:
+            forward, _ = self.run_length(board, index, dr, dc, player)
+            backward, _ = self.run_length(board, index, -dr, -dc, player)
+            if forward + backward + 1 >= self.win_length:
+                first = (row - backward * dr) * self.cols + col - backward * dc
+                last = (row + forward * dr) * self.cols + col + forward * dc
+                return first, last
+        return None
+
+    def threat(self, board, index, player):
+        """Score the lines player would get by playing the empty cell index."""
+        score = 0
+        for dr, dc in DIRECTIONS:
+            forward, open_forward = self.run_length(board, index, dr, dc, player)
+            backward, open_backward = self.run_length(board, index, -dr, -dc, player)
+            length = forward + backward + 1
+            if length >= self.win_length:
+                return WIN_SCORE
+            open_ends = open_forward + open_backward
+            missing = self.win_length - length
+            if missing == 1 and open_ends == 2:
+                score += WIN_SCORE // 10  # Can be completed at either end: unstoppable
+            elif missing == 1 and open_ends == 1:
+                score += 10 ** 6  # Forces an immediate block
+            elif missing == 2 and open_ends == 2:
+                score += 10 ** 5
+            else:
+                score += 10 ** length * open_ends
+        return score
+
+    def order_moves(self, board, candidates, me, opp):
+        """Return (move, own threat, opponent threat) for each empty candidate, strongest first."""
+        scored = [
+            (move, self.threat(board, move, me), self.threat(board, move, opp))
+            for move in candidates if board[move] == ""
+        ]
+        scored.sort(key=lambda item: item[1] + item[2], reverse=True)
+        return scored
+
+    def negamax(self, board, me, opp, depth, alpha, beta, candidates, ply):
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        scored = self.order_moves(board, candidates, me, opp)
+        if not scored:
+            return 0
+        best_attack = max(attack for _, attack, _ in scored)
+        if best_attack >= WIN_SCORE:
+            return WIN_SCORE - ply  # Sooner wins score higher
+        if depth == 0:
+            best_defense = max(defense for _, _, defense in scored)
+            return best_attack - best_defense // 2
+
+        best = -WIN_SCORE
+        for move, _, _ in scored[:max(3, self.beam_width - 2 * ply)]:
+            board[move] = me
+            try:
+                score = -self.negamax(board, opp, me, depth - 1, -beta, -alpha,
+                                      candidates | self.neighbors[move], ply + 1)
+            finally:
+                board[move] = ""
+            if score > best:
+                best = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best
+
+    def best_move(self, board, player):
+        """Return the index of the cell the computer plays for player, or None if the board is full."""
+        opp = "O" if player == "X" else "X"
+        occupied = [i for i, cell in enumerate(board) if cell != ""]
+        if len(occupied) == len(board):
+            return None
+        if not occupied:
+            return (self.rows // 2) * self.cols + self.cols // 2
+
+        candidates = set()
+        for index in occupied:
+            candidates |= self.neighbors[index]
+        scored = self.order_moves(board, candidates, player, opp)
+        if not scored:
+            return next(i for i, cell in enumerate(board) if cell == "")
+
+        # Take a win straight away, and if the opponent threatens one, only look at blocks
+        if any(attack >= WIN_SCORE for _, attack, _ in scored):
+            return max(scored, key=lambda item: item[1])[0]
+        blocks = [item for item in scored if item[2] >= WIN_SCORE]
+        root_moves = [move for move, _, _ in (blocks or scored[:self.beam_width])]
+        if len(root_moves) == 1:
+            return root_moves[0]
+
+        best = root_moves[0]
+        self.deadline = time.perf_counter() + self.time_budget
+        for depth in range(1, len(board) - len(occupied) + 1):
+            try:
+                depth_best, best_score, alpha = best, -WIN_SCORE, -WIN_SCORE
+                for move in root_moves:
+                    board[move] = player
+                    try:
+                        score = -self.negamax(board, opp, player, depth - 1, -WIN_SCORE, -alpha,
+                                              candidates | self.neighbors[move], 1)
+                    finally:
+                        board[move] = ""
+                    if score > best_score:
+                        depth_best, best_score = move, score
+                    alpha = max(alpha, score)
+            except SearchTimeout:
+                break
+            best = depth_best
+            if abs(best_score) >= WIN_SCORE - len(board):
+                break  # Forced win or loss found, deeper search won't change it
+
+            # Search the best move first next time, it makes alpha-beta prune more
+            root_moves.remove(best)
+            root_moves.insert(0, best)
+        return best
+
+# Opening book written by --build-book and loaded by the GUI at startup
+BOOK_PATH = Path(__file__).with_name("tictactoe_book.json")
+BOOK_PLIES = 4
+
+def board_key(board):
+    return "".join(cell or "." for cell in board)
+
+def load_opening_book(path=BOOK_PATH):
+    """Return {board key: [best cells]} for the 3×3 board, or {} if there is no usable book."""
+    try:
+        with open(path) as f:
+            book = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (book.get("rows"), book.get("cols"), book.get("win_length")) != (3, 3, 3):
+        return {}
+    return book.get("moves", {})
+
+def build_opening_book(plies=BOOK_PLIES, path=BOOK_PATH):
+    """Solve every 3×3 position with up to `plies` pieces on it and save the best moves."""
+    engine = MinimaxEngine()
+    moves = {}
+    frontier = [[""] * 9]
+    for ply in range(plies + 1):
+        player = "X" if ply % 2 == 0 else "O"
+        next_frontier = {}
+        for board in frontier:
+            moves[board_key(board)] = engine.best_moves(board, player)
+            for cell in range(9):
+                if board[cell] == "":
+                    child = board.copy()
+                    child[cell] = player
+                    if not has_won(sum(1 << i for i, c in enumerate(child) if c == player)):
+                        next_frontier[board_key(child)] = child
+        frontier = list(next_frontier.values())
+
+    with open(path, "w") as f:
+        json.dump({"rows": 3, "cols": 3, "win_length": 3, "plies": plies, "moves": moves}, f,
+                  separators=(",", ":"), sort_keys=True)
+    print(f"Wrote {len(moves)} positions to {path}")
+
+def random_move(board, player):
+    return random.choice([i for i, cell in enumerate(board) if cell == ""])
+
+def heuristic_move(board, player):
+    """The original greedy player: win, block, take the center, else play randomly."""
+    opp = "O" if player == "X" else "X"
+    for who in (player, opp):
+        bits = sum(1 << i for i, cell in enumerate(board) if cell == who)
+        for i in range(9):
+            if board[i] == "" and has_won(bits | 1 << i):
+                return i
+    if board[4] == "":
+        return 4
+    return random_move(board, player)
+
+# Computer players the tournament can pit against each other
+STRATEGIES = ("random", "heuristic", "minimax", "book")
+
+def make_strategy(name):
+    if name == "random":
+        return random_move
+    if name == "heuristic":
+        return heuristic_move
+    engine = MinimaxEngine()
+    if name == "minimax":
+        return engine.best_move
+    if name == "book":
+        book = load_opening_book()
+
+        def book_move(board, player):
+            moves = book.get(board_key(board))
+            return random.choice(moves) if moves else engine.best_move(board, player)
+        return book_move
+    raise ValueError(f"Unknown strategy {name!r}")
+
+def play_game(x_move, o_move):
+    """Play one headless 3×3 game. Returns ("X", "O" or None for a draw, number of moves)."""
+    board = [""] * 9
+    bits = {"X": 0, "O": 0}
+    player, move_fn = "X", x_move
+    for moves in range(1, 10):
+        index = move_fn(board, player)
+        board[index] = player
+        bits[player] |= 1 << index
+        if has_won(bits[player]):
+            return player, moves
+        player, move_fn = ("O", o_move) if player == "X" else ("X", x_move)
+    return None, 9
+
+_worker_strategies = {}
+
+def play_games(job):
+    """Worker entry point: play a batch of games between two strategies."""
+    x_name, o_name, games, seed = job
+    random.seed(seed)
+    for name in (x_name, o_name):
+        if name not in _worker_strategies:
+            _worker_strategies[name] = make_strategy(name)
+    x_move, o_move = _worker_strategies[x_name], _worker_strategies[o_name]
+
+    results = {"X": 0, "O": 0, None: 0}
+    total_moves = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        winner, moves = play_game(x_move, o_move)
+        results[winner] += 1
+        total_moves += moves
+    return x_name, o_name, results["X"], results["O"], results[None], total_moves, time.perf_counter() - start
+
+def run_tournament(strategies, games, workers=None, seed=0):
+    """Play `games` games for every ordered pair of strategies across a process pool and print the results."""
+    workers = workers or os.cpu_count() or 1
+    chunks = max(1, min(games, workers * 4))
+    jobs = []
+    for x_name in strategies:
+        for o_name in strategies:
+            for chunk in range(chunks):
+                count = games // chunks + (1 if chunk < games % chunks else 0)
+                jobs.append((x_name, o_name, count, f"{seed}-{x_name}-{o_name}-{chunk}"))
+
+    totals = {}
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for x_name, o_name, x_wins, o_wins, draws, moves, elapsed in pool.imap_unordered(play_games, jobs):
+            total = totals.setdefault((x_name, o_name), [0, 0, 0, 0, 0.0])
+            for i, value in enumerate((x_wins, o_wins, draws, moves, elapsed)):
+                total[i] += value
+    wall_time = time.perf_counter() - start
+
+    print(f"{'X':>10} {'O':>10} {'X win':>8} {'O win':>8} {'draw':>8} {'moves/s':>12}")
+    for x_name in strategies:
+        for o_name in strategies:
+            x_wins, o_wins, draws, moves, elapsed = totals[(x_name, o_name)]
+            played = x_wins + o_wins + draws
+            print(f"{x_name:>10} {o_name:>10} {x_wins / played:8.1%} {o_wins / played:8.1%} "
+                  f"{draws / played:8.1%} {moves / elapsed if elapsed else 0:12,.0f}")
+    total_games = games * len(strategies) ** 2
+    print(f"{total_games:,} games in {wall_time:.1f}s on {workers} workers ({total_games / wall_time:,.0f} games/s)")
+
+class CanvasAnimator:
+    """Runs canvas animations from one shared `after` tick instead of sleeping.
+
+    Each animation gets a callback that moves its existing canvas items with
+    coords(), so any number of pieces and the winning line can animate at
+    once while the Tk event loop keeps handling input.
+    """
+    FRAME_MS = 16
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.animations = []
+        self.job = None
+
+    def start(self, duration, update):
+        """Call update(progress) every frame, with progress going from 0 to 1 over duration seconds."""
+        self.animations.append((time.perf_counter(), duration, update))
+        update(0.0)
+        if self.job is None:
+            self.job = self.widget.after(self.FRAME_MS, self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        running = []
+        for start, duration, update in self.animations:
+            progress = min(1.0, (now - start) / duration) if duration > 0 else 1.0
+            update(progress)
+            if progress < 1.0:
+                running.append((start, duration, update))
+        
+        self.animations = running
+        self.job = self.widget.after(self.FRAME_MS, self.tick) if running else None
+
+    def cancel_all(self):
+        self.animations = []
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
 class TicTacToeGame(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -35,7 +531,8 @@ class TicTacToeGame(ctk.CTk):
         
         # Game variables
         self.current_player = "X"
-        self.board = ["", "", "", "", "", "", "", "", ""]
+        self.rows, self.cols, self.win_length = BOARD_PRESETS[DEFAULT_PRESET]
+        self.board = [""] * (self.rows * self.cols)
         self.game_active = True
         self.player_score = 0
         self.computer_score = 0
@@ -43,9 +540,23 @@ class TicTacToeGame(ctk.CTk):
         self.animation_speed = 0.3  # seconds
         self.winning_line = None
         self.game_mode = "player_vs_computer"  # Default mode
+        self.minimax = MinimaxEngine()  # Kept for the whole session so its table stays warm
+        self.book = load_opening_book()
+        self.setup_engine()
+        
+        # Shared scheduler for piece and winning line animations
+        self.animator = CanvasAnimator(self)
         
         # Create UI
         self.create_ui()
+    
+    def setup_engine(self):
+        # The rules always come from the m,n,k engine; plain 3×3 is played by the perfect minimax engine
+        self.rules = MNKEngine(self.rows, self.cols, self.win_length)
+        if (self.rows, self.cols, self.win_length) == (3, 3, 3):
+            self.engine = self.minimax
+        else:
+            self.engine = self.rules
         
     def create_ui(self):
         # Main frame
@@ -96,6 +607,21 @@ class TicTacToeGame(ctk.CTk):
         )
         self.pvp_radio.pack(side=tk.RIGHT, padx=20, pady=10)
         
+        # Board size selection
+        self.size_var = tk.StringVar(value=DEFAULT_PRESET)
+        
+        self.size_menu = ctk.CTkOptionMenu(
+            self.mode_frame,
+            values=list(BOARD_PRESETS),
+            variable=self.size_var,
+            command=lambda _: self.reset_game(),
+            fg_color=Colors.BG_LIGHT,
+            button_color=Colors.ACCENT_PRIMARY,
+            button_hover_color=Colors.HOVER,
+            text_color=Colors.TEXT_LIGHT
+        )
+        self.size_menu.pack(side=tk.LEFT, expand=True, pady=10)
+        
         # Score frame
         self.score_frame = ctk.CTkFrame(self.main_frame, fg_color=Colors.BG_MEDIUM, corner_radius=10)
         self.score_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
@@ -221,39 +747,32 @@ class TicTacToeGame(ctk.CTk):
         height = self.canvas.winfo_height()
         
         # Calculate cell size and offset to center the grid
-        size = min(width, height)
-        self.cell_size = size / 3
+        self.cell_size = min(width / self.cols, height / self.rows)
+        board_width = self.cell_size * self.cols
+        board_height = self.cell_size * self.rows
         
         # Calculate offsets to center the grid
-        x_offset = (width - size) / 2
-        y_offset = (height - size) / 2
+        x_offset = (width - board_width) / 2
+        y_offset = (height - board_height) / 2
         
         # Draw grid lines
-        line_width = 4
+        line_width = 4 if self.cols <= 4 else 2
         
         # Vertical lines
-        self.canvas.create_line(
-            x_offset + self.cell_size, y_offset + 10, 
-            x_offset + self.cell_size, y_offset + size - 10,
-            width=line_width, fill=Colors.GRID_COLOR, tags="board"
-        )
-        self.canvas.create_line(
-            x_offset + 2 * self.cell_size, y_offset + 10, 
-            x_offset + 2 * self.cell_size, y_offset + size - 10,
-            width=line_width, fill=Colors.GRID_COLOR, tags="board"
-        )
+        for col in range(1, self.cols):
+            self.canvas.create_line(
+                x_offset + col * self.cell_size, y_offset + 10, 
+                x_offset + col * self.cell_size, y_offset + board_height - 10,
+                width=line_width, fill=Colors.GRID_COLOR, tags="board"
+            )
         
         # Horizontal lines
-        self.canvas.create_line(
-            x_offset + 10, y_offset + self.cell_size, 
-            x_offset + size - 10, y_offset + self.cell_size,
-            width=line_width, fill=Colors.GRID_COLOR, tags="board"
-        )
-        self.canvas.create_line(
-            x_offset + 10, y_offset + 2 * self.cell_size, 
-            x_offset + size - 10, y_offset + 2 * self.cell_size,
-            width=line_width, fill=Colors.GRID_COLOR, tags="board"
-        )
+        for row in range(1, self.rows):
+            self.canvas.create_line(
+                x_offset + 10, y_offset + row * self.cell_size, 
+                x_offset + board_width - 10, y_offset + row * self.cell_size,
+                width=line_width, fill=Colors.GRID_COLOR, tags="board"
+            )
         
         # Store offsets for use in other methods
         self.x_offset = x_offset
@@ -266,10 +785,12 @@ class TicTacToeGame(ctk.CTk):
         self.redraw_pieces()
     
     def redraw_pieces(self):
+        # Pieces are redrawn at their final size, so running animations are dropped
+        self.animator.cancel_all()
         self.canvas.delete("piece")
         
-        for i in range(9):
-            row, col = i // 3, i % 3
+        for i in range(len(self.board)):
+            row, col = divmod(i, self.cols)
             if self.board[i] == "X":
                 self.draw_x(row, col, animate=False)
             elif self.board[i] == "O":
@@ -277,7 +798,7 @@ class TicTacToeGame(ctk.CTk):
         
         # Redraw winning line if exists
         if self.winning_line:
-            self.draw_winning_line(*self.winning_line)
+            self.draw_winning_line(self.winning_line, animate=False)
     
     def handle_click(self, event):
         if not self.game_active:
@@ -292,10 +813,10 @@ class TicTacToeGame(ctk.CTk):
         row = int(adjusted_y // self.cell_size)
         
         # Ensure valid cell
-        if col < 0 or col > 2 or row < 0 or row > 2:
+        if col < 0 or col >= self.cols or row < 0 or row >= self.rows:
             return
         
-        index = row * 3 + col
+        index = row * self.cols + col
         
         # Check if cell is empty
         if self.board[index] == "":
@@ -309,7 +830,7 @@ class TicTacToeGame(ctk.CTk):
                 self.draw_o(row, col)
             
             # Check for win or draw
-            if self.check_winner():
+            if self.check_winner(index):
                 self.game_active = False
                 if self.current_player == "X":
                     self.player_score += 1
@@ -352,87 +873,22 @@ class TicTacToeGame(ctk.CTk):
         if not self.game_active:
             return
         
-        # Check for winning move
-        for i in range(9):
-            if self.board[i] == "":
-                self.board[i] = "O"
-                if self.check_winner(check_only=True):
-                    row, col = i // 3, i % 3
-                    self.draw_o(row, col)
-                    
-                    # Update score
-                    self.computer_score += 1
-                    self.o_score_label.configure(text=str(self.computer_score))
-                    
-                    # Update turn label
-                    self.turn_label.configure(text="O Wins!", text_color=Colors.O_COLOR)
-                    
-                    self.game_active = False
-                    
-                    # Schedule reset after delay
-                    self.after(2000, self.reset_board)
-                    return
-                self.board[i] = ""
-        
-        # Check for blocking move
-        for i in range(9):
-            if self.board[i] == "":
-                self.board[i] = "X"
-                if self.check_winner(check_only=True):
-                    self.board[i] = "O"
-                    row, col = i // 3, i % 3
-                    self.draw_o(row, col)
-                    
-                    # Check if this is a winning move for O
-                    if self.check_winner():
-                        # Update score
-                        self.computer_score += 1
-                        self.o_score_label.configure(text=str(self.computer_score))
-                        
-                        # Update turn label
-                        self.turn_label.configure(text="O Wins!", text_color=Colors.O_COLOR)
-                        
-                        self.game_active = False
-                        
-                        # Schedule reset after delay
-                        self.after(2000, self.reset_board)
-                        return
-                    
-                    # Switch player
-                    self.current_player = "X"
-                    
-                    # Update turn label
-                    self.turn_label.configure(text="X's Turn", text_color=Colors.X_COLOR)
-                    
-                    # Check for draw
-                    if "" not in self.board:
-                        self.game_active = False
-                        self.draws += 1
-                        self.draws_score_label.configure(text=str(self.draws))
-                        self.turn_label.configure(text="Draw!", text_color=Colors.TEXT_LIGHT)
-                        
-                        # Schedule reset after delay
-                        self.after(2000, self.reset_board)
-                    
-                    return
-                self.board[i] = ""
-        
-        # Try center
-        if self.board[4] == "":
-            self.board[4] = "O"
-            row, col = 1, 1
-            self.draw_o(row, col)
-        else:
-            # Random move
-            empty_cells = [i for i, cell in enumerate(self.board) if cell == ""]
-            if empty_cells:
-                index = random.choice(empty_cells)
-                self.board[index] = "O"
-                row, col = index // 3, index % 3
-                self.draw_o(row, col)
+        # Early 3×3 moves come straight from the opening book, the rest from the game-tree engine
+        index = None
+        if self.engine is self.minimax:
+            book_moves = self.book.get(board_key(self.board))
+            if book_moves:
+                index = random.choice(book_moves)
+        if index is None:
+            index = self.engine.best_move(self.board, "O")
+        if index is None:
+            return
+        self.board[index] = "O"
+        row, col = divmod(index, self.cols)
+        self.draw_o(row, col)
         
         # Check for win
-        if self.check_winner():
+        if self.check_winner(index):
             # Update score
             self.computer_score += 1
             self.o_score_label.configure(text=str(self.computer_score))
@@ -470,48 +926,35 @@ class TicTacToeGame(ctk.CTk):
         
         # Size of X
         size = self.cell_size * 0.3
+        width = self.piece_width()
         
-        if animate:
-            # Animation steps
-            steps = 10
-            step_size = size / steps
-            
-            for i in range(1, steps + 1):
-                current_size = step_size * i
-                
-                # Delete previous frame
-                self.canvas.delete("temp_x")
-                
-                # Draw X with current size
-                self.canvas.create_line(
-                    x_center - current_size, y_center - current_size,
-                    x_center + current_size, y_center + current_size,
-                    width=8, fill=Colors.X_COLOR, tags="temp_x"
-                )
-                self.canvas.create_line(
-                    x_center + current_size, y_center - current_size,
-                    x_center - current_size, y_center + current_size,
-                    width=8, fill=Colors.X_COLOR, tags="temp_x"
-                )
-                
-                # Update canvas
-                self.update()
-                time.sleep(self.animation_speed / steps)
-            
-            # Delete temporary animation
-            self.canvas.delete("temp_x")
-        
-        # Draw final X
-        self.canvas.create_line(
-            x_center - size, y_center - size,
-            x_center + size, y_center + size,
-            width=8, fill=Colors.X_COLOR, tags="piece"
+        # Create the two strokes once; the animation only moves their end points
+        line1 = self.canvas.create_line(
+            x_center, y_center, x_center, y_center,
+            width=width, fill=Colors.X_COLOR, tags="piece"
         )
-        self.canvas.create_line(
-            x_center + size, y_center - size,
-            x_center - size, y_center + size,
-            width=8, fill=Colors.X_COLOR, tags="piece"
+        line2 = self.canvas.create_line(
+            x_center, y_center, x_center, y_center,
+            width=width, fill=Colors.X_COLOR, tags="piece"
         )
+        
+        def grow(progress):
+            current_size = size * progress
+            self.canvas.coords(
+                line1,
+                x_center - current_size, y_center - current_size,
+                x_center + current_size, y_center + current_size
+            )
+            self.canvas.coords(
+                line2,
+                x_center + current_size, y_center - current_size,
+                x_center - current_size, y_center + current_size
+            )
+        
+        if animate:
+            self.animator.start(self.animation_speed, grow)
+        else:
+            grow(1.0)
     
     def draw_o(self, row, col, animate=True):
         # Calculate center of cell with offset
@@ -520,73 +963,49 @@ class TicTacToeGame(ctk.CTk):
         
         # Size of O
         radius = self.cell_size * 0.3
+        width = self.piece_width()
         
-        if animate:
-            # Animation steps
-            steps = 10
-            step_size = radius / steps
-            
-            for i in range(1, steps + 1):
-                current_radius = step_size * i
-                
-                # Delete previous frame
-                self.canvas.delete("temp_o")
-                
-                # Draw O with current radius
-                self.canvas.create_oval(
-                    x_center - current_radius, y_center - current_radius,
-                    x_center + current_radius, y_center + current_radius,
-                    width=8, outline=Colors.O_COLOR, tags="temp_o"
-                )
-                
-                # Update canvas
-                self.update()
-                time.sleep(self.animation_speed / steps)
-            
-            # Delete temporary animation
-            self.canvas.delete("temp_o")
-        
-        # Draw final O
-        self.canvas.create_oval(
-            x_center - radius, y_center - radius,
-            x_center + radius, y_center + radius,
-            width=8, outline=Colors.O_COLOR, tags="piece"
+        # Create the circle once; the animation only resizes it
+        oval = self.canvas.create_oval(
+            x_center, y_center, x_center, y_center,
+            width=width, outline=Colors.O_COLOR, tags="piece"
         )
-    
-    def check_winner(self, check_only=False):
-        # Winning combinations
-        win_combinations = [
-            # Rows
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],
-            # Columns
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],
-            # Diagonals
-            [0, 4, 8], [2, 4, 6]
-        ]
         
-        for combo in win_combinations:
-            if (self.board[combo[0]] == self.board[combo[1]] == self.board[combo[2]] != ""):
-                if not check_only:
-                    # Store winning line info for drawing
-                    self.winning_line = combo
-                    self.draw_winning_line(combo)
-                return True
+        def grow(progress):
+            current_radius = radius * progress
+            self.canvas.coords(
+                oval,
+                x_center - current_radius, y_center - current_radius,
+                x_center + current_radius, y_center + current_radius
+            )
+        
+        if animate:
+            self.animator.start(self.animation_speed, grow)
+        else:
+            grow(1.0)
+    
+    def piece_width(self):
+        # Thinner strokes on big boards so pieces still fit their cells
+        return max(2, min(8, int(self.cell_size / 12)))
+    
+    def check_winner(self, index):
+        # Only the lines through the last move can have become a win
+        run = self.rules.winning_run(self.board, index)
+        if run:
+            # Store winning line info for drawing
+            self.winning_line = run
+            self.draw_winning_line(run)
+            return True
         
         return False
     
-    def draw_winning_line(self, combo):
+    def draw_winning_line(self, run, animate=True):
         # Calculate start and end points of the winning line
-        start_idx, end_idx = combo[0], combo[2]
-        
-        # For middle row and column, use the actual middle index
-        if combo in [[0, 1, 2], [3, 4, 5], [6, 7, 8]]:  # Rows
-            start_idx, end_idx = combo[0], combo[2]
-        elif combo in [[0, 3, 6], [1, 4, 7], [2, 5, 8]]:  # Columns
-            start_idx, end_idx = combo[0], combo[2]
+        start_idx, end_idx = run
         
         # Calculate cell centers
-        start_row, start_col = start_idx // 3, start_idx % 3
-        end_row, end_col = end_idx // 3, end_idx % 3
+        start_row, start_col = divmod(start_idx, self.cols)
+        end_row, end_col = divmod(end_idx, self.cols)
         
         # Get cell centers with offset
         start_x = self.x_offset + start_col * self.cell_size + self.cell_size / 2
@@ -594,28 +1013,37 @@ class TicTacToeGame(ctk.CTk):
         end_x = self.x_offset + end_col * self.cell_size + self.cell_size / 2
         end_y = self.y_offset + end_row * self.cell_size + self.cell_size / 2
         
-        # For diagonals, adjust to use corners
-        if combo == [0, 4, 8]:  # Main diagonal
-            start_x = self.x_offset + 10
-            start_y = self.y_offset + 10
-            end_x = self.x_offset + self.cell_size * 3 - 10
-            end_y = self.y_offset + self.cell_size * 3 - 10
-        elif combo == [2, 4, 6]:  # Other diagonal
-            start_x = self.x_offset + self.cell_size * 3 - 10
-            start_y = self.y_offset + 10
-            end_x = self.x_offset + 10
-            end_y = self.y_offset + self.cell_size * 3 - 10
-        
-        # Draw the line
-        self.canvas.create_line(
-            start_x, start_y, end_x, end_y,
-            width=10, fill=Colors.WIN_LINE_COLOR, tags="piece",
+        # For diagonals, extend the line into the corners of the end cells
+        if start_row != end_row and start_col != end_col:
+            extend = max(0, self.cell_size / 2 - 10)
+            step_x = extend if end_x > start_x else -extend
+            step_y = extend if end_y > start_y else -extend
+            start_x, start_y = start_x - step_x, start_y - step_y
+            end_x, end_y = end_x + step_x, end_y + step_y
+        
+        # Draw the line, growing it from the start cell to the end cell
+        line = self.canvas.create_line(
+            start_x, start_y, start_x, start_y,
+            width=10 if self.cols <= 4 else 6, fill=Colors.WIN_LINE_COLOR, tags="piece",
             capstyle=tk.ROUND
         )
+        
+        def grow(progress):
+            self.canvas.coords(
+                line,
+                start_x, start_y,
+                start_x + (end_x - start_x) * progress, start_y + (end_y - start_y) * progress
+            )
+        
+        if animate:
+            self.animator.start(self.animation_speed, grow)
+        else:
+            grow(1.0)
     
     def reset_board(self):
         # Clear board
-        self.board = ["", "", "", "", "", "", "", "", ""]
+        self.board = [""] * (self.rows * self.cols)
+        self.animator.cancel_all()
         self.canvas.delete("piece")
         self.winning_line = None
         
@@ -634,6 +1062,15 @@ class TicTacToeGame(ctk.CTk):
         # Update game mode
         self.game_mode = self.mode_var.get()
         
+        # Update board size and redraw the grid if it changed
+        size = BOARD_PRESETS[self.size_var.get()]
+        if size != (self.rows, self.cols, self.win_length):
+            self.rows, self.cols, self.win_length = size
+            self.setup_engine()
+            self.board = [""] * (self.rows * self.cols)
+            self.winning_line = None
+            self.draw_board()
+        
         # Reset board
         self.reset_board()
     
@@ -652,5 +1089,24 @@ class TicTacToeGame(ctk.CTk):
         self.reset_game()
 
 if __name__ == "__main__":
-    app = TicTacToeGame()
-    app.mainloop()
+    parser = argparse.ArgumentParser(description="Modern Tic Tac Toe")
+    parser.add_argument("--tournament", type=int, metavar="GAMES",
+                        help="play GAMES headless games for every pair of strategies and report the results")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES),
+                        help=f"comma-separated strategies for --tournament (from {', '.join(STRATEGIES)})")
+    parser.add_argument("--workers", type=int, help="worker processes for --tournament (default: all CPUs)")
+    parser.add_argument("--build-book", type=int, nargs="?", const=BOOK_PLIES, metavar="PLIES",
+                        help=f"write the opening book for positions up to PLIES moves deep (default {BOOK_PLIES})")
+    args = parser.parse_args()
+
+    if args.build_book is not None:
+        build_opening_book(args.build_book)
+    elif args.tournament is not None:
+        strategies = [name.strip() for name in args.strategies.split(",") if name.strip()]
+        unknown = [name for name in strategies if name not in STRATEGIES]
+        if unknown:
+            parser.error(f"unknown strategies: {', '.join(unknown)}")
+        run_tournament(strategies, args.tournament, args.workers)
+    else:
+        app = TicTacToeGame()
+        app.mainloop()